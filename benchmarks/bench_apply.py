@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: re-applying an unchanged config
+
+Applies a generated flat config persistently to an empty temporary
+config, then times re-applying it unchanged (with `apply` and with a plain
+re-import) and applying it with a few changed values. Each row reports how
+many times the saved config was written.
+
+Usage: python benchmarks/bench_apply.py [key count] [changed keys]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.env_manager import EnvironmentManager
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    count = int(args[0]) if args else 5000
+    changed = int(args[1]) if len(args) > 1 else 10
+
+    target = {f"APP_SETTING_{i:05d}": f"value-{i}" for i in range(count)}
+    modified = dict(target)
+    for i in range(changed):
+        modified[f"APP_SETTING_{i:05d}"] = f"changed-{i}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = os.path.join(tmp, 'env_config.json')
+        import_file = os.path.join(tmp, 'config.json')
+        with open(import_file, 'w') as f:
+            json.dump(target, f)
+
+        # Persistence is off so the run leaves the user's shell profile alone
+        manager = EnvironmentManager(config_file, persistence='none')
+        writes = [0]
+        write_config = manager._replace_config_file
+
+        def counting_write():
+            writes[0] += 1
+            write_config()
+
+        manager._replace_config_file = counting_write
+        manager.load_config()
+
+        rows = []
+        for label, action in [
+            ('first apply (all new)', lambda: manager.apply_environment(target, True)),
+            ('re-apply unchanged', lambda: manager.apply_environment(target, True)),
+            ('re-import unchanged', lambda: manager.import_env_vars(import_file, True)),
+            (f'apply with {changed} changed', lambda: manager.apply_environment(modified, True)),
+        ]:
+            writes[0] = 0
+            start = time.perf_counter()
+            action()
+            rows.append((label, (time.perf_counter() - start) * 1000, writes[0]))
+
+    print(f"{count} keys, persistent")
+    print(f"{'operation':<28} {'ms':>9} {'config writes':>14}")
+    for label, ms, count_writes in rows:
+        print(f"{label:<28} {ms:>9.2f} {count_writes:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lookup throughput with and without the daemon
+
+Generates a config with saved variables, a multi-profile import file and
+an environment of extra variables, starts a daemon for them on a temporary
+socket and measures requests per second for a mix of search, saved list
+and profile lookups made:
+  - directly, constructing an EnvironmentManager per lookup the way each
+    CLI invocation does (interpreter start-up excluded),
+  - through the daemon with a new connection per request,
+  - through the daemon over one persistent connection,
+  - through the daemon in pipelined batches of 100.
+Full `main.py get` processes are timed as well for reference.
+
+Usage: python benchmarks/bench_daemon.py [requests] [saved vars] [env vars]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from src.daemon import DaemonClient
+from src.env_manager import EnvironmentManager
+
+BATCH_SIZE = 100
+CLI_RUNS = 10
+
+# Started with `python -c`: the CLI has no option for a different config file
+DAEMON_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from src.daemon import EnvironmentDaemon
+from src.env_manager import EnvironmentManager
+EnvironmentDaemon(EnvironmentManager(sys.argv[2]), sys.argv[3]).serve_forever()
+"""
+
+
+def write_fixtures(tmp: str, saved: int) -> tuple:
+    config_file = os.path.join(tmp, 'env_config.json')
+    with open(config_file, 'w') as f:
+        json.dump({f"SAVED_{i:05d}": f"value-{i}" for i in range(saved)}, f, indent=4)
+
+    profiles_file = os.path.join(tmp, 'profiles.json')
+    profiles = {name: {'database': {'host': f"{name}.db.internal", 'port': 5432},
+                       'services': {f"svc{i}": {'url': f"http://{name}-{i}.internal"}
+                                    for i in range(200)}}
+                for name in ('development', 'staging', 'production')}
+    with open(profiles_file, 'w') as f:
+        json.dump({'shared': {'app_name': 'bench'}, 'environments': profiles}, f)
+    return config_file, profiles_file
+
+
+def make_requests(count: int, profiles_file: str) -> list:
+    """Mix of 2 name searches, 2 profile resolutions and 1 saved list"""
+    # Searches carry the caller's environment, as the CLI sends it
+    environ = dict(os.environ)
+    pattern = ('search', 'profile', 'list', 'search', 'profile')
+    requests = []
+    for i in range(count):
+        op = pattern[i % len(pattern)]
+        if op == 'search':
+            requests.append((op, {'term': f"BENCH_{i % 1000:04d}", 'field': 'name',
+                                  'environ': environ}))
+        elif op == 'profile':
+            requests.append((op, {'filename': profiles_file,
+                                  'profile': ('development', 'staging', 'production')[i % 3]}))
+        else:
+            requests.append((op, {'saved': True}))
+    return requests
+
+
+def run_direct(config_file, requests):
+    for op, args in requests:
+        manager = EnvironmentManager(config_file)
+        if op == 'search':
+            manager.search_env_vars(args['term'], field=args['field'])
+        elif op == 'profile':
+            manager.resolve_profile(args['filename'], args['profile'])
+        else:
+            manager.get_saved_vars()
+
+
+def run_connect_each(socket_path, requests):
+    for op, args in requests:
+        with DaemonClient.connect(socket_path) as client:
+            client.request(op, **args)
+
+
+def run_persistent(socket_path, requests):
+    with DaemonClient.connect(socket_path) as client:
+        for op, args in requests:
+            client.request(op, **args)
+
+
+def run_pipelined(socket_path, requests):
+    with DaemonClient.connect(socket_path) as client:
+        for start in range(0, len(requests), BATCH_SIZE):
+            client.pipeline(requests[start:start + BATCH_SIZE])
+
+
+def elapsed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    count = int(args[0]) if args else 2000
+    saved = int(args[1]) if len(args) > 1 else 2000
+    extra = int(args[2]) if len(args) > 2 else 10000
+
+    for i in range(extra):
+        os.environ[f"BENCH_{i:05d}_VALUE"] = f"/opt/bench/{i}/bin"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file, profiles_file = write_fixtures(tmp, saved)
+        requests = make_requests(count, profiles_file)
+        socket_path = os.path.join(tmp, 'bench.sock')
+        daemon = subprocess.Popen(
+            [sys.executable, '-c', DAEMON_SCRIPT, ROOT, config_file, socket_path])
+        try:
+            deadline = time.time() + 10
+            while not os.path.exists(socket_path):
+                if time.time() > deadline or daemon.poll() is not None:
+                    print("Daemon did not start")
+                    return 1
+                time.sleep(0.02)
+
+            # Populate the on-disk profile cache so direct mode is measured warm
+            run_direct(config_file, requests[:10])
+
+            results = [
+                ('direct (manager per lookup)', elapsed(run_direct, config_file, requests)),
+                ('daemon, connect per request',
+                 elapsed(run_connect_each, socket_path, requests)),
+                ('daemon, persistent connection',
+                 elapsed(run_persistent, socket_path, requests)),
+                (f'daemon, pipelined x{BATCH_SIZE}',
+                 elapsed(run_pipelined, socket_path, requests)),
+            ]
+
+            cli = []
+            env = dict(os.environ, ENVGOD_SOCKET=socket_path)
+            for flags in (['--no-daemon'], []):
+                command = [sys.executable, os.path.join(ROOT, 'main.py')] + flags
+                start = time.perf_counter()
+                for _ in range(CLI_RUNS):
+                    subprocess.run(command + ['search', 'BENCH_0042'], env=env,
+                                   stdout=subprocess.DEVNULL)
+                cli.append((time.perf_counter() - start) / CLI_RUNS)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"{count} requests, {saved} saved variables, {len(os.environ)} environment variables")
+    print(f"{'mode':<32} {'total s':>9} {'req/s':>10}")
+    for label, seconds in results:
+        print(f"{label:<32} {seconds:>9.3f} {count / seconds:>10.0f}")
+    print(f"\nfull CLI search process, direct:  {cli[0] * 1000:.1f} ms")
+    print(f"full CLI search process, daemon:  {cli[1] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
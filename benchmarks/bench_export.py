@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: export time, size and peak memory per format
+
+Exports a synthetic environment with the previous approach (copy into a
+dict, json.dump with indent=4) and with the streaming writer in every
+format, uncompressed and with gzip/xz, reporting wall time, file size and
+peak traced memory.
+
+Usage: python benchmarks/bench_export.py [entry count]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.export_formats import EXPORT_FORMATS, write_export
+
+
+def make_environment(count: int) -> dict:
+    return {f"SERVICE_{i:06d}_URL": f"postgresql://db-{i % 500}.internal:5432/app?x={i}"
+            for i in range(count)}
+
+
+def measure(func):
+    """Wall time in ms, then peak traced memory in MB from a second run"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1e6
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    count = int(args[0]) if args else 100000
+    env = make_environment(count)
+
+    def old_export(path):
+        data = dict(env)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+
+    cases = [('json.dump indent=4 (old)', '.json', lambda path: old_export(path))]
+    for fmt in EXPORT_FORMATS:
+        for compression in (None, 'gzip', 'xz'):
+            label = fmt + (f" + {compression}" if compression else '')
+            cases.append((label, '', lambda path, fmt=fmt, compression=compression:
+                          write_export(path, ((n, env[n]) for n in sorted(env)), fmt, compression)))
+
+    print(f"{count} variables (memory excludes the source environment)")
+    print(f"{'format':<26} {'ms':>8} {'size MB':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (label, suffix, export) in enumerate(cases):
+            path = os.path.join(tmp, f"export{index}{suffix}")
+            ms, peak = measure(lambda: export(path))
+            print(f"{label:<26} {ms:>8.1f} {os.path.getsize(path) / 1e6:>8.2f} {peak:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: iterative flattening engine vs. the previous recursive one
+
+Times src.flatten.flatten_json against the recursive implementation it
+replaced on wide (many keys, shallow) and deep (few keys, long chains)
+documents. The recursive version is skipped where it would exceed the
+recursion limit.
+
+Usage: python benchmarks/bench_flatten.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.flatten import flatten_json
+
+
+def recursive_flatten(data, parent_key='', separator='_'):
+    """The recursive implementation previously used by EnvironmentManager"""
+    items = []
+    for key, value in data.items():
+        new_key = f"{parent_key}{separator}{key}" if parent_key else key
+        if isinstance(value, dict):
+            items.extend(recursive_flatten(value, new_key, separator).items())
+        else:
+            items.append((new_key, str(value)))
+    return dict(items)
+
+
+def make_wide(sections: int, keys: int) -> dict:
+    return {f"SECTION{s}": {f"KEY{k}": f"value{k}" for k in range(keys)}
+            for s in range(sections)}
+
+
+def make_deep(chains: int, depth: int) -> dict:
+    data = {}
+    for c in range(chains):
+        node = data.setdefault(f"CHAIN{c}", {})
+        for d in range(depth):
+            node[f"LEAF{d}"] = str(d)
+            node = node.setdefault(f"L{d}", {})
+    return data
+
+
+def bench(func, data, number: int) -> float:
+    return min(timeit.repeat(lambda: func(data), number=number, repeat=3)) / number
+
+
+def main() -> int:
+    cases = [
+        ("wide 100x100", make_wide(100, 100), 20),
+        ("wide 10x10000", make_wide(10, 10000), 5),
+        ("deep 10x100", make_deep(10, 100), 20),
+        ("deep 10x500", make_deep(10, 500), 5),
+        ("deep 1x5000", make_deep(1, 5000), 5),
+    ]
+
+    print(f"{'case':<16} {'recursive (ms)':>15} {'iterative (ms)':>15} {'speedup':>9}")
+    for label, data, number in cases:
+        new = bench(flatten_json, data, number) * 1000
+        try:
+            old = bench(recursive_flatten, data, number) * 1000
+            assert recursive_flatten(data) == flatten_json(data)
+            old_text, speedup = f"{old:.3f}", f"{old / new:.1f}x"
+        except RecursionError:
+            old_text, speedup = "RecursionError", "-"
+        print(f"{label:<16} {old_text:>15} {new:>15.3f} {speedup:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: persistent import time vs. key count
+
+Compares the per-variable path (one set_env_var call, and therefore one
+config write, per key) with the transactional import_env_vars path.
+System persistence is replaced by a RecordingBackend, so nothing outside
+the temporary directory is written; the rows report how many times each
+path called it.
+
+Usage: python benchmarks/bench_import.py [key counts...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.env_manager import EnvironmentManager
+from src.persistence import RecordingBackend
+
+
+def make_config(path: str, count: int) -> dict:
+    """Write a flat config with `count` keys and return it"""
+    data = {f"ENVGOD_BENCH_{i:06d}": f"value_{i}" for i in range(count)}
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return data
+
+
+def clear_keys(data: dict) -> None:
+    for name in data:
+        os.environ.pop(name, None)
+
+
+def bench_per_variable(workdir: str, data: dict) -> tuple:
+    backend = RecordingBackend()
+    manager = EnvironmentManager(os.path.join(workdir, "per_var_config.json"),
+                                 persistence=backend)
+    start = time.perf_counter()
+    for name, value in data.items():
+        manager.set_env_var(name, value, persistent=True)
+    return time.perf_counter() - start, backend.call_count
+
+
+def bench_transaction(workdir: str, config_path: str) -> tuple:
+    backend = RecordingBackend()
+    manager = EnvironmentManager(os.path.join(workdir, "txn_config.json"),
+                                 persistence=backend)
+    start = time.perf_counter()
+    manager.import_env_vars(config_path, persistent=True)
+    return time.perf_counter() - start, backend.call_count
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    counts = [int(a) for a in args] or [100, 500, 1000, 2000]
+
+    print(f"{'keys':>8} {'per-variable (s)':>18} {'calls':>7} "
+          f"{'transaction (s)':>17} {'calls':>7} {'speedup':>9}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as workdir:
+            config_path = os.path.join(workdir, "import.json")
+            data = make_config(config_path, count)
+
+            per_var, per_var_calls = bench_per_variable(workdir, data)
+            clear_keys(data)
+            txn, txn_calls = bench_transaction(workdir, config_path)
+            clear_keys(data)
+
+        speedup = per_var / txn if txn else float('inf')
+        print(f"{count:>8} {per_var:>18.4f} {per_var_calls:>7} "
+              f"{txn:>17.4f} {txn_calls:>7} {speedup:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
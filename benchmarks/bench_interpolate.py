@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ${NAME} interpolation via the dependency graph vs. substitution passes
+
+Builds keys that reference each other in chains (each key refers to the
+previous one of its chain; chains start at an environment variable) and
+expands them with interpolate(), which visits each key once, and with the
+naive approach of substituting references over all keys until nothing
+changes, which takes several passes as keys are not in dependency order.
+
+Usage: python benchmarks/bench_interpolate.py [keys] [chain length]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.interpolate import interpolate
+
+_REFERENCE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+def make_variables(count: int, chain: int) -> dict:
+    variables = []
+    for i in range(count):
+        name = f"SERVICE_{i:06d}_URL"
+        if i % chain:
+            variables.append((name, f"${{SERVICE_{i - 1:06d}_URL}}/{i % chain}"))
+        else:
+            variables.append((name, "https://${BENCH_HOST}:8443"))
+    # Config files are not written in dependency order
+    random.Random(42).shuffle(variables)
+    return dict(variables)
+
+
+def substitution_passes(variables: dict, environment: dict):
+    """Expand by rewriting every value until a pass changes nothing"""
+    values = dict(variables)
+    passes = 0
+    while True:
+        passes += 1
+        changed = False
+        for name, value in values.items():
+            if '${' not in value:
+                continue
+            expanded = _REFERENCE.sub(
+                lambda m: values.get(m.group(1), environment.get(m.group(1), m.group(0))), value)
+            if expanded != value:
+                values[name] = expanded
+                changed = True
+        if not changed:
+            return values, passes
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    count = int(args[0]) if args else 20000
+    chain = int(args[1]) if len(args) > 1 else 50
+    environment = {'BENCH_HOST': 'example.com'}
+    variables = make_variables(count, chain)
+
+    start = time.perf_counter()
+    graph = interpolate(variables, environment)
+    graph_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    naive, passes = substitution_passes(variables, environment)
+    naive_ms = (time.perf_counter() - start) * 1000
+
+    assert graph == naive, "methods disagree"
+    print(f"{count} keys in chains of {chain}")
+    print(f"{'method':<24} {'ms':>10} {'passes':>7}")
+    print(f"{'dependency graph':<24} {graph_ms:>10.1f} {1:>7}")
+    print(f"{'substitution passes':<24} {naive_ms:>10.1f} {passes:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
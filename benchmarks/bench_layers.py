@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: layered environment view vs. full dict copies
+
+Models a GUI refresh over a large environment plus saved variables: the
+old way copies both dicts and merges them, the layered view only stacks
+references to them. Also stacks many small overlays (one per profile or
+edit session) and compares the memory of views with that of a merged
+copy per layer.
+
+Usage: python benchmarks/bench_layers.py [variables] [layers]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.layers import LayeredEnvironment, Overlay
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def peak_bytes(func) -> int:
+    tracemalloc.start()
+    try:
+        keep = func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        del keep
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    count = int(args[0]) if args else 100000
+    depth = int(args[1]) if len(args) > 1 else 50
+    process = {f"VAR_{i:07d}": f"value-{i}" for i in range(count)}
+    saved = {f"VAR_{i:07d}": f"saved-{i}" for i in range(0, count, 10)}
+
+    def copy_refresh():
+        env = dict(process)
+        env.update(saved.copy())
+        return sum(1 for _ in env)
+
+    def view_refresh():
+        view = LayeredEnvironment([('process', process), ('saved', saved)])
+        return sum(1 for _ in view)
+
+    def view_create():
+        return LayeredEnvironment([('process', process), ('saved', saved)])
+
+    overlays = [Overlay({f"VAR_{i * 7:07d}": f"layer-{layer}" for i in range(100)})
+                for layer in range(depth)]
+
+    def stacked_copies():
+        merged = [dict(process)]
+        for overlay in overlays:
+            env = dict(merged[-1])
+            env.update(overlay)
+            merged.append(env)
+        return merged
+
+    def stacked_views():
+        views = [LayeredEnvironment([('process', process)])]
+        for layer, overlay in enumerate(overlays):
+            views.append(views[-1].push(f"layer {layer}", overlay))
+        return views
+
+    print(f"{count} variables, {len(saved)} saved, {depth} stacked layers of 100")
+    print(f"{'case':<34} {'ms':>9} {'peak KB':>10}")
+    for label, func in (("refresh: copy + merge", copy_refresh),
+                        ("refresh: create view", view_create),
+                        ("refresh: view + iterate", view_refresh),
+                        (f"{depth} layers: merged copies", stacked_copies),
+                        (f"{depth} layers: stacked views", stacked_views)):
+        ms = timed(func)
+        print(f"{label:<34} {ms:>9.2f} {peak_bytes(func) / 1024:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
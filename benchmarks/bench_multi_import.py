@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-file import scaling with worker processes
+
+Generates a directory of nested JSON fragments and times parsing and
+merging them with load_import_files() (parse cache disabled) for 1, 2, 4,
+... worker processes up to the CPU count, reporting the speedup over a
+single process.
+
+Usage: python benchmarks/bench_multi_import.py [fragments] [services per fragment]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.multi_import import expand_import_paths, load_import_files
+
+OPTIONS = {'flatten': True, 'separator': '_', 'key_case': 'upper', 'index_lists': True}
+
+
+def make_fragment(index: int, services: int) -> dict:
+    return {
+        f"team{index:03d}": {
+            f"service{i:04d}": {
+                'host': f"svc-{index}-{i}.internal",
+                'port': 8000 + i,
+                'replicas': [f"r{j}" for j in range(3)],
+                'limits': {'cpu': '500m', 'memory': '512Mi'},
+            }
+            for i in range(services)
+        }
+    }
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    fragments = int(args[0]) if args else 32
+    services = int(args[1]) if len(args) > 1 else 2000
+
+    cpus = os.cpu_count() or 1
+    job_counts = []
+    jobs = 1
+    while jobs < cpus:
+        job_counts.append(jobs)
+        jobs *= 2
+    job_counts.append(cpus)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        total_bytes = 0
+        for index in range(fragments):
+            path = os.path.join(tmp, f"{index:03d}-fragment.json")
+            with open(path, 'w') as f:
+                json.dump(make_fragment(index, services), f)
+            total_bytes += os.path.getsize(path)
+        filenames = expand_import_paths([tmp])
+
+        print(f"{fragments} fragments, {total_bytes / 1e6:.1f} MB, {cpus} CPUs")
+        print(f"{'jobs':>5} {'seconds':>9} {'speedup':>8} {'variables':>10}")
+        baseline = None
+        for jobs in job_counts:
+            start = time.perf_counter()
+            merged = load_import_files(filenames, OPTIONS, parse_cache=None, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{jobs:>5} {elapsed:>9.3f} {baseline / elapsed:>7.2f}x {len(merged):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold vs. cached parsing of import files
+
+Times the parse/flatten step of import_env_vars for generated nested
+configs without the cache, on a cache miss (parse + store) and on a cache
+hit (stat + marshal load).
+
+Usage: python benchmarks/bench_parse_cache.py [service counts...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.env_manager import EnvironmentManager
+from src.parse_cache import ParseCache
+
+
+def make_config(path: str, services: int) -> None:
+    data = {
+        f"SVC{i:06d}": {
+            "HOST": f"svc-{i}.internal",
+            "PORT": str(8000 + i % 1000),
+            "DB": {"URL": f"postgresql://db-{i}:5432/app", "POOL": "10"},
+        }
+        for i in range(services)
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    counts = [int(a) for a in args] or [1000, 10000, 50000]
+    options = {'flatten': True, 'separator': '_', 'key_case': None, 'index_lists': False}
+
+    print(f"{'services':>9} {'file MB':>8} {'no cache (ms)':>14} {'miss (ms)':>10} {'hit (ms)':>9}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "config.json")
+            make_config(path, count)
+            manager = EnvironmentManager(os.path.join(workdir, "env_config.json"))
+            cache = ParseCache(os.path.join(workdir, "cache"))
+
+            def parse(content: bytes) -> dict:
+                return manager._parse_import(json.loads(content), **options)
+
+            def uncached():
+                with open(path, 'rb') as f:
+                    parse(f.read())
+
+            cold = timed(uncached)
+            miss = timed(lambda: cache.load(path, options, parse))
+            hit = min(timed(lambda: cache.load(path, options, parse)) for _ in range(5))
+            size_mb = os.path.getsize(path) / 1e6
+        print(f"{count:>9} {size_mb:>8.1f} {cold:>14.1f} {miss:>10.1f} {hit:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
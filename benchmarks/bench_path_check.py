@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PATH check time vs. probe concurrency on slow mounts
+
+Builds a PATH-like list of real directories (plus missing and duplicate
+entries) and times check_path_list() with 1, 4 and 16 concurrent probes.
+Each probe is delayed by a fixed latency to model a network file system,
+where every stat is a round trip.
+
+Usage: python benchmarks/bench_path_check.py [entries] [latency ms]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.path_list as path_list
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    count = int(args[0]) if args else 40
+    latency = (float(args[1]) if len(args) > 1 else 20.0) / 1000
+
+    probe = path_list._probe
+
+    def slow_probe(entry, list_names):
+        time.sleep(latency)
+        return probe(entry, list_names)
+
+    path_list._probe = slow_probe
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = []
+        for i in range(count):
+            directory = os.path.join(tmp, f"tool{i:03d}", "bin")
+            os.makedirs(directory)
+            for name in ("run", f"tool{i}"):
+                open(os.path.join(directory, name), 'w').close()
+            entries.append(directory)
+        entries += [os.path.join(tmp, "missing", "bin"), entries[0]]
+
+        print(f"{len(entries)} entries, {latency * 1000:.0f} ms per probe")
+        print(f"{'jobs':>5} {'seconds':>9} {'problems':>9}")
+        for jobs in (1, 4, 16):
+            start = time.perf_counter()
+            report = path_list.check_path_list(entries, jobs=jobs, timeout=600)
+            elapsed = time.perf_counter() - start
+            problems = sum(1 for item in report if item['status'] != 'ok')
+            print(f"{jobs:>5} {elapsed:>9.3f} {problems:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
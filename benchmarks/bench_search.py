@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indexed vs. scanning variable search
+
+Builds synthetic environments of 10k and 100k entries and times a set of
+substring, glob and regex queries against a plain scan (what a one-shot
+search does) and against a prebuilt SearchIndex (what long-lived
+processes such as the GUI use from the second search on).
+
+Usage: python benchmarks/bench_search.py [entry counts...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.search_index import SearchIndex, scan_items
+
+QUERIES = [
+    ('substring', 'both', 'service_042'),
+    ('substring', 'value', '/opt/tools'),
+    ('substring', 'both', 'db'),
+    ('glob', 'name', 'SERVICE_0??_HOST'),
+    ('glob', 'value', '*://*.internal:5432*'),
+    ('regex', 'name', r'^service_\d+_port$'),
+]
+
+
+def make_environment(count: int) -> dict:
+    """Generate an environment with service-style names and realistic values"""
+    rng = random.Random(count)
+    env = {}
+    kinds = ['HOST', 'PORT', 'URL', 'PATH', 'TOKEN']
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        name = f"SERVICE_{i // len(kinds):03d}_{kind}"
+        if kind == 'PATH':
+            value = os.pathsep.join(f"/opt/tools/{rng.randrange(1000)}/bin" for _ in range(5))
+        elif kind == 'URL':
+            value = f"postgresql://db-{rng.randrange(500)}.internal:5432/app"
+        else:
+            value = f"{kind.lower()}-{rng.getrandbits(48):x}"
+        env[name] = value
+    return env
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    counts = [int(a) for a in args] or [10000, 100000]
+
+    for count in counts:
+        env = make_environment(count)
+        start = time.perf_counter()
+        index = SearchIndex(env)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n{count} entries (index build {build_ms:.0f} ms)")
+        print(f"{'query':<36} {'matches':>8} {'scan (ms)':>10} {'index (ms)':>11}")
+        for mode, field, term in QUERIES:
+            matches = index.search(term, mode, field)
+            assert matches == sorted(scan_items(env.items(), term, mode, field))
+            scan_ms = timed(lambda: scan_items(env.items(), term, mode, field))
+            index_ms = timed(lambda: index.search(term, mode, field))
+            label = f"{mode}/{field} {term}"
+            print(f"{label:<36} {len(matches):>8} {scan_ms:>10.2f} {index_ms:>11.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
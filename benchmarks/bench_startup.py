@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CLI cold-start time per command
+
+Runs main.py in fresh interpreters for common read-only commands and
+reports the median wall time. With --check it fails (exit 1) if any
+command exceeds the budget or if CLI mode imports a GUI module, so it can
+guard start-up regressions in CI. `python -X importtime` is used to find
+which modules each command loads.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--budget-ms MS] [--check]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+MAIN = os.path.join(ROOT, 'main.py')
+
+COMMANDS = [
+    ['get', 'PATH'],
+    ['search', 'path'],
+    ['list'],
+    ['--help'],
+]
+
+# Modules that must never be loaded outside GUI mode
+FORBIDDEN_MODULES = ('tkinter', 'src.gui')
+
+
+def time_command(args, runs: int) -> float:
+    """Median wall time in milliseconds of running main.py with args"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN] + args, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def imported_modules(args) -> list:
+    """Modules loaded by main.py with args, from -X importtime output"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', MAIN] + args,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.append(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Runs per command')
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help='Maximum median start-up time per command')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit non-zero when a command is over budget')
+    args = parser.parse_args(argv)
+
+    # Warm the OS file cache and bytecode cache before measuring
+    time_command(COMMANDS[0], 1)
+
+    interpreter = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'])
+        interpreter.append((time.perf_counter() - start) * 1000)
+    print(f"{'bare interpreter':<16} {statistics.median(interpreter):>8.1f} ms")
+
+    failures = []
+    for command in COMMANDS:
+        label = ' '.join(command)
+        median = time_command(command, args.runs)
+        forbidden = [m for m in imported_modules(command)
+                     if m.split('.')[0] in FORBIDDEN_MODULES or m in FORBIDDEN_MODULES]
+        print(f"{label:<16} {median:>8.1f} ms" + (f"  imports {forbidden}" if forbidden else ""))
+        if median > args.budget_ms:
+            failures.append(f"'{label}' took {median:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if forbidden:
+            failures.append(f"'{label}' imported GUI modules: {', '.join(forbidden)}")
+
+    if failures:
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of regular vs. streaming import parsing
+
+Generates nested configs of increasing size and records the tracemalloc
+peak of the read/parse/flatten stage used by import_env_vars (json.load +
+_flatten_json) and by import_env_vars_streaming (JSONStreamReader). The
+apply stage is left out because os.environ itself grows with every key.
+The streaming peak should stay flat as the file grows.
+
+Usage: python benchmarks/bench_stream_import.py [service counts...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.env_manager import EnvironmentManager
+from src.json_stream import JSONStreamReader
+
+
+def make_config(path: str, services: int) -> None:
+    """Write a service-catalogue style config"""
+    with open(path, 'w') as f:
+        f.write("{")
+        for i in range(services):
+            service = {
+                "HOST": f"svc-{i}.internal",
+                "PORT": str(8000 + i % 1000),
+                "DB": {"URL": f"postgresql://db-{i}:5432/app", "POOL": "10"},
+            }
+            if i:
+                f.write(",")
+            f.write(f'"SVC{i:06d}":')
+            json.dump(service, f)
+        f.write("}")
+
+
+def load_and_flatten(manager: EnvironmentManager, path: str) -> int:
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return len(manager._flatten_json(data))
+
+
+def stream_and_flatten(path: str) -> int:
+    count = 0
+    with open(path, 'r') as f:
+        for _ in JSONStreamReader(f).iter_items():
+            count += 1
+    return count
+
+
+def measure(func, *args) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    counts = [int(a) for a in args] or [10000, 50000, 100000]
+
+    print(f"{'services':>9} {'file MB':>8} {'load peak MB':>13} {'stream peak MB':>15} "
+          f"{'load s':>7} {'stream s':>9}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "catalogue.json")
+            make_config(path, count)
+            manager = EnvironmentManager(os.path.join(workdir, "config.json"))
+
+            load_time, load_peak = measure(load_and_flatten, manager, path)
+            stream_time, stream_peak = measure(stream_and_flatten, path)
+
+            size_mb = os.path.getsize(path) / 1e6
+        print(f"{count:>9} {size_mb:>8.1f} {load_peak / 1e6:>13.1f} {stream_peak / 1e6:>15.1f} "
+              f"{load_time:>7.2f} {stream_time:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: command resolution with the persisted index vs. shutil.which
+
+Resolves a batch of command names against the current PATH with
+shutil.which (a stat per name per directory), with a cold CommandIndex
+(one scandir per directory) and with a warm one loaded from disk, which
+only stats each directory to see whether it changed.
+
+Usage: python benchmarks/bench_which.py [lookups]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.command_index import CommandIndex
+from src.path_list import parse_path_list
+
+COMMANDS = ['python', 'python3', 'git', 'make', 'ls', 'bash', 'gcc', 'ssh', 'curl',
+            'no-such-command']
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    lookups = int(args[0]) if args else 200
+    names = (COMMANDS * (lookups // len(COMMANDS) + 1))[:lookups]
+    entries = parse_path_list(os.environ.get('PATH', ''))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, 'commands.bin')
+        cold = CommandIndex(cache_file)
+        cold_ms = timed(lambda: (cold.which(names, entries), cold.save()))
+        warm = CommandIndex(cache_file)
+        warm_ms = timed(lambda: warm.which(names, entries))
+        which_ms = timed(lambda: [shutil.which(name) for name in names])
+
+    print(f"{lookups} lookups over {len(entries)} PATH entries")
+    print(f"{'method':<28} {'ms':>9} {'dirs scanned':>13}")
+    print(f"{'shutil.which':<28} {which_ms:>9.2f} {'-':>13}")
+    print(f"{'index, cold (scan + save)':<28} {cold_ms:>9.2f} {cold.scanned:>13}")
+    print(f"{'index, warm (from disk)':<28} {warm_ms:>9.2f} {warm.scanned:>13}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
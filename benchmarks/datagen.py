@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Synthetic environments and configs for the benchmark suite
+
+Everything is derived from a seed, so the same arguments always produce
+byte-identical data and results stay comparable between runs.
+
+Usage: python benchmarks/datagen.py COUNT DEPTH OUTPUT.json [--seed N] [--env]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from typing import Any, Dict
+
+# Key prefix per nesting level, repeated for deeper documents
+LEVEL_NAMES = ('region', 'team', 'service', 'component', 'setting')
+
+# Variable name suffix per kind of value _value() produces
+_KINDS = ('HOST', 'PORT', 'URL', 'PATH', 'ENABLED', 'TOKEN')
+
+
+def _value(rng: random.Random, index: int) -> Any:
+    kind = index % len(_KINDS)
+    if kind == 0:
+        return f"svc-{rng.randrange(10000)}.internal"
+    if kind == 1:
+        return 1024 + rng.randrange(60000)
+    if kind == 2:
+        return f"postgresql://db-{rng.randrange(500)}.internal:5432/app"
+    if kind == 3:
+        return os.pathsep.join(f"/opt/tools/{rng.randrange(1000)}/bin" for _ in range(4))
+    if kind == 4:
+        return rng.random() < 0.5
+    return f"{rng.getrandbits(64):016x}"
+
+
+def make_environment(count: int, seed: int = 0) -> Dict[str, str]:
+    """Flat NAME -> value variables with service-style names"""
+    rng = random.Random(seed)
+    env = {}
+    for i in range(count):
+        value = _value(rng, i)
+        env[f"SERVICE_{i // len(_KINDS):06d}_{_KINDS[i % len(_KINDS)]}"] = \
+            value if isinstance(value, str) else json.dumps(value)
+    return env
+
+
+def make_nested_config(count: int, depth: int, seed: int = 0) -> Dict[str, Any]:
+    """Document with count leaves, each depth levels deep (depth 1 is flat)
+
+    Every level has the same fan-out, the smallest that fits count leaves.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    rng = random.Random(seed)
+    fanout = max(2, math.ceil(count ** (1.0 / depth)))
+    while fanout ** depth < count:
+        fanout += 1
+
+    root: Dict[str, Any] = {}
+    for i in range(count):
+        node = root
+        remainder = i
+        keys = []
+        for level in range(depth):
+            remainder, digit = divmod(remainder, fanout)
+            keys.append(f"{LEVEL_NAMES[level % len(LEVEL_NAMES)]}{digit}")
+        for key in reversed(keys[1:]):
+            node = node.setdefault(key, {})
+        node[keys[0]] = _value(rng, i)
+    return root
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('count', type=int, help='Number of leaf values')
+    parser.add_argument('depth', type=int, help='Nesting depth (1 = flat)')
+    parser.add_argument('output', help='JSON file to write')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--env', action='store_true',
+                        help='Write flat NAME -> value variables instead (depth is ignored)')
+    args = parser.parse_args(argv)
+
+    if args.env:
+        data = make_environment(args.count, args.seed)
+    else:
+        data = make_nested_config(args.count, args.depth, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump(data, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
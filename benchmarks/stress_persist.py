@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Stress test: concurrent persistent writes from many CLI processes
+
+Copies main.py and src/ into a temporary directory (so the real config is
+untouched), then runs N workers in parallel, each invoking
+`main.py set KEY VALUE --persist` M times with its own keys. Afterwards the
+saved config is loaded and every expected key is checked. Reports
+throughput, lost updates (missing or wrong keys) and whether the config
+was still valid JSON. Exits 1 if any update was lost.
+
+Usage: python benchmarks/stress_persist.py [--workers N] [--ops M] [--storage json|journal]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def run_worker(main_py: str, env: dict, worker: int, ops: int, failures: list) -> None:
+    for op in range(ops):
+        result = subprocess.run(
+            [sys.executable, main_py, 'set', f"STRESS_{worker:03d}_{op:04d}", f"w{worker}-{op}",
+             '--persist'],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            failures.append((worker, op, result.stderr.strip()))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent CLI processes')
+    parser.add_argument('--ops', type=int, default=25, help='Sets per worker')
+    parser.add_argument('--storage', choices=['json', 'journal'], default='json',
+                        help='Config storage mode')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, 'main.py'), tmp)
+        shutil.copytree(os.path.join(ROOT, 'src'), os.path.join(tmp, 'src'),
+                        ignore=shutil.ignore_patterns('cache', 'env_config.json*',
+                                                      'backup_vars*', '*.lock', '*.sock'))
+        main_py = os.path.join(tmp, 'main.py')
+        env = dict(os.environ, ENVGOD_NO_DAEMON='1', ENVGOD_STORAGE=args.storage)
+
+        failures = []
+        workers = [threading.Thread(target=run_worker,
+                                    args=(main_py, env, worker, args.ops, failures))
+                   for worker in range(args.workers)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        sys.path.insert(0, tmp)
+        from src.env_manager import EnvironmentManager
+        config_file = os.path.join(tmp, 'src', 'env_config.json')
+        valid_json = True
+        if os.path.exists(config_file):
+            try:
+                with open(config_file) as f:
+                    json.load(f)
+            except ValueError:
+                valid_json = False
+        manager = EnvironmentManager(config_file, storage=args.storage)
+        saved = manager.get_saved_vars()
+
+    total = args.workers * args.ops
+    lost = sum(1 for worker in range(args.workers) for op in range(args.ops)
+               if saved.get(f"STRESS_{worker:03d}_{op:04d}") != f"w{worker}-{op}")
+
+    print(f"{args.workers} workers x {args.ops} sets ({args.storage} storage)")
+    print(f"  Elapsed:        {elapsed:.2f} s")
+    print(f"  Throughput:     {total / elapsed:.1f} sets/s")
+    print(f"  Failed runs:    {len(failures)}")
+    print(f"  Lost updates:   {lost} of {total}")
+    print(f"  Config valid:   {'yes' if valid_json else 'NO'}")
+    for worker, op, error in failures[:5]:
+        print(f"  worker {worker} op {op}: {error}")
+    return 0 if lost == 0 and valid_json and not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
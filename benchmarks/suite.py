@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: core operations at several sizes, compared to a baseline
+
+Times import_env_vars, _flatten_json, search_env_vars, save_config,
+export_env_vars and the GUI's refresh_variables on synthetic data from
+datagen.py at 1k/10k/100k keys (flattening also at several nesting
+depths), writes the results as JSON and compares them with a stored
+baseline, flagging cases that got slower by more than the threshold.
+
+The GUI case needs tkinter and a display and is reported as skipped
+otherwise. Imports above 10k keys run once: setting that many process
+environment variables takes tens of seconds.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000 10000] [--quick] [--filter search]
+    python benchmarks/suite.py --save-baseline     # record the reference run
+    python benchmarks/suite.py --check             # exit 1 on regressions
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.datagen import make_nested_config
+from src.env_manager import EnvironmentManager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(HERE, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+QUICK_SIZES = (1000, 10000)
+DEPTHS = (1, 3, 6)
+IMPORT_DEPTH = 3
+
+# Differences below this many milliseconds are noise, whatever the ratio
+MIN_REGRESSION_MS = 1.0
+
+SEARCHES = [
+    ('substring', 'both', 'service_0042'),
+    ('glob', 'name', 'SERVICE_00??_HOST'),
+    ('regex', 'value', r'^postgresql://db-4\d\.'),
+]
+
+
+def timed(func, repeat: int, setup=None) -> list:
+    """Milliseconds per call of func, after running setup untimed each time"""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        runs.append((time.perf_counter() - start) * 1000)
+    return runs
+
+
+class Suite:
+    """Runs the cases for one size against a scratch config directory"""
+
+    def __init__(self, workdir: str, repeat: int, selected):
+        self.workdir = workdir
+        self.repeat = repeat
+        self.selected = selected
+        self.results = {}
+        self.skipped = {}
+
+    def record(self, case: str, size: int, runs: list, depth: int = None) -> None:
+        key = f"{case}@{size}" + (f"/d{depth}" if depth is not None else '')
+        self.results[key] = {'ms': min(runs), 'median_ms': statistics.median(runs),
+                             'runs': len(runs)}
+        print(f"  {key:<32} {min(runs):>10.2f} ms  (median {statistics.median(runs):.2f}, "
+              f"{len(runs)} runs)", flush=True)
+
+    def wants(self, case: str) -> bool:
+        return not self.selected or any(part in case for part in self.selected)
+
+    def new_manager(self) -> EnvironmentManager:
+        config = os.path.join(self.workdir, 'env_config.json')
+        for path in (config, config + '.lock'):
+            if os.path.exists(path):
+                os.remove(path)
+        # Persistence is off: the cases time this tool, not the shell profile
+        # or registry writes of the machine running the suite
+        return EnvironmentManager(config, storage='json', persistence='none')
+
+    def run_size(self, size: int) -> None:
+        print(f"{size} keys", flush=True)
+        repeat = self.repeat if size <= 10000 else 1
+
+        if self.wants('flatten'):
+            manager = self.new_manager()
+            for depth in DEPTHS:
+                document = make_nested_config(size, depth, seed=depth)
+                self.record('flatten', size, timed(lambda: manager._flatten_json(document),
+                                                   self.repeat), depth)
+
+        config_path = os.path.join(self.workdir, f'import-{size}.json')
+        with open(config_path, 'w') as f:
+            json.dump(make_nested_config(size, IMPORT_DEPTH, seed=size), f)
+        expected = self.new_manager().load_import_file(config_path, use_cache=False)
+        names = list(expected)
+
+        def clear_environment():
+            for name in names:
+                os.environ.pop(name, None)
+
+        try:
+            if self.wants('import'):
+                managers = []
+                self.record('import', size, timed(
+                    lambda: managers[-1].import_env_vars(config_path, persistent=True,
+                                                         use_cache=False),
+                    repeat,
+                    setup=lambda: (clear_environment(), managers.append(self.new_manager()))),
+                    IMPORT_DEPTH)
+            else:
+                os.environ.update(expected)
+            self.run_loaded_cases(size, names)
+        finally:
+            clear_environment()
+
+    def run_loaded_cases(self, size: int, names: list) -> None:
+        """Cases that read an environment holding the generated variables"""
+        if self.wants('search'):
+            config = os.path.join(self.workdir, 'env_config.json')
+
+            # A manager scans on its first search and indexes on the second, so
+            # every query gets a fresh one to time the one-shot CLI path
+            def scan():
+                for mode, field, term in SEARCHES:
+                    manager = EnvironmentManager(config, persistence='none')
+                    manager.search_env_vars(term, mode, field)
+            self.record('search-scan', size, timed(scan, self.repeat))
+
+            manager = EnvironmentManager(config, persistence='none')
+            self.record('search-index-build', size, timed(manager.build_search_index, self.repeat))
+
+            def indexed():
+                for mode, field, term in SEARCHES:
+                    manager.search_env_vars(term, mode, field)
+            self.record('search-indexed', size, timed(indexed, self.repeat))
+
+        if self.wants('save'):
+            manager = self.new_manager()
+            manager.saved_vars = {name: os.environ[name] for name in names}
+            self.record('save_config', size, timed(manager.save_config, self.repeat))
+
+        if self.wants('export'):
+            manager = self.new_manager()
+            for label, suffix in (('export-json', '.json'), ('export-compact-gz', '.json.gz')):
+                fmt = 'json-compact' if 'compact' in label else None
+                path = os.path.join(self.workdir, 'export' + suffix)
+                self.record(label, size, timed(lambda: manager.export_env_vars(path, fmt=fmt),
+                                               self.repeat))
+
+        if self.wants('gui'):
+            self.run_gui(size)
+
+    def run_gui(self, size: int) -> None:
+        try:
+            from src.gui import EnvironmentGUI
+            gui = EnvironmentGUI()
+        except Exception as e:
+            # No tkinter, or no display to open a window on
+            key = f"gui-refresh@{size}"
+            self.skipped[key] = str(e).splitlines()[0] if str(e) else type(e).__name__
+            print(f"  {key:<32} skipped ({self.skipped[key]})")
+            return
+
+        try:
+            gui.env_manager = self.new_manager()
+            gui.root.withdraw()
+
+            def refresh():
+                # Until the filtered rows are rendered, not just the search submitted
+                gui.refresh_variables()
+                while gui._search_polling:
+                    gui.root.update()
+                    time.sleep(0.0005)
+                gui.root.update_idletasks()
+            self.record('gui-refresh', size, timed(refresh, self.repeat))
+        finally:
+            gui.root.destroy()
+
+
+def load_results(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Print current vs. baseline per case and return the regressed case names"""
+    regressions = []
+    print(f"\n{'case':<32} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, result in current['results'].items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            print(f"{key:<32} {'-':>12} {result['ms']:>12.2f} {'':>7} new")
+            continue
+        ratio = result['ms'] / reference['ms'] if reference['ms'] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold and result['ms'] - reference['ms'] >= MIN_REGRESSION_MS:
+            flag = 'REGRESSION'
+            regressions.append(key)
+        elif ratio < 1 / (1 + threshold) and reference['ms'] - result['ms'] >= MIN_REGRESSION_MS:
+            flag = 'faster'
+        print(f"{key:<32} {reference['ms']:>12.2f} {result['ms']:>12.2f} {ratio:>6.2f}x {flag}")
+
+    if baseline.get('meta', {}).get('machine') != current['meta']['machine']:
+        print("\nNote: the baseline was recorded on a different machine")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EnvironmentGod benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', help=f'Key counts (default {DEFAULT_SIZES})')
+    parser.add_argument('--quick', action='store_true', help=f'Only sizes {QUICK_SIZES}')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case, the best one counts')
+    parser.add_argument('--filter', nargs='+', help='Only cases whose name contains one of these')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Where to write the results')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Slowdown ratio above which a case counts as regressed (0.25 = 25%%)')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 on regressions')
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    workdir = tempfile.mkdtemp(prefix='envgod-bench-')
+    suite = Suite(workdir, max(1, args.repeat), args.filter)
+    try:
+        for size in sizes:
+            suite.run_size(size)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    current = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.node() + '/' + platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'sizes': list(sizes),
+            'repeat': suite.repeat,
+        },
+        'results': suite.results,
+        'skipped': suite.skipped,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; record one on this machine with "
+              f"'python benchmarks/suite.py --save-baseline' before comparing")
+        # Without a reference nothing was checked, which must not pass as clean
+        return 1 if args.check else 0
+
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1 if args.check else 0
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
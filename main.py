@@ -10,20 +10,19 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.cli import EnvironmentCLI
-from src.gui import EnvironmentGUI
-
 
 def main():
     """Main application entry point"""
     # Check if running in CLI mode
     if len(sys.argv) > 1:
-        # CLI mode
+        # CLI mode; the GUI (and tkinter) is only imported in GUI mode
+        from src.cli import EnvironmentCLI
         cli = EnvironmentCLI()
         return cli.run()
     else:
         # GUI mode
         try:
+            from src.gui import EnvironmentGUI
             gui = EnvironmentGUI()
             gui.run()
             return 0
@@ -6,8 +6,20 @@ __version__ = "1.0.0"
 __author__ = "EnvironmentGod"
 __description__ = "A desktop application for managing environment variables"
 
-from .env_manager import EnvironmentManager
-from .cli import EnvironmentCLI
-from .gui import EnvironmentGUI
-
 __all__ = ['EnvironmentManager', 'EnvironmentCLI', 'EnvironmentGUI']
+
+# Submodules are imported on first attribute access so that CLI commands
+# never pay for loading tkinter through the GUI module.
+_LAZY_ATTRIBUTES = {
+    'EnvironmentManager': '.env_manager',
+    'EnvironmentCLI': '.cli',
+    'EnvironmentGUI': '.gui',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
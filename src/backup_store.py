@@ -0,0 +1,158 @@
+import datetime
+import json
+import os
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .file_lock import file_lock
+
+# File header: magic, format version, slot count, slot size, next slot, next sequence
+_HEADER = struct.Struct('<4sHIIIQ')
+_MAGIC = b'EGRB'
+_VERSION = 1
+
+# Slot header: record sequence (0 = empty), record length, part index
+_SLOT = struct.Struct('<QIH')
+
+DEFAULT_CAPACITY = 64
+DEFAULT_SLOT_SIZE = 4096
+
+
+class BackupStore:
+    """Fixed-size ring buffer of deleted-variable backups
+
+    The file is a header followed by ``capacity`` slots of ``slot_size``
+    bytes. A backup is one JSON record written into the next slot(s),
+    spanning consecutive slots when the value is large, after which only
+    the header is rewritten. Appending therefore costs the same no matter
+    how much history exists, and the oldest records are overwritten once
+    the ring is full. Appends and reads hold ``<path>.lock`` and re-read the
+    header, so several processes can share one ring.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY,
+                 slot_size: int = DEFAULT_SLOT_SIZE, legacy_file: Optional[str] = None):
+        self.path = path
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.legacy_file = legacy_file
+        self.lock_file = path + ".lock"
+        self._head = 0
+        self._next_seq = 1
+
+    @property
+    def _payload_size(self) -> int:
+        return self.slot_size - _SLOT.size
+
+    def _open(self) -> None:
+        """Read the header, creating the file (and migrating old backups) if needed
+
+        The caller holds lock_file. The header is re-read every time since
+        another process may have appended since.
+        """
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                header = f.read(_HEADER.size)
+            magic, version, capacity, slot_size, head, next_seq = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"Not a backup ring file: {self.path}")
+            # The file's geometry wins over the requested one
+            self.capacity, self.slot_size = capacity, slot_size
+            self._head, self._next_seq = head, next_seq
+        else:
+            with open(self.path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, self.capacity, self.slot_size, 0, 1))
+                f.truncate(_HEADER.size + self.capacity * self.slot_size)
+            self._head, self._next_seq = 0, 1
+            self._migrate_legacy()
+
+    def _migrate_legacy(self) -> None:
+        """Copy entries from the old backup_vars.json format, if present"""
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        try:
+            with open(self.legacy_file, 'r') as f:
+                entries = json.load(f).get('deleted_variables', [])
+            self._append_records(entries)
+        except Exception as e:
+            print(f"Warning: Could not migrate old backups: {e}")
+
+    def append(self, name: str, value: str) -> None:
+        """Back up one deleted variable"""
+        self.append_many([(name, value)])
+
+    def append_many(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """Back up several deleted variables with a single header update"""
+        timestamp = datetime.datetime.now().isoformat()
+        with file_lock(self.lock_file):
+            self._open()
+            self._append_records({'name': name, 'value': value, 'deleted_at': timestamp}
+                                 for name, value in entries)
+
+    def _append_records(self, records: Iterable[Dict[str, Any]]) -> None:
+        payload_size = self._payload_size
+        with open(self.path, 'r+b') as f:
+            wrote = False
+            for record in records:
+                data = json.dumps(record, separators=(',', ':')).encode('utf-8')
+                parts = max(1, -(-len(data) // payload_size))
+                if parts > self.capacity:
+                    raise ValueError(f"Backup of '{record['name']}' is larger than the backup ring")
+                seq = self._next_seq
+                for part in range(parts):
+                    chunk = data[part * payload_size:(part + 1) * payload_size]
+                    f.seek(_HEADER.size + self._head * self.slot_size)
+                    f.write(_SLOT.pack(seq, len(data), part) + chunk.ljust(payload_size, b'\0'))
+                    self._head = (self._head + 1) % self.capacity
+                self._next_seq += 1
+                wrote = True
+            if wrote:
+                f.seek(0)
+                f.write(_HEADER.pack(_MAGIC, _VERSION, self.capacity, self.slot_size,
+                                     self._head, self._next_seq))
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return intact backups, newest first, each with an 'id' field"""
+        if not os.path.exists(self.path):
+            return []
+
+        parts: Dict[int, Dict[int, bytes]] = {}
+        lengths: Dict[int, int] = {}
+        with file_lock(self.lock_file):
+            self._open()
+            with open(self.path, 'rb') as f:
+                f.seek(_HEADER.size)
+                for _ in range(self.capacity):
+                    slot = f.read(self.slot_size)
+                    if len(slot) < _SLOT.size:
+                        break
+                    seq, length, part = _SLOT.unpack_from(slot)
+                    if seq == 0:
+                        continue
+                    parts.setdefault(seq, {})[part] = slot[_SLOT.size:]
+                    lengths[seq] = length
+
+        payload_size = self._payload_size
+        results = []
+        for seq in sorted(parts, reverse=True):
+            expected = max(1, -(-lengths[seq] // payload_size))
+            chunks = parts[seq]
+            if len(chunks) != expected:
+                # Partly overwritten by newer backups
+                continue
+            data = b''.join(chunks[i] for i in range(expected))[:lengths[seq]]
+            try:
+                record = json.loads(data.decode('utf-8'))
+            except ValueError:
+                continue
+            record['id'] = seq
+            results.append(record)
+        return results
+
+    def find(self, name: Optional[str] = None, entry_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Newest backup of a variable, or the backup with the given id"""
+        for record in self.entries():
+            if (entry_id is not None and record['id'] == entry_id) or \
+                    (entry_id is None and record['name'] == name):
+                return record
+        return None
@@ -1,8 +1,10 @@
 import argparse
+import re
 import sys
 import os
-from typing import List
+from typing import Dict, List
 from .env_manager import EnvironmentManager
+from .export_formats import COMPRESSIONS, EXPORT_FORMATS
 
 
 class EnvironmentCLI:
@@ -11,6 +13,7 @@ class EnvironmentCLI:
     def __init__(self):
         self.env_manager = EnvironmentManager()
         self.parser = self._create_parser()
+        self._daemon_client = None
     
     def _create_parser(self) -> argparse.ArgumentParser:
         """Create command-line argument parser"""
@@ -24,12 +27,35 @@ Examples:
   envgod set MY_VAR "my_value" --persist # Set persistent variable  
   envgod get MY_VAR                      # Get variable value
   envgod delete MY_VAR --persist         # Delete persistent variable
+  envgod backups                         # List backups of deleted variables
+  envgod restore MY_VAR --persist        # Restore newest backup of MY_VAR
   envgod list                            # List all variables
   envgod search "path"                   # Search variables
+  envgod search "JAVA_*" --glob -n       # Search names with a glob pattern
   envgod export vars.json                # Export all variables
+  envgod export vars.env.gz              # Export as gzip-compressed dotenv
   envgod import vars.json --persist      # Import variables
+  envgod import base.json conf.d/ -p     # Layer many files, later ones win
+  envgod use envs.json production        # Apply one profile of a multi-env file
+  envgod apply vars.json --persist -n    # Show what applying a file would change
+  envgod cache stats                     # Show import cache hit rates
+  envgod run -i vars.json -- make build  # Run a command with imported variables
+  envgod import huge.json --stream       # Import a large file incrementally
+  envgod daemon start &                  # Serve lookups from a background daemon
+  envgod path prepend PATH ~/bin -p      # Put a directory first in PATH
+  envgod path check                      # Flag missing, duplicate, shadowed entries
+  envgod which -a python pip             # Every match across PATH, first one wins
+  envgod which java -i jdk17.json        # Resolve against the PATH a file would set
+  envgod --timings import vars.json      # Show where an import spends its time
+  envgod stats                           # Timings accumulated by --timings runs
             """
         )
+        parser.add_argument('--no-daemon', action='store_true',
+                            help='Work directly even if a daemon is running')
+        parser.add_argument('--timings', action='store_true',
+                            help='Print per-phase timings to stderr and add them to "stats"')
+        parser.add_argument('--trace-memory', action='store_true',
+                            help='With --timings, also record peak memory per phase (slower)')
         
         subparsers = parser.add_subparsers(
             dest='command', 
@@ -49,33 +75,215 @@ Examples:
         
         # Delete command
         del_parser = subparsers.add_parser('delete', help='Delete environment variable')
-        del_parser.add_argument('name', help='Variable name')
+        del_parser.add_argument('names', nargs='+', metavar='name', help='Variable name(s)')
         del_parser.add_argument('--persist', '-p', action='store_true',
                                help='Delete persistent variable')
         del_parser.add_argument('--force', '-f', action='store_true',
                                help='Force deletion of protected/sensitive variables')
         
+        # Backups command
+        subparsers.add_parser('backups', help='List backups of deleted persistent variables')
+        
+        # Restore command
+        restore_parser = subparsers.add_parser('restore', help='Restore a deleted variable from backup')
+        restore_target = restore_parser.add_mutually_exclusive_group(required=True)
+        restore_target.add_argument('name', nargs='?', help='Variable name (restores newest backup)')
+        restore_target.add_argument('--id', type=int, dest='entry_id', help='Backup id from the backups command')
+        restore_parser.add_argument('--persist', '-p', action='store_true',
+                                   help='Make restored variable persistent')
+        
         # List command
         list_parser = subparsers.add_parser('list', help='List environment variables')
         list_parser.add_argument('--saved', '-s', action='store_true',
                                 help='Show only saved persistent variables')
+        list_parser.add_argument('--safety', action='store_true',
+                                help='Show the safety level of each variable')
         
         # Search command
         search_parser = subparsers.add_parser('search', help='Search environment variables')
         search_parser.add_argument('term', help='Search term')
+        mode_group = search_parser.add_mutually_exclusive_group()
+        mode_group.add_argument('--glob', '-g', dest='mode', action='store_const', const='glob',
+                                default='substring', help='Treat term as a shell-style pattern (e.g. "JAVA_*")')
+        mode_group.add_argument('--regex', '-r', dest='mode', action='store_const', const='regex',
+                                help='Treat term as a regular expression')
+        field_group = search_parser.add_mutually_exclusive_group()
+        field_group.add_argument('--name-only', '-n', dest='field', action='store_const', const='name',
+                                 default='both', help='Match variable names only')
+        field_group.add_argument('--value-only', '-v', dest='field', action='store_const', const='value',
+                                 help='Match variable values only')
         
         # Export command
         export_parser = subparsers.add_parser('export', help='Export environment variables')
         export_parser.add_argument('filename', help='Output filename')
         export_parser.add_argument('--vars', nargs='+', help='Specific variables to export')
+        export_parser.add_argument('--format', '-f', dest='fmt', choices=EXPORT_FORMATS,
+                                  help='Output format (default: from the file extension, else json)')
+        export_parser.add_argument('--compress', choices=COMPRESSIONS,
+                                  help='Compress the output (default: from a .gz/.xz extension)')
         
         # Import command
         import_parser = subparsers.add_parser('import', help='Import environment variables')
-        import_parser.add_argument('filename', help='Input filename')
+        import_parser.add_argument('paths', nargs='+', metavar='path',
+                                  help='JSON files, glob patterns or directories; '
+                                       'later files override earlier ones')
         import_parser.add_argument('--persist', '-p', action='store_true',
                                   help='Make imported variables persistent')
         import_parser.add_argument('--no-flatten', action='store_true',
                                   help='Disable automatic flattening of nested JSON')
+        import_parser.add_argument('--stream', action='store_true',
+                                  help='Read large files incrementally with bounded memory')
+        import_parser.add_argument('--separator', default='_',
+                                  help='Separator for flattened keys (default: _)')
+        import_parser.add_argument('--key-case', choices=['upper', 'lower'],
+                                  help='Normalize the case of flattened keys')
+        import_parser.add_argument('--index-lists', action='store_true',
+                                  help='Flatten list items as NAME_0, NAME_1, ...')
+        import_parser.add_argument('--no-cache', action='store_true',
+                                  help='Parse the file without consulting the parse cache')
+        import_parser.add_argument('--jobs', '-j', type=int,
+                                  help='Worker processes for parsing many files (default: CPU count)')
+        import_parser.add_argument('--interpolate', action='store_true',
+                                  help='Expand ${NAME} and ${NAME:-default} references in values')
+        
+        # Apply command
+        apply_parser = subparsers.add_parser(
+            'apply', help='Apply only the differences to a target environment',
+            description='Compare a JSON file, one of its profiles or an exported snapshot '
+                        'with the current variables (the saved ones with --persist) and '
+                        'change only the names whose values differ.')
+        apply_parser.add_argument('filename', help='JSON file or exported snapshot')
+        apply_parser.add_argument('--profile', help='Apply this profile of a multi-env file')
+        apply_parser.add_argument('--persist', '-p', action='store_true',
+                                 help='Compare with and update the saved variables')
+        apply_parser.add_argument('--prune', action='store_true',
+                                 help='Also delete variables missing from the target')
+        apply_parser.add_argument('--dry-run', '-n', action='store_true',
+                                 help='Only show the differences')
+        apply_parser.add_argument('--interpolate', action='store_true',
+                                 help='Expand ${NAME} and ${NAME:-default} references in values')
+        apply_parser.add_argument('--force', '-f', action='store_true',
+                                 help='Allow pruning protected or sensitive variables')
+        apply_parser.add_argument('--separator', default='_',
+                                 help='Separator for flattened keys (default: _)')
+        apply_parser.add_argument('--key-case', choices=['upper', 'lower'],
+                                 help='Normalize the case of flattened keys')
+        apply_parser.add_argument('--index-lists', action='store_true',
+                                 help='Flatten list items as NAME_0, NAME_1, ...')
+        
+        # Run command
+        run_parser = subparsers.add_parser(
+            'run', help='Run a command with a resolved environment',
+            description='Run a command with variables from files, profiles and overrides. '
+                        'Nothing is persisted and saved variables are only loaded with --saved.')
+        run_parser.add_argument('--import', '-i', dest='imports', action='append', default=[],
+                               metavar='FILE', help='Import variables from a JSON file (repeatable)')
+        run_parser.add_argument('--profile', help='Use this profile of each imported file')
+        run_parser.add_argument('--set', '-s', dest='overrides', action='append', default=[],
+                               metavar='NAME=VALUE', help='Set a variable (repeatable)')
+        run_parser.add_argument('--saved', action='store_true',
+                               help='Include saved persistent variables')
+        run_parser.add_argument('--clean', action='store_true',
+                               help='Start from an empty environment instead of the current one')
+        run_parser.add_argument('--interpolate', action='store_true',
+                               help='Expand ${NAME} references in imported values')
+        run_parser.add_argument('cmd', nargs=argparse.REMAINDER, metavar='-- command args',
+                               help='Command to run')
+        
+        # Daemon command
+        daemon_parser = subparsers.add_parser(
+            'daemon', help='Run or control the lookup daemon',
+            description='Keep saved variables, profiles and the search index in memory and '
+                        'serve saved lists, searches and profiles over a Unix socket. Other commands '
+                        'use a running daemon automatically.')
+        daemon_parser.add_argument('action', nargs='?', default='start',
+                                  choices=['start', 'stop', 'status'],
+                                  help='start serves in the foreground (default: start)')
+        daemon_parser.add_argument('--socket',
+                                  help='Socket path (default: $ENVGOD_SOCKET or next to the config)')
+        
+        # Path command
+        path_parser = subparsers.add_parser(
+            'path', help='Edit or check list variables such as PATH and PYTHONPATH')
+        path_actions = path_parser.add_subparsers(dest='path_action', metavar='action')
+        path_actions.required = True
+        show_parser = path_actions.add_parser('show', help='List the entries, numbered')
+        show_parser.add_argument('name', nargs='?', default='PATH', help='Variable (default: PATH)')
+        for action, help_text in (('prepend', 'Put entries first (moving existing ones)'),
+                                  ('append', 'Put entries last (moving existing ones)'),
+                                  ('remove', 'Remove entries')):
+            action_parser = path_actions.add_parser(action, help=help_text)
+            action_parser.add_argument('name', help='Variable, e.g. PATH')
+            action_parser.add_argument('entries', nargs='+', metavar='entry', help='Path entries')
+            action_parser.add_argument('--persist', '-p', action='store_true',
+                                      help='Make the change persistent')
+        dedupe_parser = path_actions.add_parser('dedupe', help='Drop repeated and empty entries')
+        dedupe_parser.add_argument('name', nargs='?', default='PATH', help='Variable (default: PATH)')
+        dedupe_parser.add_argument('--persist', '-p', action='store_true',
+                                  help='Make the change persistent')
+        move_parser = path_actions.add_parser('move', help='Move an entry to a position')
+        move_parser.add_argument('name', help='Variable, e.g. PATH')
+        move_parser.add_argument('entry', help='Entry to move')
+        move_parser.add_argument('position', type=int, help='New index (0 = first, -1 = last)')
+        move_parser.add_argument('--persist', '-p', action='store_true',
+                                help='Make the change persistent')
+        check_parser = path_actions.add_parser(
+            'check', help='Flag missing, duplicate and shadowed entries')
+        check_parser.add_argument('name', nargs='?', default='PATH', help='Variable (default: PATH)')
+        check_parser.add_argument('--jobs', '-j', type=int,
+                                 help='Entries probed at once (default: 16)')
+        check_parser.add_argument('--timeout', type=float,
+                                 help='Seconds to wait for slow mounts (default: 5)')
+        check_parser.add_argument('--all', '-a', action='store_true',
+                                 help='Show entries without problems too')
+        
+        # Which command
+        which_parser = subparsers.add_parser(
+            'which', help='Show which file each command resolves to across PATH')
+        which_parser.add_argument('commands', nargs='+', metavar='command', help='Command names')
+        which_parser.add_argument('--all', '-a', action='store_true',
+                                 help='Show every match, including shadowed ones')
+        which_parser.add_argument('--path', help='Evaluate this PATH value instead of the current one')
+        which_parser.add_argument('--import', '-i', dest='imports', action='append', default=[],
+                                 metavar='FILE', help='Evaluate the PATH these files would set')
+        which_parser.add_argument('--profile', help='Profile of the --import files to use')
+        which_parser.add_argument('--interpolate', action='store_true',
+                                 help='Expand ${NAME} references in the --import files')
+        which_parser.add_argument('--prepend', action='append', default=[], metavar='DIR',
+                                 help='Evaluate PATH with DIR put first (repeatable)')
+        which_parser.add_argument('--append', action='append', default=[], metavar='DIR',
+                                 help='Evaluate PATH with DIR put last (repeatable)')
+        which_parser.add_argument('--rebuild', action='store_true',
+                                 help='Rescan every directory instead of using the index')
+        
+        # Cache command
+        cache_parser = subparsers.add_parser('cache', help='Inspect or clear the import caches')
+        cache_parser.add_argument('action', choices=['stats', 'clear'], help='Cache action')
+        
+        # Stats command
+        stats_parser = subparsers.add_parser(
+            'stats', help='Show per-phase timings recorded by --timings runs')
+        stats_parser.add_argument('--reset', action='store_true', help='Clear the recorded timings')
+        stats_parser.add_argument('--json', action='store_true', help='Print the raw statistics as JSON')
+        
+        # Use command
+        use_parser = subparsers.add_parser('use', help='Apply one profile of a multi-environment file')
+        use_parser.add_argument('filename', help='Input filename')
+        use_parser.add_argument('profile', nargs='?', help='Profile name (e.g. development)')
+        use_parser.add_argument('--list', '-l', action='store_true',
+                               help='List the profiles defined in the file')
+        use_parser.add_argument('--persist', '-p', action='store_true',
+                               help='Make variables persistent')
+        use_parser.add_argument('--no-cache', action='store_true',
+                               help='Resolve the profile without the on-disk cache')
+        use_parser.add_argument('--separator', default='_',
+                               help='Separator for flattened keys (default: _)')
+        use_parser.add_argument('--key-case', choices=['upper', 'lower'],
+                               help='Normalize the case of flattened keys')
+        use_parser.add_argument('--index-lists', action='store_true',
+                               help='Flatten list items as NAME_0, NAME_1, ...')
+        use_parser.add_argument('--interpolate', action='store_true',
+                               help='Expand ${NAME} and ${NAME:-default} references in values')
         
         return parser
     
@@ -89,12 +297,30 @@ Examples:
             return 0
         
         parsed_args = self.parser.parse_args(args)
+        metrics = self.env_manager.metrics
+        if parsed_args.timings:
+            metrics.enable(trace_memory=parsed_args.trace_memory)
         
+        result = 1
         try:
-            return self._execute_command(parsed_args)
+            with metrics.phase(f"command.{parsed_args.command}"):
+                result = self._execute_command(parsed_args)
+            return result
         except Exception as e:
             print(f"Error: {e}")
             return 1
+        finally:
+            self._finish_timings(parsed_args, result == 0)
+    
+    def _finish_timings(self, args, succeeded: bool) -> None:
+        """Print and store what this run recorded, if timings are on"""
+        metrics = self.env_manager.metrics
+        # A metrics hook alone forwards phases without printing or storing them
+        if not (args.timings or os.environ.get("ENVGOD_TIMINGS")) or args.command == 'stats':
+            return
+        if metrics.phases:
+            print(metrics.report(), file=sys.stderr)
+        self.env_manager.save_metrics(args.command, succeeded)
     
     def _execute_command(self, args) -> int:
         """Execute the parsed command"""
@@ -104,6 +330,10 @@ Examples:
             return self._cmd_get(args)
         elif args.command == 'delete':
             return self._cmd_delete(args)
+        elif args.command == 'backups':
+            return self._cmd_backups(args)
+        elif args.command == 'restore':
+            return self._cmd_restore(args)
         elif args.command == 'list':
             return self._cmd_list(args)
         elif args.command == 'search':
@@ -112,10 +342,61 @@ Examples:
             return self._cmd_export(args)
         elif args.command == 'import':
             return self._cmd_import(args)
+        elif args.command == 'use':
+            return self._cmd_use(args)
+        elif args.command == 'path':
+            return self._cmd_path(args)
+        elif args.command == 'which':
+            return self._cmd_which(args)
+        elif args.command == 'cache':
+            return self._cmd_cache(args)
+        elif args.command == 'stats':
+            return self._cmd_stats(args)
+        elif args.command == 'apply':
+            return self._cmd_apply(args)
+        elif args.command == 'run':
+            return self._cmd_run(args)
+        elif args.command == 'daemon':
+            return self._cmd_daemon(args)
         else:
             self.parser.print_help()
             return 0
     
+    def _daemon(self, args):
+        """Client for a running daemon, or None to work directly"""
+        if self._daemon_client is None:
+            if args.no_daemon or os.environ.get("ENVGOD_NO_DAEMON"):
+                return None
+            from .daemon import DaemonClient, default_socket_path
+            self._daemon_client = DaemonClient.connect(
+                default_socket_path(self.env_manager.config_file))
+        return self._daemon_client
+    
+    def _query(self, args, op: str, direct, **params):
+        """Run op on the daemon if one is running, else call direct()
+        
+        Only lookups of daemon-side state go through here: saved variables,
+        profiles and searches, which send this process's environment along.
+        """
+        client = self._daemon(args)
+        if client is not None:
+            try:
+                return client.request(op, **params)
+            except OSError:
+                # The daemon went away; carry on without it
+                self._daemon_client = None
+                args.no_daemon = True
+        return direct()
+    
+    def _resolve_profile(self, args, filename: str, profile: str, options: Dict,
+                         use_cache: bool = True) -> Dict[str, str]:
+        """Resolve a profile, from the daemon's in-memory cache when one is running"""
+        direct = lambda: self.env_manager.resolve_profile(filename, profile, use_cache, **options)
+        if not use_cache:
+            return direct()
+        return self._query(args, 'profile', direct, filename=os.path.abspath(filename),
+                           profile=profile, options=options)
+    
     def _cmd_set(self, args) -> int:
         """Handle set command"""
         success = self.env_manager.set_env_var(args.name, args.value, args.persist)
@@ -139,25 +420,57 @@ Examples:
     
     def _cmd_delete(self, args) -> int:
         """Handle delete command"""
-        # Check safety first
-        safety_info = self.env_manager.get_variable_safety_info(args.name)
+        # Check safety first, for every variable before deleting any
+        safety = self.env_manager.classify_variables(args.names)
         
         if not args.force:
-            if safety_info['is_protected']:
-                print(f"[ERROR] {safety_info['recommendation']}")
-                print(f"Use --force to override protection for '{args.name}'")
-                return 1
-            elif safety_info['is_sensitive']:
-                print(f"[WARNING] {safety_info['recommendation']}")
-                print(f"Use --force to confirm deletion of '{args.name}'")
+            for name in args.names:
+                safety_info = safety[name]
+                if safety_info['is_protected']:
+                    print(f"[ERROR] {safety_info['recommendation']}")
+                    print(f"Use --force to override protection for '{name}'")
+                    return 1
+                elif safety_info['is_sensitive']:
+                    print(f"[WARNING] {safety_info['recommendation']}")
+                    print(f"Use --force to confirm deletion of '{name}'")
+                    return 1
+        
+        status = "persistent" if args.persist else "temporary"
+        if len(args.names) == 1:
+            success, message = self.env_manager.delete_env_var(args.names[0], args.persist, args.force)
+            if not success:
+                print(f"[ERROR] {message}")
                 return 1
+        else:
+            # One transaction: one config write and one batched backup
+            with self.env_manager.transaction() as txn:
+                for name in args.names:
+                    txn.delete(name, args.persist)
+        
+        for name in args.names:
+            print(f"[OK] Deleted {status} variable: {name}")
+        if args.force:
+            print("[WARNING] Used force override")
+        return 0
+    
+    def _cmd_backups(self, args) -> int:
+        """Handle backups command"""
+        backups = self.env_manager.list_backups()
+        if not backups:
+            print("No backups found.")
+            return 0
         
-        success, message = self.env_manager.delete_env_var(args.name, args.persist, args.force)
+        print("Deleted variable backups (newest first):")
+        for entry in backups:
+            print(f"[{entry['id']}] {entry['deleted_at']}  {entry['name']} = {entry['value']}")
+        print(f"\nTotal: {len(backups)} backups")
+        return 0
+    
+    def _cmd_restore(self, args) -> int:
+        """Handle restore command"""
+        success, message = self.env_manager.restore_backup(args.name, args.entry_id, args.persist)
         if success:
-            status = "persistent" if args.persist else "temporary"
-            print(f"[OK] Deleted {status} variable: {args.name}")
-            if args.force:
-                print("[WARNING] Used force override")
+            print(f"[OK] {message}")
             return 0
         else:
             print(f"[ERROR] {message}")
@@ -166,7 +479,7 @@ Examples:
     def _cmd_list(self, args) -> int:
         """Handle list command"""
         if args.saved:
-            vars_dict = self.env_manager.get_saved_vars()
+            vars_dict = self._query(args, 'list', self.env_manager.get_saved_vars, saved=True)
             print("Saved persistent variables:")
         else:
             vars_dict = self.env_manager.get_all_env_vars()
@@ -177,15 +490,32 @@ Examples:
             return 0
         
         # Sort and display
-        for name, value in sorted(vars_dict.items()):
-            print(f"{name} = {value}")
+        names = sorted(vars_dict)
+        if args.safety:
+            safety = self.env_manager.classify_variables(names)
+            for name in names:
+                print(f"[{safety[name]['level'].upper()}] {name} = {vars_dict[name]}")
+        else:
+            for name in names:
+                print(f"{name} = {vars_dict[name]}")
         
         print(f"\nTotal: {len(vars_dict)} variables")
         return 0
     
     def _cmd_search(self, args) -> int:
         """Handle search command"""
-        results = self.env_manager.search_env_vars(args.term)
+        from .daemon import DaemonError
+        try:
+            results = self._query(
+                args, 'search',
+                lambda: self.env_manager.search_env_vars(args.term, args.mode, args.field),
+                term=args.term, mode=args.mode, field=args.field, environ=dict(os.environ))
+        except re.error as e:
+            print(f"[ERROR] Invalid regular expression '{args.term}': {e}")
+            return 1
+        except DaemonError as e:
+            print(f"[ERROR] {e}")
+            return 1
         if results:
             print(f"Variables matching '{args.term}':")
             for name, value in sorted(results.items()):
@@ -197,7 +527,8 @@ Examples:
     
     def _cmd_export(self, args) -> int:
         """Handle export command"""
-        success = self.env_manager.export_env_vars(args.filename, args.vars)
+        success = self.env_manager.export_env_vars(args.filename, args.vars, args.fmt,
+                                                   args.compress)
         if success:
             print(f"[OK] Exported variables to: {args.filename}")
             return 0
@@ -207,20 +538,372 @@ Examples:
     
     def _cmd_import(self, args) -> int:
         """Handle import command"""
-        if not os.path.exists(args.filename):
-            print(f"File not found: {args.filename}")
+        from .multi_import import expand_import_paths
+        try:
+            filenames = expand_import_paths(args.paths)
+        except FileNotFoundError as e:
+            print(e)
             return 1
         
         flatten = not args.no_flatten
-        success = self.env_manager.import_env_vars(args.filename, args.persist, flatten)
+        options = {
+            'separator': args.separator,
+            'key_case': args.key_case,
+            'index_lists': args.index_lists,
+        }
+        if args.stream:
+            if len(filenames) > 1:
+                print("[ERROR] --stream imports a single file")
+                return 1
+            if args.interpolate:
+                # Values are applied as they are read, before later keys are known
+                print("[ERROR] --interpolate cannot be combined with --stream")
+                return 1
+            success = self.env_manager.import_env_vars_streaming(
+                filenames[0], args.persist, flatten, **options)
+        elif len(filenames) == 1:
+            success = self.env_manager.import_env_vars(
+                filenames[0], args.persist, flatten, use_cache=not args.no_cache,
+                interpolate=args.interpolate, **options)
+        else:
+            success = self.env_manager.import_env_files(
+                filenames, args.persist, flatten, use_cache=not args.no_cache,
+                jobs=args.jobs, interpolate=args.interpolate, **options)
+        
+        source = filenames[0] if len(filenames) == 1 else f"{len(filenames)} files"
         if success:
             status = "persistent" if args.persist else "temporary"  
             flatten_info = " (flattened)" if flatten else " (as-is)"
-            print(f"[OK] Imported {status} variables from: {args.filename}{flatten_info}")
+            print(f"[OK] Imported {status} variables from: {source}{flatten_info}")
             return 0
         else:
-            print(f"[ERROR] Failed to import variables from: {args.filename}")
+            print(f"[ERROR] Failed to import variables from: {source}")
             return 1
+    
+    def _cmd_use(self, args) -> int:
+        """Handle use command"""
+        if not os.path.exists(args.filename):
+            print(f"File not found: {args.filename}")
+            return 1
+        
+        if args.list or not args.profile:
+            profiles = self.env_manager.list_profiles(args.filename)
+            if not profiles:
+                print(f"No profiles found in: {args.filename}")
+                return 1
+            print(f"Profiles in {args.filename}:")
+            for profile in profiles:
+                print(f"  {profile}")
+            return 0
+        
+        from .daemon import DaemonError
+        options = {
+            'separator': args.separator,
+            'key_case': args.key_case,
+            'index_lists': args.index_lists,
+        }
+        try:
+            env_vars = self._resolve_profile(args, args.filename, args.profile, options,
+                                             not args.no_cache)
+        except KeyError as e:
+            print(f"[ERROR] {e.args[0]}")
+            return 1
+        except (DaemonError, ValueError, OSError) as e:
+            print(f"[ERROR] Could not read profile '{args.profile}': {e}")
+            return 1
+        
+        success = self.env_manager.apply_profile(args.profile, env_vars, args.persist,
+                                                 args.interpolate)
+        if success:
+            status = "persistent" if args.persist else "temporary"
+            print(f"[OK] Applied {status} profile '{args.profile}' from: {args.filename}")
+            return 0
+        else:
+            print(f"[ERROR] Failed to apply profile '{args.profile}' from: {args.filename}")
+            return 1
+    
+    def _cmd_apply(self, args) -> int:
+        """Handle apply command"""
+        if not os.path.exists(args.filename):
+            print(f"File not found: {args.filename}")
+            return 1
+        
+        options = {
+            'separator': args.separator,
+            'key_case': args.key_case,
+            'index_lists': args.index_lists,
+        }
+        try:
+            if args.profile:
+                target = self._resolve_profile(args, args.filename, args.profile, options)
+            else:
+                target = self.env_manager.load_import_file(args.filename, **options)
+            if args.interpolate:
+                target = self.env_manager.interpolate_variables(target, persistent=args.persist)
+        except KeyError as e:
+            print(f"[ERROR] {e.args[0]}")
+            return 1
+        except Exception as e:
+            print(f"[ERROR] Could not read {args.filename}: {e}")
+            return 1
+        
+        diff = self.env_manager.diff_environment(target, args.persist)
+        # Without --persist the baseline is the whole process environment, so
+        # names missing from the target only matter when pruning
+        show_removed = args.prune or args.persist
+        
+        for name in sorted(diff.added):
+            print(f"+ {name} = {diff.added[name]}")
+        for name in sorted(diff.changed):
+            old_value, new_value = diff.changed[name]
+            print(f"~ {name}: {old_value} -> {new_value}")
+        if show_removed:
+            for name in sorted(diff.removed):
+                if args.prune:
+                    print(f"- {name}")
+                else:
+                    print(f"  {name} (not in target, kept without --prune)")
+        print(f"\n{diff.summary(args.prune)}")
+        if show_removed and not args.prune and diff.removed:
+            print(f"{len(diff.removed)} saved variables are not in the target (--prune deletes them)")
+        
+        if args.dry_run or not diff.has_changes(args.prune):
+            return 0
+        
+        if args.prune and not args.force:
+            safety = self.env_manager.classify_variables(list(diff.removed))
+            blocked = [name for name in sorted(diff.removed)
+                       if safety[name]['is_protected'] or safety[name]['is_sensitive']]
+            if blocked:
+                print(f"[ERROR] Pruning would delete protected or sensitive variables: "
+                      f"{', '.join(blocked)}")
+                print("Use --force to override")
+                return 1
+        
+        self.env_manager.apply_environment(target, args.persist, args.prune)
+        status = "persistent" if args.persist else "temporary"
+        print(f"[OK] Applied {status} changes from: {args.filename}")
+        return 0
+    
+    def _cmd_path(self, args) -> int:
+        """Handle path command"""
+        if args.path_action == 'show':
+            for index, entry in enumerate(self.env_manager.get_path_list(args.name)):
+                print(f"{index:>4}  {entry}")
+            return 0
+        
+        if args.path_action == 'check':
+            return self._cmd_path_check(args)
+        
+        if args.path_action == 'move':
+            entries, position = [args.entry], args.position
+        elif args.path_action == 'dedupe':
+            entries, position = [], None
+        else:
+            entries, position = args.entries, None
+        success, message = self.env_manager.edit_path_list(
+            args.name, args.path_action, entries, position, args.persist)
+        print(f"[OK] {message}" if success else f"[ERROR] {message}")
+        return 0 if success else 1
+    
+    def _cmd_path_check(self, args) -> int:
+        """Report problem entries; exits with 1 if there are any"""
+        report = self.env_manager.check_path_list(args.name, args.jobs, args.timeout)
+        problems = [item for item in report if item['status'] != 'ok']
+        print(f"{args.name}: {len(report)} entries, {len(problems)} with problems")
+        for item in report if args.all else problems:
+            detail = f"  ({item['detail']})" if item['detail'] else ''
+            print(f"{item['index']:>4}  {item['status']:<16} {item['entry']}{detail}")
+        return 1 if problems else 0
+    
+    def _cmd_which(self, args) -> int:
+        """Handle which command; exits with 1 if a command is not found"""
+        from .path_list import PathList
+        
+        proposed = None
+        if args.imports:
+            try:
+                env = self.env_manager.build_environment(args.imports, args.profile,
+                                                         interpolate=args.interpolate)
+            except KeyError as e:
+                print(f"[ERROR] {e.args[0]}")
+                return 1
+            except Exception as e:
+                print(f"[ERROR] Could not build environment: {e}")
+                return 1
+            proposed = env.get('PATH', '')
+        elif args.path is not None:
+            proposed = args.path
+        if args.prepend or args.append:
+            paths = PathList.from_value(os.environ.get('PATH', '') if proposed is None else proposed)
+            paths.prepend(args.prepend)
+            paths.append(args.append)
+            proposed = paths.value
+        
+        matches = self.env_manager.which(args.commands, proposed, args.rebuild)
+        current = self.env_manager.which(args.commands) if proposed is not None else matches
+        
+        missing = 0
+        for command, found in matches.items():
+            now = current[command][0] if current[command] else None
+            if not found:
+                missing += 1
+                change = f"  (currently {now})" if now else ''
+                print(f"{command}: not found{change}")
+                continue
+            change = f"  (currently {now or 'not found'})" if found[0] != now else ''
+            shadowed = f"  (+{len(found) - 1} shadowed)" if len(found) > 1 and not args.all else ''
+            print(f"{command}: {found[0]}{change}{shadowed}")
+            if args.all:
+                for path in found[1:]:
+                    print(f"    shadowed: {path}")
+        return 1 if missing else 0
+    
+    def _cmd_cache(self, args) -> int:
+        """Handle cache command"""
+        if args.action == 'clear':
+            self.env_manager.clear_caches()
+            print(f"[OK] Cleared caches in: {self.env_manager.cache_dir}")
+            return 0
+        
+        stats = self.env_manager.parse_cache.stats()
+        print("Parse cache:")
+        print(f"  Entries:       {stats['entries']}")
+        print(f"  Size:          {stats['size_bytes'] / 1024:.1f} KB of {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+        print(f"  Tracked files: {stats['tracked_files']}")
+        print(f"  Hits:          {stats['hits']}")
+        print(f"  Misses:        {stats['misses']}")
+        print(f"  Hit rate:      {stats['hit_rate']:.1%}")
+        
+        index = self.env_manager.command_index.stats()
+        print("Command index:")
+        print(f"  Directories:   {index['directories']}")
+        print(f"  Commands:      {index['commands']}")
+        return 0
+    
+    def _cmd_stats(self, args) -> int:
+        """Handle stats command"""
+        from .metrics import format_phases
+        
+        store = self.env_manager.stats_store
+        if args.reset:
+            store.clear()
+            print("[OK] Cleared recorded timings")
+            return 0
+        
+        stats = store.load()
+        if args.json:
+            import json
+            print(json.dumps(stats, indent=2))
+            return 0
+        if not stats['phases']:
+            print("No timings recorded yet. Run commands with --timings or ENVGOD_TIMINGS=1.")
+            return 0
+        
+        print(f"Timings recorded since {stats['since']}")
+        print("\nCommands:")
+        for command, runs in sorted(stats['commands'].items()):
+            print(f"  {command:<12} {runs['runs']:>6} runs, {runs['failures']} failed")
+        print()
+        # Slowest phases first
+        phases = dict(sorted(stats['phases'].items(), key=lambda item: -item[1]['total']))
+        print(format_phases(phases))
+        return 0
+    
+    def _cmd_run(self, args) -> int:
+        """Handle run command"""
+        command = args.cmd[1:] if args.cmd[:1] == ['--'] else args.cmd
+        if not command:
+            print("[ERROR] No command given. Example: envgod run --set DEBUG=1 -- python app.py")
+            return 1
+        
+        overrides = {}
+        for assignment in args.overrides:
+            name, sep, value = assignment.partition('=')
+            if not sep or not name:
+                print(f"[ERROR] Invalid --set value '{assignment}', expected NAME=VALUE")
+                return 1
+            overrides[name] = value
+        
+        for filename in args.imports:
+            if not os.path.exists(filename):
+                print(f"File not found: {filename}")
+                return 1
+        
+        try:
+            env = self.env_manager.build_environment(
+                args.imports, args.profile, overrides, args.saved, {} if args.clean else None,
+                args.interpolate)
+        except KeyError as e:
+            print(f"[ERROR] {e.args[0]}")
+            return 1
+        except Exception as e:
+            print(f"[ERROR] Could not build environment: {e}")
+            return 1
+        
+        sys.stdout.flush()
+        if sys.platform == "win32":
+            # Windows has no real exec; run the child and pass its exit code on
+            import subprocess
+            try:
+                with self.env_manager.metrics.phase('subprocess.command'):
+                    return subprocess.call(command, env=env)
+            except OSError as e:
+                print(f"[ERROR] Could not run '{command[0]}': {e}")
+                return 127
+        
+        # exec replaces this process, so report timings first
+        self._finish_timings(args, True)
+        sys.stdout.flush()
+        try:
+            os.execvpe(command[0], command, env)
+        except OSError as e:
+            print(f"[ERROR] Could not run '{command[0]}': {e}")
+            return 127
+    
+    def _cmd_daemon(self, args) -> int:
+        """Handle daemon command"""
+        from .daemon import (DaemonClient, DaemonError, EnvironmentDaemon,
+                             default_socket_path, is_supported)
+        if not is_supported():
+            print("[ERROR] The daemon needs Unix-domain sockets, which this platform lacks")
+            return 1
+        
+        socket_path = args.socket or default_socket_path(self.env_manager.config_file)
+        if args.action == 'start':
+            daemon = EnvironmentDaemon(self.env_manager, socket_path)
+            try:
+                daemon.bind()
+            except DaemonError as e:
+                print(f"[ERROR] {e}")
+                return 1
+            print(f"[OK] Daemon (pid {os.getpid()}) serving on {socket_path}")
+            sys.stdout.flush()
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            print("Daemon stopped")
+            return 0
+        
+        client = DaemonClient.connect(socket_path)
+        if client is None:
+            print(f"No daemon is running on {socket_path}")
+            return 1
+        with client:
+            if args.action == 'stop':
+                client.request('shutdown')
+                print(f"[OK] Stopped daemon on {socket_path}")
+                return 0
+            status = client.request('ping')
+        print(f"Daemon on {socket_path}:")
+        print(f"  PID:             {status['pid']}")
+        print(f"  Uptime:          {status['uptime']:.0f} s")
+        print(f"  Requests:        {status['requests']}")
+        print(f"  Variables:       {status['variables']}")
+        print(f"  Saved variables: {status['saved_variables']}")
+        print(f"  Cached profiles: {status['cached_profiles']}")
+        return 0
 
 
 def main():
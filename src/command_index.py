@@ -0,0 +1,154 @@
+import marshal
+import os
+import stat
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .file_lock import atomic_write
+from .path_list import entry_key
+
+# Bump when the cached representation changes
+CACHE_FORMAT = 1
+
+_WINDOWS = sys.platform == "win32"
+
+
+def _executable_suffixes() -> Tuple[str, ...]:
+    """Extensions Windows tries for a bare command name, lower-cased"""
+    pathext = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD")
+    return tuple(ext.lower() for ext in pathext.split(os.pathsep) if ext)
+
+
+def scan_directory(directory: str) -> List[str]:
+    """Names of the commands in one directory, from a single scandir pass
+
+    On Windows every file with a PATHEXT extension counts and names are
+    lower-cased, as lookups ignore case there. Elsewhere a file counts when
+    it has an execute bit; symlinks are followed.
+    """
+    names = []
+    suffixes = _executable_suffixes() if _WINDOWS else ()
+    with os.scandir(directory) as scan:
+        for entry in scan:
+            try:
+                if _WINDOWS:
+                    name = entry.name.lower()
+                    if name.endswith(suffixes) and entry.is_file():
+                        names.append(name)
+                elif entry.is_file():
+                    mode = entry.stat().st_mode
+                    if stat.S_ISREG(mode) and mode & 0o111:
+                        names.append(entry.name)
+            except OSError:
+                # Dangling symlink or entry removed while scanning
+                continue
+    return names
+
+
+class CommandIndex:
+    """Command names per PATH directory, persisted between runs
+
+    Each directory is listed once and remembered with its modification
+    time; it is listed again only when that changes, which adding,
+    removing or renaming a file does. Changing the mode of an existing
+    file does not, so use rebuild() after a chmod.
+    """
+
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self._directories: Optional[Dict[str, Tuple[int, frozenset]]] = None
+        self._dirty = False
+        self.scanned = 0
+
+    def _load(self) -> Dict[str, Tuple[int, frozenset]]:
+        if self._directories is None:
+            self._directories = {}
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    data = marshal.loads(f.read())
+                if data.get('format') == CACHE_FORMAT:
+                    self._directories = {directory: (mtime, frozenset(names))
+                                         for directory, (mtime, names) in data['dirs'].items()}
+            except (OSError, EOFError, ValueError, TypeError, KeyError):
+                pass
+        return self._directories
+
+    def save(self) -> None:
+        """Write the index if any directory was (re)listed since loading"""
+        if not self._dirty:
+            return
+        data = {'format': CACHE_FORMAT,
+                'dirs': {directory: (mtime, tuple(names))
+                         for directory, (mtime, names) in self._directories.items()}}
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        atomic_write(self.cache_file, marshal.dumps(data))
+        self._dirty = False
+
+    def rebuild(self) -> None:
+        """Forget every listing so the next lookups rescan"""
+        self._directories = {}
+        self._dirty = True
+
+    def names(self, directory: str) -> frozenset:
+        """Commands in directory (empty if it does not exist), rescanning if it changed"""
+        directories = self._load()
+        key = os.path.abspath(directory)
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except OSError:
+            return frozenset()
+        cached = directories.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            names = frozenset(scan_directory(key))
+        except OSError:
+            return frozenset()
+        directories[key] = (mtime, names)
+        self._dirty = True
+        self.scanned += 1
+        return names
+
+    def which(self, commands: Iterable[str], entries: Iterable[str]) -> Dict[str, List[str]]:
+        """Every match for each command across the PATH entries, first match first
+
+        Each distinct directory is looked at once for all commands. An
+        empty entry means the current directory; a repeated entry is
+        skipped as it cannot add a match.
+        """
+        candidates = {command: self._candidates(command) for command in dict.fromkeys(commands)}
+        matches: Dict[str, List[str]] = {command: [] for command in candidates}
+
+        seen = set()
+        for entry in entries:
+            directory = entry or os.curdir
+            key = entry_key(directory)
+            if key in seen:
+                continue
+            seen.add(key)
+            names = self.names(directory)
+            if not names:
+                continue
+            for command, options in candidates.items():
+                for name in options:
+                    if name in names:
+                        matches[command].append(os.path.join(directory, name))
+                        # One file per directory: python.exe hides python.bat
+                        break
+        return matches
+
+    @staticmethod
+    def _candidates(command: str) -> Tuple[str, ...]:
+        """File names that command resolves to, in the order the OS tries them"""
+        if not _WINDOWS:
+            return (command,)
+        command = command.lower()
+        suffixes = _executable_suffixes()
+        if command.endswith(suffixes):
+            return (command,)
+        return tuple(command + suffix for suffix in suffixes)
+
+    def stats(self) -> Dict[str, Any]:
+        directories = self._load()
+        return {'directories': len(directories),
+                'commands': sum(len(names) for _, names in directories.values())}
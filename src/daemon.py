@@ -0,0 +1,350 @@
+import json
+import os
+import socket
+import struct
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Frame header: payload length as an unsigned 32-bit big-endian integer.
+# The payload is one compact JSON object; requests carry an "op" field and
+# responses are {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+_FRAME = struct.Struct('>I')
+
+# Larger frames are rejected so garbage on the socket cannot exhaust memory
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Seconds a client waits to connect before falling back to direct mode
+CONNECT_TIMEOUT = 0.5
+
+# Seconds a client waits for a response once connected
+REQUEST_TIMEOUT = 30.0
+
+SOCKET_NAME = "envgod.sock"
+
+# AF_UNIX paths are limited to 104 bytes on macOS and 108 on Linux
+_MAX_SOCKET_PATH = 100
+
+# socketserver and threading are only imported by the daemon process itself;
+# CLI commands import this module just to find and talk to a running daemon.
+
+
+class DaemonError(Exception):
+    """The daemon rejected a request or could not be started"""
+
+
+def is_supported() -> bool:
+    """Whether this platform has Unix-domain sockets"""
+    return hasattr(socket, 'AF_UNIX')
+
+
+def default_socket_path(config_file: str) -> str:
+    """Socket path for a config file: $ENVGOD_SOCKET, else next to the config"""
+    path = os.environ.get("ENVGOD_SOCKET")
+    if path:
+        return path
+    config_file = os.path.abspath(config_file)
+    path = os.path.join(os.path.dirname(config_file), SOCKET_NAME)
+    if len(path.encode('utf-8')) > _MAX_SOCKET_PATH:
+        # Too long to bind; use a short per-config name in the temp directory
+        import hashlib
+        import tempfile
+        digest = hashlib.sha1(config_file.encode('utf-8')).hexdigest()[:12]
+        path = os.path.join(tempfile.gettempdir(), f"envgod-{digest}.sock")
+    return path
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return _FRAME.pack(len(payload)) + payload
+
+
+def read_frame(reader) -> Optional[Dict[str, Any]]:
+    """Read one frame from a buffered reader, None on a clean end of stream"""
+    header = reader.read(_FRAME.size)
+    if not header:
+        return None
+    if len(header) < _FRAME.size:
+        raise ConnectionError("Connection closed inside a frame header")
+    (length,) = _FRAME.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise DaemonError(f"Frame of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+    payload = reader.read(length)
+    if len(payload) < length:
+        raise ConnectionError("Connection closed inside a frame")
+    return json.loads(payload)
+
+
+class DaemonClient:
+    """Connection to a running daemon
+
+    One connection serves any number of requests. pipeline() writes a batch
+    of requests before reading any response, so a batch costs one round trip.
+    Socket failures raise OSError, which callers treat as "no daemon";
+    errors reported by the daemon raise DaemonError.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._reader = sock.makefile('rb')
+
+    @classmethod
+    def connect(cls, socket_path: str) -> Optional['DaemonClient']:
+        """Connect to the daemon at socket_path, None if none is running"""
+        if not is_supported() or not os.path.exists(socket_path):
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+            sock.settimeout(REQUEST_TIMEOUT)
+        except OSError:
+            # Stale socket file left behind by a daemon that was killed
+            sock.close()
+            return None
+        return cls(sock)
+
+    def _response(self) -> Any:
+        response = read_frame(self._reader)
+        if response is None:
+            raise ConnectionError("Daemon closed the connection")
+        if not response.get('ok'):
+            raise DaemonError(response.get('error', 'Unknown daemon error'))
+        return response.get('result')
+
+    def request(self, op: str, **args: Any) -> Any:
+        """Send one request and return its result"""
+        args['op'] = op
+        self._sock.sendall(encode_frame(args))
+        return self._response()
+
+    def pipeline(self, requests: Iterable[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Send (op, args) requests in one write and return their results in order"""
+        import threading
+
+        frames = [encode_frame(dict(args, op=op)) for op, args in requests]
+        errors: List[OSError] = []
+
+        def send():
+            try:
+                self._sock.sendall(b''.join(frames))
+            except OSError as e:
+                errors.append(e)
+
+        # Write while reading: with large requests the daemon's responses
+        # fill the socket buffer before the whole batch has been sent
+        writer = threading.Thread(target=send, name='envgod-pipeline', daemon=True)
+        writer.start()
+        try:
+            return [self._response() for _ in frames]
+        finally:
+            writer.join()
+            if errors:
+                raise errors[0]
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class EnvironmentDaemon:
+    """Serve lookups from one long-lived EnvironmentManager over a Unix socket
+
+    Saved variables, the search index and resolved profiles stay in memory
+    between requests. The config file is stat'ed before each request and
+    reloaded when another process has changed it. Requests from all
+    connections are handled one at a time, since the manager is not
+    thread-safe; each is a dictionary lookup or an index query.
+
+    The daemon never answers from its own process environment, nor changes
+    it: a search carries the caller's environment, and the daemon's search
+    index (kept apart from os.environ) is updated for the names that differ
+    from the last environment it indexed. There are no operations to read
+    or set a single variable, since callers hold their environment
+    themselves.
+    """
+
+    _OPERATIONS = ('ping', 'list', 'search', 'profile', 'shutdown')
+
+    def __init__(self, manager, socket_path: Optional[str] = None):
+        import threading
+        self.manager = manager
+        self.socket_path = socket_path or default_socket_path(manager.config_file)
+        self.started_at = time.time()
+        self.requests = 0
+        self._profiles: Dict[Tuple, Dict[str, str]] = {}
+        # The environment the search index currently reflects
+        self._environ: Dict[str, str] = {}
+        self._index = None
+        self._config_signature = None
+        self._server = None
+        self._lock = threading.Lock()
+
+    def _signature(self) -> Tuple:
+        """Size and mtime of every file backing the saved variables"""
+        paths = [self.manager.config_file]
+        if self.manager.journal is not None:
+            paths.append(self.manager.journal.journal_file)
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one decoded request and build its response"""
+        op = request.get('op')
+        if op not in self._OPERATIONS:
+            return {'ok': False, 'error': f"Unknown operation '{op}'"}
+        try:
+            with self._lock:
+                signature = self._signature()
+                if signature != self._config_signature:
+                    self.manager.load_config()
+                    self._config_signature = signature
+                result = getattr(self, f"_op_{op}")(request)
+                self.requests += 1
+            return {'ok': True, 'result': result}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    def _op_ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started_at,
+            'requests': self.requests,
+            'variables': len(self._environ),
+            'saved_variables': len(self.manager.saved_vars),
+            'cached_profiles': len(self._profiles),
+        }
+
+    def _op_list(self, request: Dict[str, Any]) -> Dict[str, str]:
+        if not request.get('saved'):
+            raise ValueError("Only saved variables can be listed; "
+                             "the caller's environment is its own")
+        return self.manager.get_saved_vars()
+
+    def _op_search(self, request: Dict[str, Any]) -> Dict[str, str]:
+        import re
+        environ = request.get('environ')
+        if not isinstance(environ, dict):
+            raise ValueError("search needs the caller's environment in 'environ'")
+        self._sync_index(environ)
+        term = request['term']
+        try:
+            with self.manager.metrics.phase('search'):
+                names = self._index.search(term, request.get('mode', 'substring'),
+                                           request.get('field', 'both'))
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression '{term}': {e}")
+        return {name: environ[name] for name in names}
+
+    def _sync_index(self, environ: Dict[str, str]) -> None:
+        """Reindex only the names whose values differ from the last environment"""
+        from .search_index import SearchIndex
+
+        if self._index is None:
+            self._index = SearchIndex(environ)
+        else:
+            for name in self._environ:
+                if name not in environ:
+                    self._index.remove(name)
+            previous = self._environ
+            for name, value in environ.items():
+                if previous.get(name) != value:
+                    self._index.set(name, value)
+        self._environ = environ
+
+    def _op_profile(self, request: Dict[str, Any]) -> Dict[str, str]:
+        filename = os.path.abspath(request['filename'])
+        profile = request['profile']
+        options = request.get('options', {})
+        stat = os.stat(filename)
+        key = (filename, stat.st_size, stat.st_mtime_ns, profile.upper(),
+               json.dumps(options, sort_keys=True))
+        resolved = self._profiles.get(key)
+        if resolved is None:
+            try:
+                resolved = self.manager.resolve_profile(filename, profile, **options)
+            except KeyError as e:
+                # str() of a KeyError is its repr; send the message itself
+                raise ValueError(e.args[0])
+            # Forget results for older versions of the file
+            for stale in [k for k in self._profiles if k[0] == filename and k[1:3] != key[1:3]]:
+                del self._profiles[stale]
+            self._profiles[key] = resolved
+        return resolved
+
+    def _op_shutdown(self, request: Dict[str, Any]) -> bool:
+        import threading
+        # shutdown() waits for serve_forever() to return, so call it off this thread
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+        return True
+
+    def bind(self) -> None:
+        """Create the listening socket, replacing a stale socket file"""
+        import socketserver
+
+        if not is_supported():
+            raise DaemonError("Unix-domain sockets are not available on this platform")
+
+        client = DaemonClient.connect(self.socket_path)
+        if client is not None:
+            client.close()
+            raise DaemonError(f"A daemon is already serving {self.socket_path}")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        request = read_frame(self.rfile)
+                    except (OSError, ValueError, DaemonError):
+                        break
+                    if request is None:
+                        break
+                    self.connection.sendall(encode_frame(daemon.handle(request)))
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        # Callers usually share most of the daemon's environment, so index a
+        # copy of it up front; the first search then only reindexes the rest
+        self._sync_index(dict(os.environ))
+        self._config_signature = self._signature()
+
+        # Only the owner may connect: saved variables may hold secrets
+        old_umask = os.umask(0o177)
+        try:
+            self._server = Server(self.socket_path, RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def serve_forever(self) -> None:
+        """Serve until shutdown, SIGTERM or Ctrl+C, binding first if needed"""
+        import signal
+        import sys
+        import threading
+
+        if self._server is None:
+            self.bind()
+        if threading.current_thread() is threading.main_thread():
+            # Let SIGTERM unwind normally so the socket file is removed
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
@@ -0,0 +1,52 @@
+from typing import Dict, Mapping, Tuple
+
+
+class EnvDiff:
+    """Differences between a current variable set and a target one
+
+    added: names only in the target, with their target values
+    changed: names in both with different values, as (current, target)
+    removed: names only in the current set, with their current values
+    unchanged: how many names have the same value in both
+    """
+
+    def __init__(self):
+        self.added: Dict[str, str] = {}
+        self.changed: Dict[str, Tuple[str, str]] = {}
+        self.removed: Dict[str, str] = {}
+        self.unchanged = 0
+
+    def updates(self) -> Dict[str, str]:
+        """Target values of the added and changed names"""
+        updates = dict(self.added)
+        for name, (_, value) in self.changed.items():
+            updates[name] = value
+        return updates
+
+    def has_changes(self, include_removed: bool = True) -> bool:
+        return bool(self.added or self.changed or (include_removed and self.removed))
+
+    def summary(self, include_removed: bool = True) -> str:
+        parts = [f"{len(self.added)} added", f"{len(self.changed)} changed"]
+        if include_removed:
+            parts.append(f"{len(self.removed)} removed")
+        parts.append(f"{self.unchanged} unchanged")
+        return ", ".join(parts)
+
+
+def diff_environments(current: Mapping[str, str], target: Mapping[str, str]) -> EnvDiff:
+    """Compare two variable sets with one lookup per name"""
+    diff = EnvDiff()
+    for name, value in target.items():
+        old_value = current.get(name)
+        if old_value is None:
+            diff.added[name] = value
+        elif old_value != value:
+            diff.changed[name] = (old_value, value)
+        else:
+            diff.unchanged += 1
+    if len(current) > diff.unchanged + len(diff.changed):
+        for name, value in current.items():
+            if name not in target:
+                diff.removed[name] = value
+    return diff
@@ -1,26 +1,105 @@
 import os
 import json
-import subprocess
-import sys
 from typing import Dict, List, Optional, Tuple
-from .safety_config import PROTECTED_VARIABLES, SENSITIVE_VARIABLES
+from .safety_config import SafetyRules
+from .backup_store import BackupStore, DEFAULT_CAPACITY
+from .transaction import EnvTransaction
+from .file_lock import atomic_write, file_lock, file_version
+from .flatten import flatten_json, iter_flatten, parse_import
+from .layers import LayeredEnvironment, LiveView, Overlay
+from .metrics import Metrics, load_hook
+from .search_index import SearchIndex, scan_items
+
+# subprocess, the journal and the streaming reader are imported where they
+# are used: most CLI commands never need them and the CLI is started from
+# shell scripts thousands of times, so start-up cost matters.
 
 
 class EnvironmentManager:
     """Core class for managing environment variables"""
     
-    def __init__(self, config_file: str = "env_config.json"):
+    def __init__(self, config_file: str = "env_config.json", storage: Optional[str] = None,
+                 backup_capacity: int = DEFAULT_CAPACITY, persistence=None):
         self.config_file = os.path.join(os.path.dirname(__file__), config_file)
-        self.load_config()
+        # Serializes config writes between processes
+        self.lock_file = self.config_file + ".lock"
+        self.backup_capacity = backup_capacity
+        self._backup_store: Optional[BackupStore] = None
+        
+        # "json" rewrites the config on every change, "journal" appends to a log
+        if storage is None:
+            storage = os.environ.get("ENVGOD_STORAGE", "json")
+        self.storage = storage
+        self.journal = None
+        if storage == "journal":
+            from .journal import ConfigJournal
+            self.journal = ConfigJournal(self.config_file, lock_file=self.lock_file)
+        
+        # Where persistent changes go beyond env_config.json: a backend from
+        # src/persistence.py, a backend name, or None for the platform default
+        self._persistence = persistence
+        
+        # Saved variables are loaded on first use; get/search never need them
+        self._saved_vars: Optional[Dict[str, str]] = None
+        # Version of the config file saved_vars was read from or last written as
+        self._config_version = None
+        # Journal mode: the saved variables as last read from or written to disk
+        self._journal_base: Dict[str, str] = {}
+        
+        # Where current values came from, for environment_view(): the last
+        # profile applied and the temporary changes made since start-up
+        self._profile_layer: Optional[Tuple[str, Overlay]] = None
+        self.session_layer = Overlay()
+        
+        # Import caches and the command index are opened on first use
+        self._parse_cache = None
+        self._command_index = None
+        
+        # Safety rules are compiled on first use
+        self._safety_rules: Optional[SafetyRules] = None
+        
+        # Built on the second search so one-shot CLI searches just scan
+        self._search_index: Optional[SearchIndex] = None
+        self._searched = False
+        
+        # Per-phase timings; off unless ENVGOD_TIMINGS is set ("memory" also
+        # traces peak memory) or a hook is added
+        self.metrics = Metrics()
+        timings = os.environ.get("ENVGOD_TIMINGS")
+        if timings:
+            self.metrics.enable(trace_memory=timings == "memory")
+        hook = os.environ.get("ENVGOD_METRICS_HOOK")
+        if hook:
+            try:
+                self.metrics.add_hook(load_hook(hook))
+            except Exception as e:
+                print(f"Error loading metrics hook '{hook}': {e}")
+    
+    @property
+    def saved_vars(self) -> Dict[str, str]:
+        """Saved persistent variables, loaded from the config on first access"""
+        if self._saved_vars is None:
+            self.load_config()
+        return self._saved_vars
+    
+    @saved_vars.setter
+    def saved_vars(self, value: Dict[str, str]) -> None:
+        self._saved_vars = value
     
     def load_config(self) -> None:
         """Load configuration from JSON file"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    self.saved_vars = json.load(f)
-            else:
-                self.saved_vars = {}
+            with self.metrics.phase('config.load'):
+                if self.journal is not None:
+                    self.saved_vars = self.journal.load()
+                    self._journal_base = dict(self.saved_vars)
+                elif os.path.exists(self.config_file):
+                    with open(self.config_file, 'r') as f:
+                        self.saved_vars = json.load(f)
+                        self._config_version = file_version(f.fileno())
+                else:
+                    self.saved_vars = {}
+                    self._config_version = None
         except Exception as e:
             print(f"Error loading config: {e}")
             self.saved_vars = {}
@@ -28,29 +107,147 @@ class EnvironmentManager:
     def save_config(self) -> None:
         """Save configuration to JSON file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.saved_vars, f, indent=4)
+            self._write_config()
         except Exception as e:
             print(f"Error saving config: {e}")
     
+    def _write_config(self) -> None:
+        """Write all saved variables to the config file, raising on failure
+        
+        In journal mode other processes may have appended records since
+        saved_vars was loaded, so they are replayed and this process's own
+        edits merged over them before the snapshot replaces the journal.
+        """
+        if self.journal is not None:
+            self.journal.wait_for_compaction()
+        with self.metrics.phase('persist.config'), file_lock(self.lock_file):
+            if self.journal is not None:
+                self._rebase_on_journal()
+            self._replace_config_file()
+            if self.journal is not None:
+                # The snapshot now holds every journaled record
+                self.journal.reset()
+    
+    def _rebase_on_journal(self) -> None:
+        """Merge edits to saved_vars into the journaled state; the caller holds lock_file"""
+        current = self.journal.read_state()
+        base = self._journal_base
+        saved = self.saved_vars
+        for name in base.keys() | saved.keys():
+            value = saved.get(name)
+            if value != base.get(name):
+                if value is None:
+                    current.pop(name, None)
+                else:
+                    current[name] = value
+        # Update in place: transactions hold on to this dict
+        saved.clear()
+        saved.update(current)
+        self._journal_base = dict(current)
+    
+    def _replace_config_file(self) -> None:
+        """Atomically replace the config with saved_vars; the caller holds lock_file"""
+        atomic_write(self.config_file, json.dumps(self.saved_vars, indent=4).encode('utf-8'))
+        self._config_version = file_version(self.config_file)
+    
+    def _commit_saved_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """Persist changes already applied to saved_vars (None marks a delete)
+        
+        In journal mode only the changed records are appended. Otherwise the
+        config is rewritten under the lock; if another process saved it since
+        it was loaded, the changes are first merged into that newer version so
+        neither writer's variables are lost. Raises on failure.
+        """
+        if self.journal is not None:
+            with self.metrics.phase('persist.journal'):
+                self.journal.append(changes.items())
+            for name, value in changes.items():
+                if value is None:
+                    self._journal_base.pop(name, None)
+                else:
+                    self._journal_base[name] = value
+            return
+        
+        with self.metrics.phase('persist.config'), file_lock(self.lock_file):
+            if file_version(self.config_file) != self._config_version:
+                self._merge_saved_changes(changes)
+            self._replace_config_file()
+    
+    def _merge_saved_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """Rebase saved_vars on the config on disk plus our changes"""
+        current = {}
+        if os.path.exists(self.config_file):
+            with open(self.config_file, 'r') as f:
+                current = json.load(f)
+        for name, value in changes.items():
+            if value is None:
+                current.pop(name, None)
+            else:
+                current[name] = value
+        # Update in place: transactions hold on to this dict
+        self.saved_vars.clear()
+        self.saved_vars.update(current)
+    
+    def compact_config(self) -> None:
+        """Fold the change journal into env_config.json (journal mode only)"""
+        if self.journal is not None:
+            self.journal.compact()
+    
+    def transaction(self) -> EnvTransaction:
+        """Start a batch of changes that is committed with one persistence step
+        
+        Usable as a context manager: changes are committed when the block
+        exits normally and discarded if it raises.
+        """
+        return EnvTransaction(self)
+    
     def get_all_env_vars(self) -> Dict[str, str]:
         """Get all current environment variables"""
         return dict(os.environ)
     
+    def environment_view(self, saved_only: bool = False) -> LayeredEnvironment:
+        """Read-only layered view of the variables, without copying any
+        
+        The full view shows the live process environment. The saved
+        variables, the last profile applied and the temporary changes of
+        this session only attribute its values: view.source(name) is the
+        highest of those layers holding the live value, else 'process'.
+        saved_only gives the saved layer alone.
+        """
+        if saved_only:
+            return LayeredEnvironment([('saved', self.saved_vars)])
+        layers = [('saved', self.saved_vars)]
+        if self._profile_layer is not None:
+            layers.append(self._profile_layer)
+        layers.append(('session', self.session_layer))
+        return LiveView(('process', os.environ), layers)
+    
+    def _record_changes(self, changes: Dict[str, Tuple[Optional[str], bool]]) -> None:
+        """Update the profile and session layers for applied (value, persistent) changes"""
+        profile = self._profile_layer[1] if self._profile_layer is not None else {}
+        for name, (value, persistent) in changes.items():
+            profile.pop(name, None)
+            if persistent:
+                # The saved layer holds the value now
+                self.session_layer.pop(name, None)
+            elif value is None:
+                self.session_layer.hide(name)
+            else:
+                self.session_layer[name] = value
+    
     def get_env_var(self, name: str) -> Optional[str]:
         """Get a specific environment variable"""
         return os.environ.get(name)
 
     def set_env_var(self, name: str, value: str, persistent: bool = False) -> bool:
-        """Set an environment variable"""
+        """Set an environment variable
+        
+        Runs as a transaction, so a failed persistence step leaves the
+        process environment and the config as they were.
+        """
         try:
-            os.environ[name] = value
-            
-            if persistent:
-                self.saved_vars[name] = value
-                self.save_config()
-                self._set_system_env_var(name, value)
-            
+            with self.transaction() as txn:
+                txn.set(name, value, persistent)
             return True
         except Exception as e:
             print(f"Error setting environment variable: {e}")
@@ -58,193 +255,588 @@ class EnvironmentManager:
     
     def delete_env_var(self, name: str, persistent: bool = False, force: bool = False) -> Tuple[bool, str]:
         """Delete an environment variable with safety checks"""
+        safety_info = self.get_variable_safety_info(name)
+        
         # Safety check for protected variables
-        if not force and name.upper() in PROTECTED_VARIABLES:
+        if not force and safety_info['is_protected']:
             return False, f"Variable '{name}' is protected and cannot be deleted. Use force=True to override."
         
         # Warning for sensitive variables
-        if not force and name.upper() in SENSITIVE_VARIABLES:
+        if not force and safety_info['is_sensitive']:
             return False, f"Variable '{name}' is sensitive. Deletion could affect system functionality. Use force=True to override."
         
         try:
-            # Create backup before deletion
-            original_value = os.environ.get(name)
-            if original_value and persistent:
-                self._create_backup_entry(name, original_value)
-            
-            if name in os.environ:
-                del os.environ[name]
-            
-            if persistent:
-                if name in self.saved_vars:
-                    del self.saved_vars[name]
-                    self.save_config()
-                self._delete_system_env_var(name)
-            
+            # The transaction backs up persistent values before deleting and
+            # restores everything if persisting fails
+            with self.transaction() as txn:
+                txn.delete(name, persistent)
             return True, f"Successfully deleted variable '{name}'"
         except Exception as e:
             return False, f"Error deleting environment variable: {e}"
     
-    def _set_system_env_var(self, name: str, value: str) -> None:
-        """Set system-wide environment variable (Windows)"""
-        if sys.platform == "win32":
-            try:
-                subprocess.run([
-                    "setx", name, value
-                ], check=True, capture_output=True)
-            except subprocess.CalledProcessError as e:
-                print(f"Error setting system environment variable: {e}")
-    
-    def _delete_system_env_var(self, name: str) -> None:
-        """Delete system-wide environment variable (Windows)"""
-        if sys.platform == "win32":
-            try:
-                subprocess.run([
-                    "reg", "delete", "HKCU\\Environment", "/v", name, "/f"
-                ], check=True, capture_output=True)
-            except subprocess.CalledProcessError:
-                # Variable might not exist in registry, which is fine
-                pass
-
-    def search_env_vars(self, search_term: str) -> Dict[str, str]:
-        """Search environment variables by name or value"""
-        results = {}
-        search_term = search_term.lower()
+    @property
+    def persistence(self):
+        """Backend that makes persistent changes visible to new processes"""
+        if self._persistence is None or isinstance(self._persistence, str):
+            from .persistence import create_backend
+            self._persistence = create_backend(self._persistence)
+        return self._persistence
+    
+    def _persist_system_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """Hand one batch of persistent changes (None marks a delete) to the backend
+        
+        Raises on failure so that a transaction can roll back.
+        """
+        if not changes:
+            return
+        with self.metrics.phase('persist.system'):
+            self.persistence.apply(changes, self.saved_vars)
+    
+    def search_env_vars(self, search_term: str, mode: str = 'substring',
+                        field: str = 'both') -> Dict[str, str]:
+        """Search environment variables by name or value
+        
+        mode: 'substring', 'glob' (whole-string shell pattern) or 'regex'
+        field: 'both', 'name' or 'value'
+        """
+        if self._search_index is None and self._searched:
+            self.build_search_index()
+        self._searched = True
         
-        for name, value in os.environ.items():
-            if (search_term in name.lower() or 
-                search_term in value.lower()):
-                results[name] = value
+        with self.metrics.phase('search'):
+            if self._search_index is not None:
+                names = self._search_index.search(search_term, mode, field)
+            else:
+                names = scan_items(os.environ.items(), search_term, mode, field)
         
-        return results
+        return {name: os.environ[name] for name in names if name in os.environ}
+    
+    def build_search_index(self) -> None:
+        """Index the current environment now instead of on the second search"""
+        with self.metrics.phase('search.index'):
+            self._search_index = SearchIndex(dict(os.environ))
+        self._searched = True
+    
+    def _update_search_index(self, names) -> None:
+        """Resync the search index for variables changed through the manager"""
+        if self._search_index is None:
+            return
+        for name in names:
+            value = os.environ.get(name)
+            if value is None:
+                self._search_index.remove(name)
+            else:
+                self._search_index.set(name, value)
     
-    def export_env_vars(self, filename: str, vars_to_export: List[str] = None) -> bool:
-        """Export environment variables to file"""
+    def export_env_vars(self, filename: str, vars_to_export: List[str] = None,
+                        fmt: Optional[str] = None, compression: Optional[str] = None) -> bool:
+        """Export environment variables to file
+        
+        fmt: 'json' (indented), 'json-compact', 'ndjson', 'dotenv' or 'sh';
+        by default taken from the file extension (.json, .ndjson, .env, .sh)
+        compression: 'gzip' or 'xz', by default taken from a .gz/.xz suffix
+        Entries are streamed to the file instead of being built in memory.
+        """
+        from .export_formats import write_export
+        
         try:
-            env_vars = {}
             if vars_to_export:
-                for var in vars_to_export:
-                    if var in os.environ:
-                        env_vars[var] = os.environ[var]
+                items = ((var, os.environ[var]) for var in vars_to_export if var in os.environ)
             else:
-                env_vars = dict(os.environ)
+                items = ((name, os.environ[name]) for name in sorted(os.environ))
             
-            with open(filename, 'w') as f:
-                json.dump(env_vars, f, indent=4)
+            with self.metrics.phase('export'):
+                skipped = write_export(filename, items, fmt, compression)
+            if skipped:
+                print(f"Warning: Skipped {len(skipped)} variables whose names cannot be "
+                      f"exported in this format: {', '.join(skipped)}")
             
             return True
         except Exception as e:
             print(f"Error exporting environment variables: {e}")
             return False
     
-    def import_env_vars(self, filename: str, persistent: bool = False, flatten: bool = True) -> bool:
-        """Import environment variables from file with optional flattening"""
+    def import_env_vars(self, filename: str, persistent: bool = False, flatten: bool = True,
+                        separator: str = '_', key_case: Optional[str] = None,
+                        index_lists: bool = False, use_cache: bool = True,
+                        interpolate: bool = False) -> bool:
+        """Import environment variables from file with optional flattening
+        
+        Parsed and flattened results are cached by file content and options,
+        so re-importing an unchanged file skips parsing and flattening. With
+        interpolate, ${NAME} references in values are expanded.
+        """
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-            
-            if flatten and self._is_nested_json(data):
-                # Flatten nested JSON structure
-                env_vars = self._flatten_json(data)
-            else:
-                # Use as-is for flat JSON
-                env_vars = data
+            env_vars = self.load_import_file(filename, flatten, separator, key_case,
+                                             index_lists, use_cache)
+            if interpolate:
+                env_vars = self.interpolate_variables(env_vars, persistent=persistent)
             
-            for name, value in env_vars.items():
-                # Convert all values to strings
-                str_value = str(value) if not isinstance(value, str) else value
-                self.set_env_var(name, str_value, persistent)
+            # Stage everything so persistence happens once for the whole file
+            with self.metrics.phase('import.apply'), self.transaction() as txn:
+                for name, value in env_vars.items():
+                    txn.set(name, value, persistent)
             
             return True
         except Exception as e:
             print(f"Error importing environment variables: {e}")
             return False
     
-    def _is_nested_json(self, data: Dict) -> bool:
-        """Check if JSON contains nested objects"""
-        return any(isinstance(value, dict) for value in data.values())
+    def load_import_file(self, filename: str, flatten: bool = True, separator: str = '_',
+                         key_case: Optional[str] = None, index_lists: bool = False,
+                         use_cache: bool = True) -> Dict[str, str]:
+        """Read an import file into string variables without applying them"""
+        options = {
+            'flatten': flatten,
+            'separator': separator,
+            'key_case': key_case,
+            'index_lists': index_lists,
+        }
+        
+        def parse(content: bytes) -> Dict[str, str]:
+            with self.metrics.phase('import.parse'):
+                data = json.loads(content)
+            with self.metrics.phase('import.flatten'):
+                return self._parse_import(data, **options)
+        
+        if use_cache:
+            # Reading the file happens inside the cache, and only on a miss
+            with self.metrics.phase('import.cache'):
+                return self.parse_cache.load(filename, options, parse)
+        with self.metrics.phase('import.read'), open(filename, 'rb') as f:
+            content = f.read()
+        return parse(content)
     
-    def _flatten_json(self, data: Dict, parent_key: str = '', separator: str = '_') -> Dict[str, str]:
-        """Flatten nested JSON structure into environment variables"""
-        items = []
+    def load_import_files(self, filenames: List[str], flatten: bool = True,
+                          separator: str = '_', key_case: Optional[str] = None,
+                          index_lists: bool = False, use_cache: bool = True,
+                          jobs: Optional[int] = None) -> Dict[str, str]:
+        """Parse several import files in parallel and merge them, later files winning"""
+        from .multi_import import load_import_files
+        
+        options = {
+            'flatten': flatten,
+            'separator': separator,
+            'key_case': key_case,
+            'index_lists': index_lists,
+        }
+        with self.metrics.phase('import.files'):
+            return load_import_files(filenames, options, self.parse_cache if use_cache else None,
+                                     jobs)
+    
+    def import_env_files(self, paths: List[str], persistent: bool = False, flatten: bool = True,
+                         separator: str = '_', key_case: Optional[str] = None,
+                         index_lists: bool = False, use_cache: bool = True,
+                         jobs: Optional[int] = None, interpolate: bool = False) -> bool:
+        """Import files, glob patterns and directories as one layered set of variables
+        
+        Files are parsed concurrently, merged in argument order (later files
+        override earlier ones; globs and directories are sorted by path) and
+        applied in a single transaction. With interpolate, references are
+        expanded after merging, so one file can refer to keys of another.
+        """
+        from .multi_import import expand_import_paths
         
-        for key, value in data.items():
-            new_key = f"{parent_key}{separator}{key}" if parent_key else key
+        try:
+            filenames = expand_import_paths(paths)
+            env_vars = self.load_import_files(filenames, flatten, separator, key_case,
+                                              index_lists, use_cache, jobs)
+            if interpolate:
+                env_vars = self.interpolate_variables(env_vars, persistent=persistent)
+            
+            with self.metrics.phase('import.apply'), self.transaction() as txn:
+                for name, value in env_vars.items():
+                    txn.set(name, value, persistent)
             
-            if isinstance(value, dict):
-                # Recursively flatten nested objects
-                items.extend(self._flatten_json(value, new_key, separator).items())
+            return True
+        except Exception as e:
+            print(f"Error importing environment variables: {e}")
+            return False
+    
+    def build_environment(self, imports: List[str] = None, profile: Optional[str] = None,
+                          overrides: Dict[str, str] = None, include_saved: bool = False,
+                          base: Optional[Dict[str, str]] = None,
+                          interpolate: bool = False) -> Dict[str, str]:
+        """Build a complete environment in memory without changing or persisting anything
+        
+        Layers, later ones winning: base (default: the current process
+        environment), saved variables if include_saved, each import file (or
+        the given profile of it), then overrides. With interpolate, references
+        in an import layer resolve against the layers below it.
+        """
+        env = dict(os.environ if base is None else base)
+        if include_saved:
+            env.update(self.saved_vars)
+        for filename in imports or []:
+            if profile:
+                layer = self.resolve_profile(filename, profile)
             else:
-                # Convert to string and add to items
-                items.append((new_key, str(value)))
+                layer = self.load_import_file(filename)
+            if interpolate:
+                layer = self.interpolate_variables(layer, env)
+            env.update(layer)
+        if overrides:
+            env.update(overrides)
+        return env
+    
+    def interpolate_variables(self, env_vars: Dict[str, str],
+                              base: Optional[Dict[str, str]] = None,
+                              persistent: bool = False, strict: bool = True) -> Dict[str, str]:
+        """Expand ${NAME} and ${NAME:-default} references in env_vars' values
         
-        return dict(items)
+        A reference resolves to another key of env_vars, else to base
+        (default: the process environment, with the saved variables on top
+        if persistent). Raises InterpolationError, a ValueError, on a cycle
+        or, when strict, an undefined name.
+        """
+        from .interpolate import interpolate
+        
+        if base is None:
+            base = {**os.environ, **self.saved_vars} if persistent else os.environ
+        with self.metrics.phase('import.interpolate'):
+            return interpolate(env_vars, base, strict)
     
-    def get_saved_vars(self) -> Dict[str, str]:
-        """Get saved persistent variables"""
-        return self.saved_vars.copy()
+    def diff_environment(self, target: Dict[str, str], persistent: bool = False):
+        """Compare target with the saved variables (persistent) or os.environ"""
+        from .env_diff import diff_environments
+        
+        return diff_environments(self.saved_vars if persistent else os.environ, target)
+    
+    def apply_environment(self, target: Dict[str, str], persistent: bool = False,
+                          prune: bool = False):
+        """Bring the environment in line with target, touching only what differs
+        
+        Returns the EnvDiff that was applied. Unchanged names cost a
+        comparison only; with prune, names missing from target are deleted
+        too. Persistent applies compare against the saved variables.
+        """
+        diff = self.diff_environment(target, persistent)
+        with self.metrics.phase('apply'), self.transaction() as txn:
+            for name, value in diff.updates().items():
+                txn.set(name, value, persistent)
+            if prune:
+                for name in diff.removed:
+                    txn.delete(name, persistent)
+        return diff
     
-    def _create_backup_entry(self, name: str, value: str) -> None:
-        """Create a backup entry for deleted variables"""
-        backup_file = os.path.join(os.path.dirname(self.config_file), "backup_vars.json")
+    def get_path_list(self, name: str):
+        """Entries of a list variable such as PATH as an editable PathList"""
+        from .path_list import PathList
         
+        return PathList.from_value(os.environ.get(name))
+    
+    def edit_path_list(self, name: str, action: str, entries: List[str] = (),
+                       position: Optional[int] = None, persistent: bool = False) -> Tuple[bool, str]:
+        """Edit a list variable and set the result
+        
+        action: 'prepend', 'append', 'remove', 'dedupe' or 'move' (the
+        single entry in entries to position). A value that comes out
+        unchanged is not written.
+        """
         try:
-            # Load existing backups
-            if os.path.exists(backup_file):
-                with open(backup_file, 'r') as f:
-                    backups = json.load(f)
+            paths = self.get_path_list(name)
+            before = paths.value
+            if action == 'prepend':
+                message = f"Added {paths.prepend(entries)} new entries to the front of {name}"
+            elif action == 'append':
+                message = f"Added {paths.append(entries)} new entries to the end of {name}"
+            elif action == 'remove':
+                message = f"Removed {paths.remove(entries)} entries from {name}"
+            elif action == 'dedupe':
+                message = f"Removed {paths.dedupe()} duplicate or empty entries from {name}"
+            elif action == 'move':
+                if len(entries) != 1 or position is None:
+                    return False, "Moving needs exactly one entry and a position"
+                paths.move(entries[0], position)
+                message = f"Moved '{entries[0]}' to position {paths.index(entries[0])} in {name}"
             else:
-                backups = {}
-            
-            # Add timestamp and backup entry
-            import datetime
-            timestamp = datetime.datetime.now().isoformat()
+                return False, f"Unknown list action '{action}'"
+        except ValueError as e:
+            return False, f"Error editing {name}: {e}"
+        
+        if paths.value == before:
+            return True, f"{name} is unchanged"
+        if not self.set_env_var(name, paths.value, persistent):
+            return False, f"Failed to set {name}"
+        return True, message
+    
+    def check_path_list(self, name: str = 'PATH', jobs: Optional[int] = None,
+                        timeout: Optional[float] = None) -> List[Dict[str, any]]:
+        """Probe every entry of a list variable concurrently and report problems"""
+        from .path_list import DEFAULT_CHECK_JOBS, DEFAULT_CHECK_TIMEOUT, check_path_list
+        
+        with self.metrics.phase('path.check'):
+            return check_path_list(list(self.get_path_list(name)), jobs or DEFAULT_CHECK_JOBS,
+                                   DEFAULT_CHECK_TIMEOUT if timeout is None else timeout)
+    
+    @property
+    def command_index(self):
+        """Persisted listing of the commands in each PATH directory"""
+        if self._command_index is None:
+            from .command_index import CommandIndex
+            self._command_index = CommandIndex(os.path.join(self.cache_dir, "commands.bin"))
+        return self._command_index
+    
+    def which(self, commands: List[str], path: Optional[str] = None,
+              rebuild: bool = False) -> Dict[str, List[str]]:
+        """Every match of each command across PATH, the one that runs first
+        
+        path evaluates a proposed PATH value instead of the current one.
+        Directory listings come from the command index and are rescanned
+        only when a directory changed; rebuild rescans all of them.
+        """
+        from .path_list import parse_path_list
+        
+        index = self.command_index
+        if rebuild:
+            index.rebuild()
+        value = os.environ.get('PATH', '') if path is None else path
+        with self.metrics.phase('which'):
+            matches = index.which(commands, parse_path_list(value))
+        try:
+            index.save()
+        except Exception as e:
+            print(f"Warning: Could not save command index: {e}")
+        return matches
+    
+    def _parse_import(self, data: Dict, flatten: bool = True, separator: str = '_',
+                      key_case: Optional[str] = None, index_lists: bool = False) -> Dict[str, str]:
+        """Turn a parsed JSON document into string environment variables"""
+        return parse_import(data, flatten, separator, key_case, index_lists)
+    
+    @property
+    def parse_cache(self):
+        """Cache of parsed and flattened import files"""
+        if self._parse_cache is None:
+            from .parse_cache import ParseCache
+            self._parse_cache = ParseCache(os.path.join(self.cache_dir, "parse"))
+        return self._parse_cache
+    
+    def clear_caches(self) -> None:
+        """Remove cached parse results, resolved profiles and the command index
+        
+        Recorded timing statistics are kept; 'stats --reset' clears those.
+        """
+        import shutil
+        from .metrics import STATS_FILE
+        
+        if os.path.isdir(self.cache_dir):
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.startswith(STATS_FILE):
+                    continue
+                if entry.is_dir():
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+        self._command_index = None
+    
+    def import_env_vars_streaming(self, filename: str, persistent: bool = False,
+                                  flatten: bool = True, batch_size: int = 1000,
+                                  separator: str = '_', key_case: Optional[str] = None,
+                                  index_lists: bool = False) -> bool:
+        """Import environment variables from a large JSON file incrementally
+        
+        The file is tokenized as it is read, nested keys are flattened on the
+        fly and variables are applied in transactions of at most batch_size
+        entries, so peak memory does not depend on the file size. A failure
+        rolls back the current batch only; earlier batches stay applied.
+        """
+        from .json_stream import JSONStreamReader
+        
+        try:
+            with self.metrics.phase('import.stream'), open(filename, 'r') as f:
+                reader = JSONStreamReader(f)
+                txn = self.transaction()
+                for name, value in reader.iter_items(flatten, separator):
+                    if flatten and (key_case or index_lists):
+                        # Leaf values from the reader are never objects, so only
+                        # lists (when indexed) expand further
+                        items = iter_flatten({name: value}, separator=separator,
+                                             key_case=key_case, index_lists=index_lists)
+                    else:
+                        items = ((name, value),)
+                    for item_name, item_value in items:
+                        # Convert all values to strings
+                        str_value = str(item_value) if not isinstance(item_value, str) else item_value
+                        txn.set(item_name, str_value, persistent)
+                    if len(txn) >= batch_size:
+                        txn.commit()
+                        txn = self.transaction()
+                txn.commit()
             
-            if 'deleted_variables' not in backups:
-                backups['deleted_variables'] = []
+            return True
+        except Exception as e:
+            print(f"Error importing environment variables: {e}")
+            return False
+    
+    @property
+    def cache_dir(self) -> str:
+        """Directory for derived data such as resolved profiles"""
+        return os.path.join(os.path.dirname(self.config_file), "cache")
+    
+    @property
+    def stats_store(self):
+        """Phase timings accumulated by runs with timings enabled"""
+        from .metrics import STATS_FILE, StatsStore
+        return StatsStore(os.path.join(self.cache_dir, STATS_FILE))
+    
+    def save_metrics(self, command: Optional[str] = None, succeeded: bool = True) -> None:
+        """Add this process's recorded phases to the stats file and start over"""
+        if not self.metrics.phases:
+            return
+        try:
+            self.stats_store.add_run(command, succeeded, self.metrics)
+        except Exception as e:
+            print(f"Warning: Could not save timing statistics: {e}")
+        self.metrics.reset()
+    
+    def list_profiles(self, filename: str) -> List[str]:
+        """List the profiles defined in a multi-environment config file"""
+        from .profiles import list_profiles
+        
+        with open(filename, 'r') as f:
+            return list_profiles(json.load(f))
+    
+    def resolve_profile(self, filename: str, profile: str, use_cache: bool = True,
+                        separator: str = '_', key_case: Optional[str] = None,
+                        index_lists: bool = False) -> Dict[str, str]:
+        """Resolve one profile plus shared sections into flat variables
+        
+        Results are cached by file content and options, so switching back to
+        a profile of an unchanged file skips parsing and flattening.
+        """
+        from .profiles import ProfileCache
+        
+        cache = ProfileCache(os.path.join(self.cache_dir, "profiles"))
+        with self.metrics.phase('profile.resolve'):
+            return cache.resolve(filename, profile, use_cache, separator=separator,
+                                 key_case=key_case, index_lists=index_lists)
+    
+    def use_profile(self, filename: str, profile: str, persistent: bool = False,
+                    use_cache: bool = True, interpolate: bool = False, **options) -> bool:
+        """Apply one profile of a multi-environment config file"""
+        try:
+            env_vars = self.resolve_profile(filename, profile, use_cache, **options)
+        except KeyError as e:
+            print(f"Error using profile: {e.args[0]}")
+            return False
+        except Exception as e:
+            print(f"Error using profile: {e}")
+            return False
+        return self.apply_profile(profile, env_vars, persistent, interpolate)
+    
+    def apply_profile(self, profile: str, env_vars: Dict[str, str], persistent: bool = False,
+                      interpolate: bool = False) -> bool:
+        """Apply a resolved profile (e.g. one the daemon had cached) as the profile layer"""
+        try:
+            if interpolate:
+                env_vars = self.interpolate_variables(env_vars, persistent=persistent)
             
-            backups['deleted_variables'].append({
-                'name': name,
-                'value': value,
-                'deleted_at': timestamp
-            })
+            with self.metrics.phase('profile.apply'), self.transaction() as txn:
+                for name, value in env_vars.items():
+                    txn.set(name, value, persistent)
             
-            # Keep only last 50 backup entries
-            backups['deleted_variables'] = backups['deleted_variables'][-50:]
+            # The profile replaces the previous one as the layer its values come from
+            for name in env_vars:
+                self.session_layer.pop(name, None)
+            self._profile_layer = (f"profile {profile}", Overlay(env_vars))
             
-            # Save backup
-            with open(backup_file, 'w') as f:
-                json.dump(backups, f, indent=4)
-                
+            return True
         except Exception as e:
-            print(f"Warning: Could not create backup for '{name}': {e}")
+            print(f"Error using profile: {e}")
+            return False
+    
+    def _is_nested_json(self, data: Dict) -> bool:
+        """Check if JSON contains nested objects"""
+        return any(isinstance(value, dict) for value in data.values())
+    
+    def _flatten_json(self, data: Dict, parent_key: str = '', separator: str = '_') -> Dict[str, str]:
+        """Flatten nested JSON structure into environment variables"""
+        return flatten_json(data, parent_key, separator)
+    
+    def get_saved_vars(self) -> Dict[str, str]:
+        """Get saved persistent variables"""
+        return self.saved_vars.copy()
+    
+    @property
+    def backup_store(self) -> BackupStore:
+        """Ring buffer holding backups of deleted persistent variables"""
+        if self._backup_store is None:
+            backup_dir = os.path.dirname(self.config_file)
+            self._backup_store = BackupStore(
+                os.path.join(backup_dir, "backup_vars.ring"),
+                capacity=self.backup_capacity,
+                legacy_file=os.path.join(backup_dir, "backup_vars.json"),
+            )
+        return self._backup_store
+    
+    def _create_backup_entries(self, entries: List[Tuple[str, str]]) -> None:
+        """Create backup entries for several deleted variables in one write"""
+        try:
+            with self.metrics.phase('persist.backup'):
+                self.backup_store.append_many(entries)
+        except Exception as e:
+            names = ", ".join(name for name, _ in entries)
+            print(f"Warning: Could not create backup for '{names}': {e}")
+    
+    def list_backups(self) -> List[Dict[str, any]]:
+        """Get backups of deleted variables, newest first"""
+        try:
+            return self.backup_store.entries()
+        except Exception as e:
+            print(f"Error reading backups: {e}")
+            return []
+    
+    def restore_backup(self, name: Optional[str] = None, entry_id: Optional[int] = None,
+                       persistent: bool = False) -> Tuple[bool, str]:
+        """Restore a deleted variable from its newest backup or a backup id"""
+        try:
+            entry = self.backup_store.find(name, entry_id)
+        except Exception as e:
+            return False, f"Error reading backups: {e}"
+        
+        if entry is None:
+            target = f"id {entry_id}" if entry_id is not None else f"'{name}'"
+            return False, f"No backup found for {target}"
+        
+        if not self.set_env_var(entry['name'], entry['value'], persistent):
+            return False, f"Failed to restore variable '{entry['name']}'"
+        return True, f"Restored variable '{entry['name']}' deleted at {entry['deleted_at']}"
+    
+    @property
+    def safety_rules(self) -> SafetyRules:
+        """Compiled safety rules (defaults plus the optional rules file)"""
+        if self._safety_rules is None:
+            rules_file = os.environ.get("ENVGOD_SAFETY_RULES")
+            if rules_file:
+                self._safety_rules = SafetyRules.from_file(rules_file)
+            else:
+                self._safety_rules = SafetyRules.from_file()
+        return self._safety_rules
+    
+    def reload_safety_rules(self) -> None:
+        """Re-read the safety rules file and clear memoized classifications"""
+        self.safety_rules.reload()
     
     def is_protected_variable(self, name: str) -> bool:
         """Check if a variable is protected"""
-        return name.upper() in PROTECTED_VARIABLES
+        return self.safety_rules.classify_name(name)['is_protected']
     
     def is_sensitive_variable(self, name: str) -> bool:
         """Check if a variable is sensitive"""
-        return name.upper() in SENSITIVE_VARIABLES
+        return self.safety_rules.classify_name(name)['is_sensitive']
     
     def get_variable_safety_info(self, name: str) -> Dict[str, any]:
-        """Get safety information about a variable"""
-        return {
-            'is_protected': self.is_protected_variable(name),
-            'is_sensitive': self.is_sensitive_variable(name),
-            'is_system_created': name.upper() in PROTECTED_VARIABLES,
-            'recommendation': self._get_safety_recommendation(name)
-        }
+        """Get safety information about a variable
+        
+        The returned dict is shared with the classification cache; do not modify it.
+        """
+        return self.safety_rules.classify_name(name)
+    
+    def classify_variables(self, names: List[str]) -> Dict[str, Dict[str, any]]:
+        """Get safety information for many variables at once"""
+        return self.safety_rules.classify(names)
     
     def _get_safety_recommendation(self, name: str) -> str:
         """Get safety recommendation for a variable"""
-        name_upper = name.upper()
-        
-        if name_upper in PROTECTED_VARIABLES:
-            return "PROTECTED: This is a critical system variable. Deletion not recommended."
-        elif name_upper in SENSITIVE_VARIABLES:
-            return "SENSITIVE: This variable affects system functionality. Use caution."
-        elif name.startswith(('SYSTEM', 'PROCESSOR', 'COMPUTER')):
-            return "CAUTION: This appears to be a system variable."
-        else:
-            return "SAFE: This appears to be a user-defined variable."
+        return self.safety_rules.classify_name(name)['recommendation']
@@ -0,0 +1,134 @@
+import os
+import re
+from json.encoder import encode_basestring_ascii as _quote
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+EXPORT_FORMATS = ('json', 'json-compact', 'ndjson', 'dotenv', 'sh')
+COMPRESSIONS = ('gzip', 'xz')
+
+_EXTENSION_FORMATS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.env': 'dotenv',
+    '.sh': 'sh',
+}
+_EXTENSION_COMPRESSIONS = {'.gz': 'gzip', '.xz': 'xz'}
+
+# Entries joined into one write() call
+ENTRIES_PER_WRITE = 1024
+
+# Names a shell (and most dotenv loaders) can assign
+_SHELL_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+
+# dotenv values that need no quoting
+_BARE_VALUE = re.compile(r'[A-Za-z0-9_./:@%+,-]*\Z')
+
+
+def detect_format(filename: str) -> Tuple[Optional[str], Optional[str]]:
+    """Guess (format, compression) from a file name such as vars.env.gz"""
+    root, ext = os.path.splitext(filename.lower())
+    compression = _EXTENSION_COMPRESSIONS.get(ext)
+    if compression:
+        root, ext = os.path.splitext(root)
+    if os.path.basename(root + ext) == '.env':
+        return 'dotenv', compression
+    return _EXTENSION_FORMATS.get(ext), compression
+
+
+def _json_pieces(items: Iterable[Tuple[str, str]], pretty: bool) -> Iterator[str]:
+    # Same layout as json.dump(..., indent=4) or separators=(',', ':'); names
+    # and values are always strings, so the C string encoder does all quoting
+    opener, separator, closer = ('{\n    ', ',\n    ', '\n}') if pretty else ('{', ',', '}')
+    colon = ': ' if pretty else ':'
+    first = True
+    for name, value in items:
+        yield (opener if first else separator) + _quote(name) + colon + _quote(value)
+        first = False
+    yield '{}' if first else closer
+
+
+def _ndjson_pieces(items: Iterable[Tuple[str, str]]) -> Iterator[str]:
+    for name, value in items:
+        yield f'{{"name":{_quote(name)},"value":{_quote(value)}}}\n'
+
+
+def _dotenv_value(value: str) -> str:
+    if _BARE_VALUE.match(value):
+        return value
+    if "'" not in value and '\n' not in value and '\r' not in value:
+        # Single quotes are literal, so $ and \ need no escaping
+        return f"'{value}'"
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"')
+               .replace('\n', '\\n').replace('\r', '\\r'))
+    return f'"{escaped}"'
+
+
+def _dotenv_pieces(items: Iterable[Tuple[str, str]], skipped: List[str]) -> Iterator[str]:
+    for name, value in items:
+        if not _SHELL_NAME.match(name):
+            skipped.append(name)
+            continue
+        yield f"{name}={_dotenv_value(value)}\n"
+
+
+def _sh_pieces(items: Iterable[Tuple[str, str]], skipped: List[str]) -> Iterator[str]:
+    yield "# Environment variables exported by EnvironmentGod; load with: . <file>\n"
+    for name, value in items:
+        if not _SHELL_NAME.match(name):
+            skipped.append(name)
+            continue
+        quoted = value.replace("'", "'\\''")
+        yield f"export {name}='{quoted}'\n"
+
+
+def _open_output(filename: str, compression: Optional[str]):
+    if compression == 'gzip':
+        import gzip
+        # Level 6 is several times faster than the default 9 for ~1% larger files
+        return gzip.open(filename, 'wt', encoding='utf-8', newline='\n', compresslevel=6)
+    if compression == 'xz':
+        import lzma
+        # Environment dumps are highly repetitive: preset 1 compresses them as
+        # well as the default 6 at a fraction of the time and ~10% of the memory
+        return lzma.open(filename, 'wt', encoding='utf-8', newline='\n', preset=1)
+    return open(filename, 'w', encoding='utf-8', newline='\n', buffering=1 << 16)
+
+
+def write_export(filename: str, items: Iterable[Tuple[str, str]], fmt: Optional[str] = None,
+                 compression: Optional[str] = None) -> List[str]:
+    """Stream (name, value) pairs to filename and return the names that were skipped
+
+    fmt defaults to the format implied by the file extension, else 'json'
+    (indented like json.dump with indent=4); compression likewise follows
+    a .gz or .xz suffix unless given. Entries are rendered one at a time and
+    written in batches, so nothing proportional to the environment is built
+    in memory. dotenv and sh skip names a shell cannot assign.
+    """
+    detected_format, detected_compression = detect_format(filename)
+    fmt = fmt or detected_format or 'json'
+    compression = compression or detected_compression
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {EXPORT_FORMATS}")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {COMPRESSIONS}")
+
+    skipped: List[str] = []
+    if fmt in ('json', 'json-compact'):
+        pieces = _json_pieces(items, pretty=fmt == 'json')
+    elif fmt == 'ndjson':
+        pieces = _ndjson_pieces(items)
+    elif fmt == 'dotenv':
+        pieces = _dotenv_pieces(items, skipped)
+    else:
+        pieces = _sh_pieces(items, skipped)
+
+    with _open_output(filename, compression) as out:
+        batch = []
+        for piece in pieces:
+            batch.append(piece)
+            if len(batch) >= ENTRIES_PER_WRITE:
+                out.write(''.join(batch))
+                batch.clear()
+        out.write(''.join(batch))
+    return skipped
@@ -0,0 +1,73 @@
+import contextlib
+import os
+import sys
+from typing import Iterator, Optional, Tuple, Union
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on path (created if needed) across processes
+
+    Uses flock on POSIX and msvcrt.locking on Windows. Each use opens its
+    own descriptor, so threads of one process exclude each other too; the
+    lock is therefore not reentrant and must not be taken twice by one
+    thread.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            while True:
+                try:
+                    # LK_LOCK gives up after about 10 seconds; keep waiting
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Replace path with data so readers see the old or new file, never a mix
+
+    The data is written to a temporary file in the same directory, fsync'd
+    and renamed over path.
+    """
+    temp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def file_version(target: Union[str, int]) -> Optional[Tuple[int, int, int]]:
+    """Identity of a file's contents from its path or an open descriptor
+
+    atomic_write() gives every version a new inode, so (inode, mtime, size)
+    changes whenever another process has replaced the file. None if the
+    file does not exist.
+    """
+    try:
+        stat = os.fstat(target) if isinstance(target, int) else os.stat(target)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,61 @@
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+KEY_CASES = ('upper', 'lower')
+
+
+def _members(container: Any) -> Iterator[Tuple[Any, Any]]:
+    """Iterate (key, value) pairs of an object or (index, item) of a list"""
+    if isinstance(container, dict):
+        return iter(container.items())
+    return enumerate(container)
+
+
+def iter_flatten(data: Any, parent_key: str = '', separator: str = '_',
+                 key_case: Optional[str] = None,
+                 index_lists: bool = False) -> Iterator[Tuple[str, str]]:
+    """Yield (name, value) pairs for every leaf of a nested JSON structure
+
+    Walks the document with an explicit stack, so depth is not limited by
+    the recursion limit, and builds each level's key prefix once instead of
+    copying child results into every parent.
+
+    key_case: None to keep keys as written, 'upper' or 'lower' to normalize
+    index_lists: flatten list items as NAME_0, NAME_1, ... instead of
+        storing the whole list as one string value
+    """
+    if key_case is not None and key_case not in KEY_CASES:
+        raise ValueError(f"Unknown key case '{key_case}', expected one of {KEY_CASES}")
+    normalize = str.upper if key_case == 'upper' else str.lower if key_case == 'lower' else None
+
+    stack = [(parent_key + separator if parent_key else '', _members(data))]
+    while stack:
+        prefix, members = stack[-1]
+        for key, value in members:
+            name = f"{prefix}{key}"
+            if isinstance(value, dict) or (index_lists and isinstance(value, list)):
+                stack.append((name + separator, _members(value)))
+                break
+            if normalize is not None:
+                name = normalize(name)
+            yield name, value if isinstance(value, str) else str(value)
+        else:
+            stack.pop()
+
+
+def flatten_json(data: Any, parent_key: str = '', separator: str = '_',
+                 key_case: Optional[str] = None, index_lists: bool = False) -> Dict[str, str]:
+    """Flatten nested JSON structure into environment variables"""
+    return dict(iter_flatten(data, parent_key, separator, key_case, index_lists))
+
+
+def parse_import(data: Dict[str, Any], flatten: bool = True, separator: str = '_',
+                 key_case: Optional[str] = None, index_lists: bool = False) -> Dict[str, str]:
+    """Turn a parsed JSON document into string environment variables"""
+    if flatten:
+        # Flat JSON passes through unchanged
+        return flatten_json(data, separator=separator, key_case=key_case,
+                            index_lists=index_lists)
+
+    # Use as-is, converting all values to strings
+    return {name: value if isinstance(value, str) else str(value)
+            for name, value in data.items()}
@@ -1,8 +1,36 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import os
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from .env_manager import EnvironmentManager
+from .layers import LayeredEnvironment, LiveView
+from .live_search import LiveSearch
+from .export_formats import detect_format
+from .path_list import check_path_list, is_list_variable
+
+# Longest value shown in the tree; the full value is fetched on selection
+VALUE_PREVIEW_CHARS = 200
+
+# Rows materialized beyond the visible area so keyboard navigation has room
+OVERSCAN_ROWS = 20
+
+# Quiet period after the last keystroke before a search starts
+SEARCH_DEBOUNCE_MS = 150
+
+# How often pending background search results are checked for
+SEARCH_POLL_MS = 20
+
+# Export dialog file types and the format each one selects; compression
+# follows a .gz or .xz suffix typed after the extension
+EXPORT_FILETYPES = [
+    ("JSON", "*.json *.json.gz *.json.xz", 'json'),
+    ("Compact JSON", "*.json *.json.gz *.json.xz", 'json-compact'),
+    ("NDJSON", "*.ndjson *.ndjson.gz *.ndjson.xz", 'ndjson'),
+    ("dotenv", "*.env *.env.gz *.env.xz", 'dotenv'),
+    ("Shell script", "*.sh *.sh.gz *.sh.xz", 'sh'),
+]
 
 
 class EnvironmentGUI:
@@ -10,6 +38,20 @@ class EnvironmentGUI:
     
     def __init__(self):
         self.env_manager = EnvironmentManager()
+        
+        # Virtual list state: the filtered, sorted names are the model and
+        # only the window starting at _offset is materialized in the tree
+        self._rows: List[str] = []
+        self._view = LayeredEnvironment()
+        self._materialized: Dict[str, Tuple[str, str, str, str]] = {}
+        self._offset = 0
+        
+        # Search runs on a worker thread; the UI only debounces and polls
+        self._search = LiveSearch()
+        self._search_after_id: Optional[str] = None
+        self._search_polling = False
+        self._search_started = 0.0
+        
         self.root = tk.Tk()
         self.root.title("EnvironmentGod - Environment Variable Manager")
         self.root.geometry("900x700")
@@ -69,6 +111,8 @@ class EnvironmentGUI:
         ttk.Button(buttons_frame, text="Get", command=self.get_variable).pack(pady=2, fill=tk.X)
         ttk.Button(buttons_frame, text="Delete", command=self.delete_variable).pack(pady=2, fill=tk.X)
         ttk.Button(buttons_frame, text="Clear", command=self.clear_entries).pack(pady=2, fill=tk.X)
+        ttk.Button(buttons_frame, text="Edit List...",
+                   command=self.show_path_list_dialog).pack(pady=2, fill=tk.X)
         
         # Search frame
         search_frame = ttk.Frame(main_frame)
@@ -106,7 +150,7 @@ class EnvironmentGUI:
         tree_frame.rowconfigure(0, weight=1)
         
         # Create treeview with scrollbars
-        self.tree = ttk.Treeview(tree_frame, columns=('Value', 'Persistent', 'Safety'), 
+        self.tree = ttk.Treeview(tree_frame, columns=('Value', 'Persistent', 'Source', 'Safety'), 
                                 show='tree headings', height=15)
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
@@ -114,17 +158,19 @@ class EnvironmentGUI:
         self.tree.heading('#0', text='Variable Name')
         self.tree.heading('Value', text='Value')
         self.tree.heading('Persistent', text='Persistent')
+        self.tree.heading('Source', text='Source')
         self.tree.heading('Safety', text='Safety')
         
         self.tree.column('#0', width=200)
-        self.tree.column('Value', width=350)
+        self.tree.column('Value', width=300)
         self.tree.column('Persistent', width=80)
+        self.tree.column('Source', width=110)
         self.tree.column('Safety', width=100)
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
+        # Scrollbars; the vertical one scrolls the virtual list, not the tree
+        self.v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.on_virtual_scroll)
+        self.v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.tree.configure(yscrollcommand=self.on_tree_yview)
         
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
         h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
@@ -133,6 +179,13 @@ class EnvironmentGUI:
         # Bind tree selection
         self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
         self.tree.bind('<Double-1>', self.on_tree_double_click)
+        self.tree.bind('<Configure>', lambda event: self.render_window())
+        self.tree.bind('<Up>', self.on_tree_up)
+        self.tree.bind('<Prior>', lambda event: self.scroll_rows(-self._visible_row_count()))
+        self.tree.bind('<Next>', lambda event: self.scroll_rows(self._visible_row_count()))
+        self.tree.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_rows(3))
         
         # Menu bar
         self.create_menu()
@@ -165,6 +218,9 @@ class EnvironmentGUI:
         edit_menu.add_command(label="Clear All Entries", command=self.clear_entries)
         edit_menu.add_command(label="Copy Name", command=self.copy_selected_name)
         edit_menu.add_command(label="Copy Value", command=self.copy_selected_value)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Edit List Variable...", command=self.show_path_list_dialog)
+        edit_menu.add_command(label="Restore Deleted Variable...", command=self.show_backups_dialog)
         
         # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
@@ -291,47 +347,146 @@ class EnvironmentGUI:
     
     def refresh_variables(self):
         """Refresh the variables tree"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Get variables based on filter
-        if self.show_all_var.get():
-            env_vars = self.env_manager.get_all_env_vars()
-            saved_vars = self.env_manager.get_saved_vars()
+        # A live view over the layers: nothing is copied per refresh
+        with self.env_manager.metrics.phase('gui.refresh'):
+            self._view = self.env_manager.environment_view(saved_only=not self.show_all_var.get())
+            self._search.reset(self._view)
+        self.start_search()
+    
+    def start_search(self):
+        """Filter the current variables by the search entry in the background"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        
+        self._search.submit(self.search_entry.get())
+        self._search_started = time.perf_counter()
+        if not self._search_polling:
+            self._search_polling = True
+            self.poll_search()
+    
+    def poll_search(self):
+        """Apply background search results once they are ready"""
+        rows = self._search.poll()
+        if rows is not None:
+            self._rows = rows
+            self.render_window()
+            self.update_status(f"Showing {len(rows)} variables")
+        
+        if self._search.pending:
+            self.root.after(SEARCH_POLL_MS, self.poll_search)
         else:
-            env_vars = self.env_manager.get_saved_vars()
-            saved_vars = env_vars
-        
-        # Apply search filter
-        search_term = self.search_entry.get().lower()
-        
-        count = 0
-        for name, value in sorted(env_vars.items()):
-            if (not search_term or 
-                search_term in name.lower() or 
-                search_term in value.lower()):
-                
-                is_persistent = "Yes" if name in saved_vars else "No"
-                
-                # Get safety information
-                safety_info = self.env_manager.get_variable_safety_info(name)
-                if safety_info['is_protected']:
-                    safety_status = "🔒 Protected"
-                elif safety_info['is_sensitive']:
-                    safety_status = "⚠️ Sensitive"
+            self._search_polling = False
+            if self.env_manager.metrics.enabled:
+                # From the last submit until its rows were on screen
+                self.env_manager.metrics.record(
+                    'gui.search', time.perf_counter() - self._search_started)
+    
+    def render_window(self):
+        """Materialize the rows around the viewport, touching only changed rows"""
+        with self.env_manager.metrics.phase('gui.render'):
+            total = len(self._rows)
+            visible = self._visible_row_count()
+            self._offset = max(0, min(self._offset, total - visible))
+            names = self._rows[self._offset:self._offset + visible + OVERSCAN_ROWS]
+            
+            safety = self.env_manager.classify_variables(names)
+            wanted = {name: self._row_display(name, safety[name]) for name in names}
+            for name in list(self._materialized):
+                if name not in wanted:
+                    self.tree.delete(name)
+                    del self._materialized[name]
+            
+            for index, name in enumerate(names):
+                values = wanted[name]
+                if name not in self._materialized:
+                    self.tree.insert('', index, iid=name, text=name, values=values)
                 else:
-                    safety_status = "✓ Safe"
-                
-                self.tree.insert('', 'end', text=name, 
-                               values=(value, is_persistent, safety_status))
-                count += 1
+                    if self._materialized[name] != values:
+                        self.tree.item(name, values=values)
+                    if self.tree.index(name) != index:
+                        self.tree.move(name, '', index)
+                self._materialized[name] = values
+            
+            # The tree itself never scrolls; the window moves instead
+            self.tree.yview_moveto(0)
+            if total:
+                self.v_scrollbar.set(self._offset / total, min(1.0, (self._offset + visible) / total))
+            else:
+                self.v_scrollbar.set(0.0, 1.0)
+    
+    def _row_display(self, name: str, safety_info: Dict) -> Tuple[str, str, str, str]:
+        """Build the (value preview, persistent, source, safety) columns for a row"""
+        value = self._view.get(name, "")
+        if len(value) > VALUE_PREVIEW_CHARS:
+            value = value[:VALUE_PREVIEW_CHARS] + "…"
+        is_persistent = "Yes" if name in self.env_manager.saved_vars else "No"
+        source = self._view.source(name) or ""
         
-        self.update_status(f"Showing {count} variables")
+        if safety_info['is_protected']:
+            safety_status = "🔒 Protected"
+        elif safety_info['is_sensitive']:
+            safety_status = "⚠️ Sensitive"
+        else:
+            safety_status = "✓ Safe"
+        
+        return value, is_persistent, source, safety_status
+    
+    def _visible_row_count(self) -> int:
+        """Number of rows that fit in the tree's viewport"""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not laid out yet; fall back to the configured height
+            return int(self.tree.cget('height'))
+        row_height = int(self.style.lookup('Treeview', 'rowheight') or 20)
+        # One row's worth of space is taken by the headings
+        return max(1, height // row_height - 1)
+    
+    def scroll_rows(self, delta: int):
+        """Move the virtual window by delta rows"""
+        self._offset += delta
+        self.render_window()
+        return "break"
+    
+    def on_virtual_scroll(self, *args):
+        """Handle the vertical scrollbar for the virtual list"""
+        if args[0] == 'moveto':
+            self._offset = int(float(args[1]) * len(self._rows))
+            self.render_window()
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self._visible_row_count()
+            self.scroll_rows(amount)
+    
+    def on_tree_yview(self, first, last):
+        """Shift the window when the tree scrolls itself (e.g. arrow keys)"""
+        first = float(first)
+        if first > 0 and self._materialized:
+            self.scroll_rows(round(first * len(self._materialized)))
+    
+    def on_tree_up(self, event):
+        """Scroll the window up when moving past its first row"""
+        focus = self.tree.focus()
+        if focus and self._offset > 0 and self.tree.index(focus) == 0:
+            self.scroll_rows(-1)
+    
+    def on_mouse_wheel(self, event):
+        """Scroll the virtual list with the mouse wheel"""
+        return self.scroll_rows(-3 if event.delta > 0 else 3)
+    
+    def _full_value(self, name: str) -> str:
+        """Fetch the full value of a variable shown in the tree"""
+        value = self._view.get(name)
+        if value is None:
+            value = self.env_manager.get_env_var(name) or ""
+        return value
     
     def on_search(self, event):
-        """Handle search entry changes"""
-        self.refresh_variables()
+        """Handle search entry changes, waiting for typing to pause"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.start_search)
     
     def on_tree_select(self, event):
         """Handle tree selection"""
@@ -339,7 +494,7 @@ class EnvironmentGUI:
         if selection:
             item = selection[0]
             name = self.tree.item(item, 'text')
-            value = self.tree.item(item, 'values')[0]
+            value = self._full_value(name)
             is_persistent = self.tree.item(item, 'values')[1] == "Yes"
             
             # Populate entries
@@ -348,6 +503,15 @@ class EnvironmentGUI:
             self.value_entry.delete(0, tk.END)
             self.value_entry.insert(0, value)
             self.persistent_var.set(is_persistent)
+            
+            sources = self._view.sources(name)
+            status = f"{name}: from {sources[0]}" if sources else name
+            if len(sources) > 1:
+                status += f", also in {', '.join(sources[1:])}"
+            pending = self._view.pending(name) if isinstance(self._view, LiveView) else []
+            if pending:
+                status += f"; not applied yet: {', '.join(pending)}"
+            self.update_status(status)
     
     def on_tree_double_click(self, event):
         """Handle tree double-click"""
@@ -366,11 +530,180 @@ class EnvironmentGUI:
         """Copy selected variable value to clipboard"""
         selection = self.tree.selection()
         if selection:
-            value = self.tree.item(selection[0], 'values')[0]
+            value = self._full_value(self.tree.item(selection[0], 'text'))
             self.root.clipboard_clear()
             self.root.clipboard_append(value)
             self.update_status(f"Copied value to clipboard")
     
+    def show_backups_dialog(self):
+        """Show backups of deleted variables and restore a selected one"""
+        backups = self.env_manager.list_backups()
+        if not backups:
+            messagebox.showinfo("Backups", "No deleted variables have been backed up")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Restore Deleted Variable")
+        dialog.geometry("600x350")
+        dialog.transient(self.root)
+        dialog.columnconfigure(0, weight=1)
+        dialog.rowconfigure(0, weight=1)
+        
+        backup_tree = ttk.Treeview(dialog, columns=('Value', 'Deleted'), show='tree headings')
+        backup_tree.heading('#0', text='Variable Name')
+        backup_tree.heading('Value', text='Value')
+        backup_tree.heading('Deleted', text='Deleted At')
+        backup_tree.column('#0', width=160)
+        backup_tree.column('Value', width=260)
+        backup_tree.column('Deleted', width=160)
+        backup_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=10, pady=10)
+        
+        for entry in backups:
+            value = entry['value']
+            if len(value) > VALUE_PREVIEW_CHARS:
+                value = value[:VALUE_PREVIEW_CHARS] + "…"
+            backup_tree.insert('', 'end', iid=str(entry['id']), text=entry['name'],
+                               values=(value, entry['deleted_at']))
+        
+        controls = ttk.Frame(dialog)
+        controls.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=10, pady=(0, 10))
+        persistent_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(controls, text="Persistent", variable=persistent_var).pack(side=tk.LEFT)
+        
+        def restore_selected():
+            selection = backup_tree.selection()
+            if not selection:
+                messagebox.showwarning("No Selection", "Please select a backup to restore", parent=dialog)
+                return
+            success, message = self.env_manager.restore_backup(
+                entry_id=int(selection[0]), persistent=persistent_var.get())
+            if success:
+                self.refresh_variables()
+                self.update_status(message)
+                dialog.destroy()
+            else:
+                messagebox.showerror("Error", message, parent=dialog)
+        
+        ttk.Button(controls, text="Close", command=dialog.destroy).pack(side=tk.RIGHT)
+        ttk.Button(controls, text="Restore", command=restore_selected).pack(side=tk.RIGHT, padx=(0, 5))
+        backup_tree.bind('<Double-1>', lambda event: restore_selected())
+    
+    def show_path_list_dialog(self):
+        """Edit the entries of a list variable such as PATH one at a time"""
+        name = self.name_entry.get().strip() or 'PATH'
+        if not is_list_variable(name) and not messagebox.askyesno(
+                "List Variable", f"'{name}' does not look like a list of paths. Edit it as one anyway?"):
+            return
+        
+        paths = self.env_manager.get_path_list(name)
+        # Check results by position; any edit makes them stale
+        statuses: Dict[int, str] = {}
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Edit {name}")
+        dialog.geometry("700x420")
+        dialog.transient(self.root)
+        dialog.columnconfigure(0, weight=1)
+        dialog.rowconfigure(0, weight=1)
+        
+        entry_tree = ttk.Treeview(dialog, columns=('Status',), show='tree headings')
+        entry_tree.heading('#0', text='Entry')
+        entry_tree.heading('Status', text='Status')
+        entry_tree.column('#0', width=460)
+        entry_tree.column('Status', width=200)
+        entry_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=10, pady=10)
+        
+        side = ttk.Frame(dialog)
+        side.grid(row=0, column=1, sticky=tk.N, padx=(0, 10), pady=10)
+        
+        def render(select: Optional[List[int]] = None, checked: bool = False):
+            if not checked:
+                statuses.clear()
+            entry_tree.delete(*entry_tree.get_children())
+            for index, entry in enumerate(paths):
+                entry_tree.insert('', 'end', iid=str(index), text=entry or '(empty)',
+                                  values=(statuses.get(index, ''),))
+            if select:
+                entry_tree.selection_set([str(index) for index in select])
+        
+        def selected() -> List[int]:
+            return sorted(int(item) for item in entry_tree.selection())
+        
+        def add_folder():
+            folder = filedialog.askdirectory(parent=dialog, title=f"Add to {name}")
+            if folder:
+                paths.append([os.path.normpath(folder)])
+                render([len(paths) - 1])
+        
+        def remove_selected():
+            indexes = selected()
+            paths.entries = [entry for index, entry in enumerate(paths) if index not in indexes]
+            render()
+        
+        def move_selected(step: int):
+            indexes = selected()
+            if not indexes or indexes[0] + step < 0 or indexes[-1] + step >= len(paths):
+                return
+            for index in (indexes if step < 0 else reversed(indexes)):
+                paths.move(index, index + step)
+            render([index + step for index in indexes])
+        
+        def dedupe():
+            removed = paths.dedupe()
+            render()
+            self.update_status(f"Removed {removed} duplicate or empty entries from {name}")
+        
+        def check():
+            entries = list(paths)
+            result: List[List[Dict]] = []
+            worker = threading.Thread(target=lambda: result.append(check_path_list(entries)),
+                                      daemon=True)
+            worker.start()
+            self.update_status(f"Checking {len(entries)} entries of {name}...")
+            
+            def poll():
+                if worker.is_alive():
+                    dialog.after(SEARCH_POLL_MS, poll)
+                    return
+                if list(paths) != entries:
+                    # Edited while checking; the results no longer line up
+                    return
+                statuses.clear()
+                for item in result[0] if result else []:
+                    text = item['status'] if item['status'] != 'ok' else ''
+                    if item['detail']:
+                        text = f"{text}: {item['detail']}" if text else item['detail']
+                    statuses[item['index']] = text
+                if dialog.winfo_exists():
+                    render(selected(), checked=True)
+                problems = sum(1 for item in result[0] if item['status'] != 'ok') if result else 0
+                self.update_status(f"{name}: {problems} entries with problems")
+            poll()
+        
+        def save():
+            persistent = persistent_var.get()
+            if self.env_manager.set_env_var(name, paths.value, persistent):
+                self.refresh_variables()
+                self.update_status(f"Saved {len(paths)} entries of {name}")
+                dialog.destroy()
+            else:
+                messagebox.showerror("Error", f"Failed to set variable '{name}'", parent=dialog)
+        
+        for text, command in (("Add Folder...", add_folder), ("Remove", remove_selected),
+                              ("Move Up", lambda: move_selected(-1)),
+                              ("Move Down", lambda: move_selected(1)),
+                              ("Dedupe", dedupe), ("Check", check)):
+            ttk.Button(side, text=text, command=command).pack(pady=2, fill=tk.X)
+        
+        controls = ttk.Frame(dialog)
+        controls.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=(0, 10))
+        persistent_var = tk.BooleanVar(value=self.persistent_var.get())
+        ttk.Checkbutton(controls, text="Persistent", variable=persistent_var).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Close", command=dialog.destroy).pack(side=tk.RIGHT)
+        ttk.Button(controls, text="Save", command=save).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        render()
+    
     def import_variables(self):
         """Import variables from file"""
         filename = filedialog.askopenfilename(
@@ -391,16 +724,29 @@ class EnvironmentGUI:
             else:
                 messagebox.showerror("Error", "Failed to import variables")
     
-    def export_all_variables(self):
-        """Export all variables to file"""
+    def ask_export_filename(self, title: str) -> Tuple[str, Optional[str]]:
+        """Ask for an export file; returns (filename, format or None to infer it)"""
+        file_type = tk.StringVar(self.root)
         filename = filedialog.asksaveasfilename(
-            title="Export All Variables",
+            title=title,
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[(label, patterns) for label, patterns, _ in EXPORT_FILETYPES] +
+                      [("All files", "*.*")],
+            typevariable=file_type
         )
+        chosen = {label: fmt for label, _, fmt in EXPORT_FILETYPES}.get(file_type.get())
+        detected, _ = detect_format(filename) if filename else (None, None)
+        # A typed extension wins; the file type only picks between JSON layouts
+        if detected is not None and not (detected == 'json' and chosen == 'json-compact'):
+            return filename, detected
+        return filename, chosen
+    
+    def export_all_variables(self):
+        """Export all variables to file"""
+        filename, fmt = self.ask_export_filename("Export All Variables")
         
         if filename:
-            success = self.env_manager.export_env_vars(filename)
+            success = self.env_manager.export_env_vars(filename, fmt=fmt)
             if success:
                 self.update_status(f"Exported all variables to {filename}")
                 messagebox.showinfo("Success", "Variables exported successfully")
@@ -414,15 +760,11 @@ class EnvironmentGUI:
             messagebox.showwarning("No Selection", "Please select variables to export")
             return
         
-        filename = filedialog.asksaveasfilename(
-            title="Export Selected Variables",
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-        )
+        filename, fmt = self.ask_export_filename("Export Selected Variables")
         
         if filename:
             var_names = [self.tree.item(item, 'text') for item in selection]
-            success = self.env_manager.export_env_vars(filename, var_names)
+            success = self.env_manager.export_env_vars(filename, var_names, fmt)
             if success:
                 self.update_status(f"Exported {len(var_names)} variables to {filename}")
                 messagebox.showinfo("Success", "Selected variables exported successfully")
@@ -432,6 +774,8 @@ class EnvironmentGUI:
     def run(self):
         """Run the GUI application"""
         self.root.mainloop()
+        if os.environ.get("ENVGOD_TIMINGS"):
+            self.env_manager.save_metrics('gui')
 
 
 def main():
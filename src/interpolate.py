@@ -0,0 +1,161 @@
+import os
+import re
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+# $${ (an escaped, literal ${), or the start of ${NAME} or ${NAME:-default}
+_TOKEN = re.compile(r'\$\$\{|\$\{([A-Za-z_][A-Za-z0-9_]*)(\}|:-)')
+
+# A parsed value: literal text and (name, default parts or None, source text)
+# references, e.g. "http://${HOST:-localhost}" ->
+# ['http://', ('HOST', ['localhost'], '${HOST:-localhost}')]
+Reference = Tuple[str, Optional[list], str]
+Template = List[Union[str, Reference]]
+
+
+class InterpolationError(ValueError):
+    """A reference that cannot be resolved: undefined or part of a cycle"""
+
+
+def _closing_brace(value: str, start: int) -> int:
+    """Index of the } closing a reference whose default starts at start, or -1"""
+    depth = 0
+    i = start
+    while i < len(value):
+        if value.startswith('${', i):
+            depth += 1
+            i += 2
+            continue
+        if value[i] == '}':
+            if depth == 0:
+                return i
+            depth -= 1
+        i += 1
+    return -1
+
+
+def parse_template(value: str) -> Template:
+    """Split value into literal text and ${NAME} / ${NAME:-default} references
+
+    Defaults may contain references themselves. $${ is a literal ${, and
+    anything that is not a well-formed reference is kept as text.
+    """
+    parts: Template = []
+    text: List[str] = []
+    i = 0
+    while True:
+        match = _TOKEN.search(value, i)
+        if match is None:
+            text.append(value[i:])
+            break
+        text.append(value[i:match.start()])
+        i = match.end()
+        name = match.group(1)
+        if name is None:
+            text.append('${')
+            continue
+        default = None
+        if match.group(2) == '}':
+            close = i - 1
+        else:
+            close = _closing_brace(value, i)
+            if close < 0:
+                text.append(match.group())
+                continue
+            default = parse_template(value[i:close])
+        if any(text):
+            parts.append(''.join(text))
+        text = []
+        parts.append((name, default, value[match.start():close + 1]))
+        i = close + 1
+    if any(text):
+        parts.append(''.join(text))
+    return parts
+
+
+def _references(parts: Template):
+    """Every name referenced by parts, defaults included"""
+    for part in parts:
+        if not isinstance(part, str):
+            yield part[0]
+            if part[1] is not None:
+                yield from _references(part[1])
+
+
+def interpolate(variables: Mapping[str, str], environment: Optional[Mapping[str, str]] = None,
+                strict: bool = True) -> Dict[str, str]:
+    """Expand ${NAME} and ${NAME:-default} references in variables' values
+
+    A reference resolves to another key of variables (itself expanded
+    first), else to environment (default: os.environ); a reference to the
+    key's own name always reads the environment, so PATH=${PATH}:/opt/bin
+    extends the current value. ${NAME:-default} uses the default when the
+    name is unset or empty. Keys form a dependency graph that is walked
+    depth-first without recursion, so every value is parsed and expanded
+    exactly once however long the reference chains are. A cycle raises
+    InterpolationError naming it, as does an undefined name without a
+    default when strict (otherwise the reference is left as written).
+    """
+    if environment is None:
+        environment = os.environ
+
+    templates: Dict[str, Template] = {}
+    for name, value in variables.items():
+        if '$' in value:
+            parts = parse_template(value)
+            if parts != [value]:
+                templates[name] = parts
+    if not templates:
+        return dict(variables)
+
+    resolved = {name: value for name, value in variables.items() if name not in templates}
+
+    def render(parts: Template, owner: str) -> str:
+        out = []
+        for part in parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            name, default, source = part
+            value = resolved.get(name) if name != owner else None
+            if value is None:
+                value = environment.get(name)
+            if value:
+                out.append(value)
+            elif default is not None:
+                out.append(render(default, owner))
+            elif value is not None:
+                out.append(value)
+            elif strict:
+                raise InterpolationError(f"Undefined variable '{name}' referenced by '{owner}'")
+            else:
+                out.append(source)
+        return ''.join(out)
+
+    def dependencies(name: str):
+        return iter([ref for ref in _references(templates[name])
+                     if ref != name and ref in templates])
+
+    for root in templates:
+        if root in resolved:
+            continue
+        stack = [(root, dependencies(root))]
+        visiting = {root}
+        while stack:
+            name, pending = stack[-1]
+            for dependency in pending:
+                if dependency in resolved:
+                    continue
+                if dependency in visiting:
+                    path = [entry for entry, _ in stack]
+                    cycle = path[path.index(dependency):] + [dependency]
+                    raise InterpolationError(f"Circular reference: {' -> '.join(cycle)}")
+                visiting.add(dependency)
+                stack.append((dependency, dependencies(dependency)))
+                break
+            else:
+                stack.pop()
+                visiting.discard(name)
+                resolved[name] = render(templates[name], name)
+
+    # Keep the input's key order
+    return {name: resolved[name] for name in variables}
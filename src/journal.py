@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from .file_lock import atomic_write, file_lock
+
+# Compact the journal into the snapshot once it grows past this many bytes
+DEFAULT_COMPACT_THRESHOLD = 256 * 1024
+
+
+class ConfigJournal:
+    """Append-only change log layered on top of the JSON config snapshot
+
+    Every set/delete of a saved variable appends one record to
+    ``<config>.journal``. The config file itself stays a plain JSON dict
+    (the compacted snapshot), so existing files load unchanged. When the
+    journal exceeds the threshold a background thread rewrites the snapshot
+    from the files on disk; the journal is only removed once the new
+    snapshot has been atomically renamed into place.
+
+    Loads, appends and compaction hold ``lock_file`` so several processes
+    can share one journal: records are deltas, so concurrent writers never
+    overwrite each other's variables.
+    """
+
+    def __init__(self, config_file: str, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                 lock_file: Optional[str] = None):
+        self.config_file = config_file
+        self.journal_file = config_file + ".journal"
+        self.lock_file = lock_file or config_file + ".lock"
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> Dict[str, str]:
+        """Load the snapshot and replay any journal records on top of it"""
+        self.wait_for_compaction()
+        with file_lock(self.lock_file):
+            return self.read_state()
+
+    def read_state(self) -> Dict[str, str]:
+        """Snapshot plus journal records; the caller must hold lock_file"""
+        saved_vars = {}
+        if os.path.exists(self.config_file):
+            with open(self.config_file, 'r') as f:
+                saved_vars = json.load(f)
+
+        self._replay(self.journal_file, saved_vars)
+        return saved_vars
+
+    def _replay(self, path: str, saved_vars: Dict[str, str]) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash; nothing after it was fsync'd
+                    break
+                if record.get('op') == 'set':
+                    saved_vars[record['name']] = record['value']
+                else:
+                    saved_vars.pop(record['name'], None)
+
+    def append(self, changes: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """Append (name, value) records, value None meaning delete, then fsync"""
+        lines = []
+        for name, value in changes:
+            if value is None:
+                record = {'op': 'delete', 'name': name}
+            else:
+                record = {'op': 'set', 'name': name, 'value': value}
+            lines.append(json.dumps(record, separators=(',', ':')) + "\n")
+        if not lines:
+            return
+
+        with file_lock(self.lock_file):
+            # O_APPEND keeps records of concurrent writers whole
+            with open(self.journal_file, 'a') as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+
+        if size > self.compact_threshold:
+            self.compact(background=True)
+
+    def compact(self, background: bool = False) -> None:
+        """Fold the journal into a fresh snapshot
+
+        The snapshot is rebuilt from the files on disk under the lock, so
+        records appended by other processes are kept.
+        """
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if background:
+                self._compactor = threading.Thread(target=self._compact, name="envgod-compactor")
+                self._compactor.start()
+                return
+        self._compact()
+
+    def _compact(self) -> None:
+        try:
+            with file_lock(self.lock_file):
+                snapshot = self.read_state()
+                atomic_write(self.config_file, json.dumps(snapshot, indent=4).encode('utf-8'))
+                # Replaying a journal over a snapshot that already contains it
+                # is harmless, so a crash before this removal loses nothing
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
+        except Exception as e:
+            print(f"Error compacting config journal: {e}")
+
+    def wait_for_compaction(self) -> None:
+        """Block until any running background compaction has finished"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def reset(self) -> None:
+        """Discard the journal after the snapshot was rewritten in full
+
+        The caller must hold lock_file, have waited for compaction and have
+        written a snapshot that includes read_state().
+        """
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
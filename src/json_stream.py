@@ -0,0 +1,122 @@
+import json
+from typing import IO, Any, Iterator, List, Tuple
+
+# Characters JSON treats as insignificant whitespace between tokens
+_WHITESPACE = ' \t\n\r'
+
+# Characters that can continue a number: a buffer ending in only these may
+# have cut the number short
+_NUMBER_CONTINUATION = frozenset('.eE+-0123456789')
+
+
+class JSONStreamReader:
+    """Incremental reader that walks a JSON object without loading it whole
+
+    The file is consumed in fixed-size chunks and only the unread tail is
+    kept in memory. Objects are walked key by key so nested documents can
+    be flattened on the fly; scalars and arrays are decoded as single
+    values, so peak memory is bounded by the largest leaf value rather
+    than by the file size.
+    """
+
+    def __init__(self, f: IO[str], chunk_size: int = 64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int = 0) -> bool:
+        """Drop consumed input and read the next chunk; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(size or self.chunk_size)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+            return False
+        return True
+
+    def _peek(self) -> str:
+        """Return the next significant character without consuming it"""
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def _decode_value(self) -> Any:
+        """Decode one complete value starting at the current position"""
+        self._peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(read_size):
+                    raise
+                # Grow reads geometrically so large values are not rescanned
+                # once per chunk
+                read_size *= 2
+                continue
+            # A number followed by nothing but number characters up to the end
+            # of the buffer may continue in the next chunk ("1" of "1.5"), so
+            # read on before accepting it
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and _NUMBER_CONTINUATION.issuperset(self.buf[end:])
+                    and self._fill(read_size)):
+                read_size *= 2
+                continue
+            self.pos = end
+            return value
+
+    def iter_items(self, flatten: bool = True, separator: str = '_') -> Iterator[Tuple[str, Any]]:
+        """Yield (key, value) pairs of the top-level object
+
+        With flatten=True nested objects are walked and their keys joined
+        with the separator, matching EnvironmentManager._flatten_json.
+        """
+        if self._peek() != '{':
+            raise ValueError("Top-level JSON value must be an object")
+        self.pos += 1
+
+        # Each level holds [key prefix, whether the next member is the first]
+        stack: List[list] = [['', True]]
+        while stack:
+            level = stack[-1]
+            if self._peek() == '}':
+                self.pos += 1
+                stack.pop()
+                continue
+            if not level[1]:
+                self._expect(',')
+            level[1] = False
+
+            key = self._decode_value()
+            if not isinstance(key, str):
+                raise ValueError("Object keys must be strings")
+            self._expect(':')
+
+            prefix = level[0]
+            full_key = f"{prefix}{separator}{key}" if prefix else key
+            if flatten and self._peek() == '{':
+                self.pos += 1
+                stack.append([full_key, True])
+            else:
+                yield full_key, self._decode_value()
+
+        if self._peek():
+            raise ValueError("Extra data after top-level object")
@@ -0,0 +1,178 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class _Deleted:
+    """Marks a name an overlay hides from the layers below it"""
+
+    def __repr__(self) -> str:
+        return 'DELETED'
+
+
+DELETED = _Deleted()
+_MISSING = object()
+
+
+class Overlay(dict):
+    """Copy-on-write layer: holds only the names written to it
+
+    Stacked on other layers it changes what a LayeredEnvironment shows
+    without copying or touching those layers; hide() masks a lower value.
+    """
+
+    def hide(self, name: str) -> None:
+        self[name] = DELETED
+
+
+class LayeredEnvironment(Mapping):
+    """Read-only view of variables stacked in layers, later layers winning
+
+    Layers are (name, mapping) pairs held by reference: building, stacking
+    or iterating a view copies no variables, so it always reflects the
+    layers' current contents and stays small however many are stacked.
+    Use to_dict() for a snapshot, e.g. to hand to a child process.
+    """
+
+    def __init__(self, layers: Iterable[Tuple[str, Mapping]] = ()):
+        self._layers = tuple(layers)
+        # Lookups go top-down
+        self._top_first = self._layers[::-1]
+
+    def __getitem__(self, name: str) -> str:
+        for _, layer in self._top_first:
+            value = layer.get(name, _MISSING)
+            if value is not _MISSING:
+                if value is DELETED:
+                    break
+                return value
+        raise KeyError(name)
+
+    def __contains__(self, name) -> bool:
+        return self.source(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        # Each name is yielded by the highest layer holding it; membership
+        # tests against the layers above replace a set of names seen so far
+        above: List[Mapping] = []
+        for _, layer in self._top_first:
+            for name, value in layer.items():
+                if value is DELETED:
+                    continue
+                for upper in above:
+                    if name in upper:
+                        break
+                else:
+                    yield name
+            above.append(layer)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"LayeredEnvironment({', '.join(self.layer_names)})"
+
+    @property
+    def layer_names(self) -> List[str]:
+        """Layer names, bottom first"""
+        return [name for name, _ in self._layers]
+
+    def layer(self, name: str) -> Mapping:
+        for layer_name, layer in self._layers:
+            if layer_name == name:
+                return layer
+        raise KeyError(f"No layer '{name}'")
+
+    def source(self, name: str) -> Optional[str]:
+        """Name of the layer a variable's value comes from, or None if unset"""
+        for layer_name, layer in self._top_first:
+            value = layer.get(name, _MISSING)
+            if value is not _MISSING:
+                return None if value is DELETED else layer_name
+        return None
+
+    def sources(self, name: str) -> List[str]:
+        """Every layer defining name, top first; all but the first are shadowed"""
+        found = []
+        for layer_name, layer in self._top_first:
+            value = layer.get(name, _MISSING)
+            if value is DELETED:
+                break
+            if value is not _MISSING:
+                found.append(layer_name)
+        return found
+
+    def push(self, name: str, layer: Optional[Mapping] = None) -> 'LayeredEnvironment':
+        """A new view with layer (default: an empty Overlay) on top of these
+
+        This view and its layers are left as they are and shared, not copied.
+        """
+        return LayeredEnvironment(self._layers + ((name, Overlay() if layer is None else layer),))
+
+    def to_dict(self) -> Dict[str, str]:
+        """Snapshot of the visible variables"""
+        result: Dict[str, str] = {}
+        for _, layer in self._layers:
+            for name, value in layer.items():
+                if value is DELETED:
+                    result.pop(name, None)
+                else:
+                    result[name] = value
+        return result
+
+
+class LiveView(LayeredEnvironment):
+    """Layers over a live mapping (os.environ) that stays authoritative
+
+    Names and values are always the live mapping's; the layers only
+    explain where a value came from. source() is the highest layer holding
+    the live value, so a layer whose value differs from it (a saved value
+    not applied to this process, say) neither shows nor claims the name.
+    """
+
+    def __init__(self, live: Tuple[str, Mapping], layers: Iterable[Tuple[str, Mapping]] = ()):
+        super().__init__((live,) + tuple(layers))
+        self._live = live[1]
+
+    def __getitem__(self, name: str) -> str:
+        return self._live[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._live
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._live)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __repr__(self) -> str:
+        return f"LiveView({', '.join(self.layer_names)})"
+
+    def source(self, name: str) -> Optional[str]:
+        found = self.sources(name)
+        return found[0] if found else None
+
+    def sources(self, name: str) -> List[str]:
+        """Every layer holding the live value of name, top first"""
+        value = self._live.get(name)
+        if value is None:
+            return []
+        return [layer_name for layer_name, layer in self._top_first
+                if layer.get(name, _MISSING) == value]
+
+    def pending(self, name: str) -> List[str]:
+        """Layers, top first, whose value of name is not the live one (not applied)"""
+        value = self._live.get(name)
+        found = []
+        for layer_name, layer in self._top_first[:-1]:
+            layer_value = layer.get(name, _MISSING)
+            if layer_value is not _MISSING and layer_value is not DELETED and layer_value != value:
+                found.append(layer_name)
+        return found
+
+    def push(self, name: str, layer: Optional[Mapping] = None) -> 'LiveView':
+        layer = Overlay() if layer is None else layer
+        return LiveView(self._layers[0], self._layers[1:] + ((name, layer),))
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(self._live)
@@ -0,0 +1,97 @@
+import queue
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# How many candidates a worker filters between checks for cancellation
+CANCEL_CHECK_INTERVAL = 2048
+
+
+class LiveSearch:
+    """Search-as-you-type filtering of a variable snapshot off the UI thread
+
+    Each submitted query runs on a worker thread and is identified by a
+    generation number; submitting a newer query or resetting the snapshot
+    makes older workers stop early and their results are discarded. When a
+    query extends the last completed one, only that query's matches are
+    rescanned instead of the whole snapshot. Lower-cased names and values
+    are computed once per snapshot and reused across queries.
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self._last_generation = 0
+        self._results: "queue.Queue[Tuple[int, str, List[str]]]" = queue.Queue()
+        self.reset({})
+
+    def reset(self, items: Mapping[str, str]) -> None:
+        """Replace the snapshot being searched and cancel running searches
+
+        items may be a live view; names it no longer holds are skipped.
+        """
+        self._generation += 1
+        self._items = items
+        self._names = sorted(items)
+        self._folded: Dict[str, Tuple[str, str]] = {}
+        self._last_query: Optional[str] = None
+        self._last_names: List[str] = self._names
+
+    def submit(self, query: str) -> None:
+        """Start filtering for query; the result is collected with poll()"""
+        self._generation += 1
+        generation = self._generation
+        query = query.lower()
+
+        if not query:
+            self._results.put((generation, query, self._names))
+            return
+
+        if self._last_query is not None and query.startswith(self._last_query):
+            # Extending the last query can only narrow its matches
+            candidates = self._last_names
+        else:
+            candidates = self._names
+
+        worker = threading.Thread(
+            target=self._run,
+            args=(generation, query, candidates, self._items, self._folded),
+            name="envgod-search",
+            daemon=True,
+        )
+        worker.start()
+
+    def _run(self, generation: int, query: str, candidates: List[str],
+             items: Mapping[str, str], folded: Dict[str, Tuple[str, str]]) -> None:
+        matches = []
+        for index, name in enumerate(candidates):
+            if index % CANCEL_CHECK_INTERVAL == 0 and generation != self._generation:
+                return
+            entry = folded.get(name)
+            if entry is None:
+                value = items.get(name)
+                if value is None:
+                    continue
+                entry = folded[name] = (name.lower(), value.lower())
+            if query in entry[0] or query in entry[1]:
+                matches.append(name)
+        self._results.put((generation, query, matches))
+
+    @property
+    def pending(self) -> bool:
+        """Whether the latest submitted query has not been collected yet"""
+        return self._last_generation != self._generation
+
+    def poll(self) -> Optional[List[str]]:
+        """Return the matches of the latest query once ready, else None"""
+        latest = None
+        while True:
+            try:
+                generation, query, matches = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                latest = (generation, query, matches)
+
+        if latest is None:
+            return None
+        self._last_generation, self._last_query, self._last_names = latest
+        return self._last_names
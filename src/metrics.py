@@ -0,0 +1,209 @@
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# Signature of metrics hooks: phase name, seconds, peak traced bytes or None
+MetricsHook = Callable[[str, float, Optional[int]], None]
+
+STATS_FILE = "stats.json"
+
+
+class _NullPhase:
+    """Context manager used while recording is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    def __init__(self, metrics: 'Metrics', name: str):
+        self.metrics = metrics
+        self.name = name
+        self.peak = 0
+
+    def __enter__(self):
+        metrics = self.metrics
+        if metrics.trace_memory:
+            import tracemalloc
+            # The enclosing phase keeps the peak seen so far; ours starts afresh
+            if metrics._stack:
+                parent = metrics._stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        # Registered on entry so reports list phases in the order they start
+        if self.name not in metrics.phases:
+            metrics._add(self.name, len(metrics._stack))
+        metrics._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        metrics = self.metrics
+        metrics._stack.pop()
+        peak = None
+        if metrics.trace_memory:
+            import tracemalloc
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if metrics._stack:
+                parent = metrics._stack[-1]
+                parent.peak = max(parent.peak, peak)
+        metrics.record(self.name, elapsed, peak, len(metrics._stack))
+        return False
+
+
+class Metrics:
+    """Per-phase latency and optional peak memory recorder
+
+    Code wraps the interesting phases of its work in ``with
+    metrics.phase('import.parse'):``. While recording is off (the default)
+    a phase costs one attribute check. Each finished phase is aggregated by
+    name (calls, total and max seconds, peak traced bytes when memory
+    tracing is on) and passed to every hook, so callers can forward the
+    numbers to their own collector.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.trace_memory = False
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self._depths: Dict[str, int] = {}
+        self._stack: List[_Phase] = []
+        self._hooks: List[MetricsHook] = []
+
+    def enable(self, trace_memory: bool = False) -> None:
+        """Start recording; trace_memory also records peaks via tracemalloc"""
+        self.enabled = True
+        if trace_memory and not self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.trace_memory = True
+
+    def add_hook(self, hook: MetricsHook) -> None:
+        """Call hook(name, seconds, peak_bytes) for every finished phase
+
+        Adding a hook turns recording on.
+        """
+        self._hooks.append(hook)
+        self.enabled = True
+
+    def remove_hook(self, hook: MetricsHook) -> None:
+        self._hooks.remove(hook)
+
+    def phase(self, name: str):
+        """Context manager timing one phase named like 'import.parse'"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name: str, seconds: float, peak_bytes: Optional[int] = None,
+               depth: int = 0) -> None:
+        """Add one measurement, e.g. for work timed outside a phase block"""
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self._add(name, depth)
+        stats['calls'] += 1
+        stats['total'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+        if peak_bytes is not None:
+            stats['peak_bytes'] = max(stats.get('peak_bytes', 0), peak_bytes)
+
+        for hook in self._hooks:
+            try:
+                hook(name, seconds, peak_bytes)
+            except Exception as e:
+                print(f"Error in metrics hook: {e}", file=sys.stderr)
+
+    def _add(self, name: str, depth: int) -> Dict[str, float]:
+        stats = self.phases[name] = {'calls': 0, 'total': 0.0, 'max': 0.0}
+        self._depths[name] = depth
+        return stats
+
+    def reset(self) -> None:
+        self.phases.clear()
+        self._depths.clear()
+
+    def report(self) -> str:
+        """Table of this process's phases, nested phases indented"""
+        return format_phases(self.phases, self._depths)
+
+
+def format_phases(phases: Dict[str, Dict[str, float]],
+                  depths: Optional[Dict[str, int]] = None) -> str:
+    """Render aggregated phases as a table (times in milliseconds)"""
+    with_memory = any('peak_bytes' in stats for stats in phases.values())
+    header = f"{'phase':<30} {'calls':>7} {'total ms':>10} {'max ms':>10}"
+    lines = [header + (f" {'peak MB':>9}" if with_memory else '')]
+    for name, stats in phases.items():
+        if not stats['calls']:
+            continue
+        label = '  ' * (depths or {}).get(name, 0) + name
+        line = (f"{label:<30} {stats['calls']:>7} {stats['total'] * 1000:>10.2f} "
+                f"{stats['max'] * 1000:>10.2f}")
+        if with_memory:
+            peak = stats.get('peak_bytes')
+            line += f" {peak / 1e6:>9.2f}" if peak is not None else f" {'-':>9}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def load_hook(spec: str) -> MetricsHook:
+    """Import a hook given as 'package.module:function'"""
+    import importlib
+
+    module_name, sep, attribute = spec.partition(':')
+    if not sep or not module_name or not attribute:
+        raise ValueError(f"Invalid metrics hook '{spec}', expected module:function")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class StatsStore:
+    """Phase statistics accumulated across runs in a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_file = path + ".lock"
+
+    def load(self) -> Dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'since': None, 'commands': {}, 'phases': {}}
+
+    def add_run(self, command: Optional[str], succeeded: bool, metrics: Metrics) -> None:
+        """Merge one run's phases (and its command's outcome) into the file"""
+        from .file_lock import atomic_write, file_lock
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with file_lock(self.lock_file):
+            stats = self.load()
+            stats['since'] = stats.get('since') or time.strftime('%Y-%m-%dT%H:%M:%S')
+            if command:
+                runs = stats['commands'].setdefault(command, {'runs': 0, 'failures': 0})
+                runs['runs'] += 1
+                runs['failures'] += 0 if succeeded else 1
+            for name, phase in metrics.phases.items():
+                if not phase['calls']:
+                    # Still running, e.g. the command phase of 'run' before exec
+                    continue
+                total = stats['phases'].setdefault(name, {'calls': 0, 'total': 0.0, 'max': 0.0})
+                total['calls'] += phase['calls']
+                total['total'] += phase['total']
+                total['max'] = max(total['max'], phase['max'])
+                if 'peak_bytes' in phase:
+                    total['peak_bytes'] = max(total.get('peak_bytes', 0), phase['peak_bytes'])
+            atomic_write(self.path, json.dumps(stats, indent=2).encode('utf-8'))
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
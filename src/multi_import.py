@@ -0,0 +1,88 @@
+import glob
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .flatten import parse_import
+from .parse_cache import read_file
+
+# Below this many bytes of uncached input, starting worker processes costs
+# more than parsing everything in this one
+PARALLEL_MIN_BYTES = 512 * 1024
+
+_GLOB_CHARS = ('*', '?', '[')
+
+
+def expand_import_paths(paths: Iterable[str]) -> List[str]:
+    """Expand files, glob patterns and directories into an ordered file list
+
+    Arguments keep the order they were given in; a glob contributes its
+    matches and a directory its ``*.json`` files, each sorted by path. This
+    order is the precedence order: later files override earlier ones.
+    Raises FileNotFoundError for an argument that matches nothing.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(entry.path for entry in os.scandir(path)
+                             if entry.is_file() and entry.name.lower().endswith('.json'))
+        elif any(char in path for char in _GLOB_CHARS) and not os.path.exists(path):
+            matches = sorted(match for match in glob.glob(path) if os.path.isfile(match))
+        elif os.path.isfile(path):
+            matches = [path]
+        else:
+            matches = []
+        if not matches:
+            raise FileNotFoundError(f"File not found: {path}")
+        files.extend(matches)
+    return files
+
+
+def parse_import_file(filename: str, options: Dict[str, Any]
+                      ) -> Tuple[Dict[str, str], Tuple[int, int, str]]:
+    """Read, parse and flatten one import file (runs in worker processes)
+
+    Also returns the file's cache record, hashed from the bytes parsed.
+    """
+    content, record = read_file(filename)
+    return parse_import(json.loads(content), **options), record
+
+
+def load_import_files(filenames: List[str], options: Dict[str, Any], parse_cache=None,
+                      jobs: Optional[int] = None) -> Dict[str, str]:
+    """Parse many import files and merge them, later files winning
+
+    Cached results are taken from parse_cache first. The remaining files
+    are parsed by a pool of up to ``jobs`` processes (default: one per CPU)
+    when there is enough input to pay for starting them, otherwise in this
+    process. Results are merged in the order of filenames regardless of
+    which worker finishes first, so the outcome is deterministic.
+    """
+    unique = list(dict.fromkeys(filenames))
+    results: Dict[str, Dict[str, str]] = {}
+    if parse_cache is not None:
+        for filename in unique:
+            cached = parse_cache.get(filename, options)
+            if cached is not None:
+                results[filename] = cached
+    missing = [filename for filename in unique if filename not in results]
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(missing))
+    if jobs > 1 and sum(os.path.getsize(filename) for filename in missing) >= PARALLEL_MIN_BYTES:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parsed = list(pool.map(parse_import_file, missing, [options] * len(missing)))
+    else:
+        parsed = [parse_import_file(filename, options) for filename in missing]
+
+    for filename, (result, record) in zip(missing, parsed):
+        results[filename] = result
+        if parse_cache is not None:
+            parse_cache.store(filename, options, result, record)
+
+    merged: Dict[str, str] = {}
+    for filename in filenames:
+        merged.update(results[filename])
+    return merged
@@ -0,0 +1,250 @@
+import contextlib
+import hashlib
+import json
+import marshal
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .file_lock import atomic_write, file_lock
+
+# Default upper bound on the total size of cached entries
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump when the cached representation changes
+CACHE_FORMAT = 1
+
+_INDEX_FILE = "index.bin"
+_HITS_FILE = "hits.log"
+
+
+def read_file(path: str) -> Tuple[bytes, Tuple[int, int, str]]:
+    """Content of path plus its index record: (size, mtime, content hash)
+
+    The signature comes from the open file before it is read, so a write
+    racing with the read leaves a signature older than the file and the
+    next lookup reads it again instead of trusting a stale hash.
+    """
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        content = f.read()
+    return content, (stat.st_size, stat.st_mtime_ns, hashlib.sha256(content).hexdigest())
+
+
+class ParseCache:
+    """Content-addressed cache of parsed and flattened import files
+
+    Entries are keyed by the SHA-256 of the file content plus the import
+    options and stored with marshal, a compact binary format that loads much
+    faster than JSON. The index remembers each path's size, mtime and
+    content hash, so an unchanged file is recognized from a stat call alone
+    and is not even read on a hit. Least recently used entries are evicted
+    once the total size exceeds max_bytes.
+
+    The index is only rewritten under a lock, when an entry is stored or a
+    file's stat signature changes. A plain hit leaves it alone: it touches
+    the entry file, whose mtime is the recency eviction goes by, and appends
+    a byte to a hit log that is folded into the index's count on the next
+    write.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, _INDEX_FILE)
+        self.hits_file = os.path.join(cache_dir, _HITS_FILE)
+        self.lock_file = self.index_file + ".lock"
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_file, 'rb') as f:
+                index = marshal.loads(f.read())
+            if index.get('format') == CACHE_FORMAT:
+                return index
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return {'format': CACHE_FORMAT, 'files': {}, 'entries': {}, 'hits': 0, 'misses': 0}
+
+    @contextlib.contextmanager
+    def _locked_index(self) -> Iterator[Dict[str, Any]]:
+        """Re-read the index under the lock and save it when the block ends
+
+        Pending hits from the hit log are folded in, so concurrent processes
+        never overwrite each other's updates.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with file_lock(self.lock_file):
+            index = self._load_index()
+            pending = self._pending_hits()
+            index['hits'] += pending
+            yield index
+            atomic_write(self.index_file, marshal.dumps(index))
+            if pending:
+                open(self.hits_file, 'wb').close()
+
+    def _pending_hits(self) -> int:
+        try:
+            return os.path.getsize(self.hits_file)
+        except OSError:
+            return 0
+
+    def _record_hit(self, key: str) -> None:
+        """Mark an entry as used without rewriting the index"""
+        try:
+            os.utime(self._entry_file(key))
+            with file_lock(self.lock_file):
+                with open(self.hits_file, 'ab') as f:
+                    f.write(b'.')
+        except OSError:
+            pass
+
+    def _entry_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".entry")
+
+    def _entry_key(self, index: Dict[str, Any], path: str,
+                   options: Dict[str, Any]) -> Tuple[str, Optional[bytes], Optional[tuple]]:
+        """Cache key for path and options
+
+        Also returns the content and the file's new index record if its size
+        or mtime changed since it was last seen and it had to be read.
+        """
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        content = None
+        record = None
+        known = index['files'].get(path)
+        if known is not None and tuple(known[:2]) == signature:
+            content_hash = known[2]
+        else:
+            content, record = read_file(path)
+            content_hash = record[2]
+        return self._content_key(content_hash, options), content, record
+
+    @staticmethod
+    def _content_key(content_hash: str, options: Dict[str, Any]) -> str:
+        option_text = json.dumps([CACHE_FORMAT, options], sort_keys=True)
+        return hashlib.sha256(f"{content_hash}:{option_text}".encode('utf-8')).hexdigest()
+
+    def _lookup(self, path: str, options: Dict[str, Any]
+                ) -> Tuple[str, Optional[Dict[str, str]], Optional[bytes], Optional[tuple]]:
+        """Key, cached result (None on a miss), content and new file record for path"""
+        index = self._load_index()
+        key, content, record = self._entry_key(index, path, options)
+        if key not in index['entries']:
+            return key, None, content, record
+        try:
+            with open(self._entry_file(key), 'rb') as f:
+                result = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            # Entry file vanished or is corrupt; the next store replaces it
+            return key, None, content, record
+
+        self._record_hit(key)
+        if record is not None:
+            # Same content under a new mtime: remember it so the next hit
+            # does not read the file again
+            try:
+                with self._locked_index() as index:
+                    index['files'][path] = record
+            except Exception as e:
+                print(f"Warning: Could not write parse cache: {e}")
+        return key, result, content, record
+
+    def _write_entry(self, path: str, record: Optional[tuple], key: str,
+                     result: Dict[str, str]) -> None:
+        """Store a freshly built result and count the miss"""
+        try:
+            data = marshal.dumps(result)
+            stored = len(data) <= self.max_bytes
+            if stored:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                atomic_write(self._entry_file(key), data)
+            with self._locked_index() as index:
+                index['misses'] += 1
+                if record is not None:
+                    index['files'][path] = record
+                if stored:
+                    index['entries'][key] = (len(data), time.time())
+                    self._evict(index)
+                else:
+                    index['entries'].pop(key, None)
+        except Exception as e:
+            print(f"Warning: Could not write parse cache: {e}")
+
+    def load(self, filename: str, options: Dict[str, Any],
+             build: Callable[[bytes], Dict[str, str]]) -> Dict[str, str]:
+        """Return the cached result for filename, calling build(content) on a miss"""
+        path = os.path.abspath(filename)
+        key, result, content, record = self._lookup(path, options)
+        if result is not None:
+            return result
+
+        if content is None:
+            with open(path, 'rb') as f:
+                content = f.read()
+        result = build(content)
+        self._write_entry(path, record, key, result)
+        return result
+
+    def get(self, filename: str, options: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Return the cached result for filename, or None on a miss
+
+        For callers that build results elsewhere (e.g. in worker processes)
+        and hand them back with store().
+        """
+        return self._lookup(os.path.abspath(filename), options)[1]
+
+    def store(self, filename: str, options: Dict[str, Any], result: Dict[str, str],
+              record: Tuple[int, int, str]) -> None:
+        """Cache a result built for filename after a get() miss
+
+        record is read_file()'s record for the bytes the result was built
+        from, so a file changed since then is not cached under its new hash.
+        """
+        path = os.path.abspath(filename)
+        self._write_entry(path, tuple(record), self._content_key(record[2], options), result)
+
+    def _last_used(self, key: str, stored_at: float) -> float:
+        try:
+            return max(stored_at, os.stat(self._entry_file(key)).st_mtime)
+        except OSError:
+            return stored_at
+
+    def _evict(self, index: Dict[str, Any]) -> None:
+        """Drop least recently used entries until the size cap is met"""
+        entries = index['entries']
+        total = sum(size for size, _ in entries.values())
+        if total <= self.max_bytes:
+            return
+        by_recency = sorted(entries.items(), key=lambda item: self._last_used(item[0], item[1][1]))
+        for key, (size, _) in by_recency:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._entry_file(key))
+            except OSError:
+                pass
+            del entries[key]
+            total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, size and hit statistics"""
+        index = self._load_index()
+        hits, misses = index['hits'] + self._pending_hits(), index['misses']
+        lookups = hits + misses
+        return {
+            'entries': len(index['entries']),
+            'size_bytes': sum(size for size, _ in index['entries'].values()),
+            'max_bytes': self.max_bytes,
+            'tracked_files': len(index['files']),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset the statistics"""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Variables holding separator-delimited lists of paths; names ending in PATH
+# or _DIRS (GOPATH, XDG_DATA_DIRS, ...) are treated as lists too
+LIST_VARIABLES = frozenset({
+    'PATH', 'PATHEXT', 'PYTHONPATH', 'LD_LIBRARY_PATH', 'DYLD_LIBRARY_PATH',
+    'CLASSPATH', 'MANPATH', 'INFOPATH', 'PKG_CONFIG_PATH', 'PSMODULEPATH',
+})
+
+# Files that are valid list entries, e.g. jars on CLASSPATH or zips on PYTHONPATH
+ARCHIVE_SUFFIXES = ('.jar', '.zip', '.egg', '.whl')
+
+# Default number of entries probed at once and overall wait for a check
+DEFAULT_CHECK_JOBS = 16
+DEFAULT_CHECK_TIMEOUT = 5.0
+
+CHECK_STATUSES = ('ok', 'empty', 'missing', 'not a directory', 'duplicate', 'shadowed',
+                  'timeout', 'error')
+
+
+def is_list_variable(name: str) -> bool:
+    """Whether a variable holds a separator-delimited list of paths"""
+    upper = name.upper()
+    return upper in LIST_VARIABLES or upper.endswith('PATH') or upper.endswith('_DIRS')
+
+
+@lru_cache(maxsize=256)
+def parse_path_list(value: str, separator: str = os.pathsep) -> Tuple[str, ...]:
+    """Split a list variable into its entries
+
+    Cached on the value: the GUI and repeated edits parse the same long PATH
+    over and over. An empty value has no entries; empty entries inside a
+    value are kept, since they mean the current directory.
+    """
+    return tuple(value.split(separator)) if value else ()
+
+
+def entry_key(entry: str) -> str:
+    """Comparison key: entries naming the same path compare equal"""
+    return os.path.normcase(os.path.normpath(entry)) if entry else ''
+
+
+class PathList:
+    """Editable entries of a list variable such as PATH
+
+    Adding an entry that is already present moves it instead of adding a
+    second copy; entries are matched by their normalized path.
+    """
+
+    def __init__(self, entries: Iterable[str] = (), separator: str = os.pathsep):
+        self.entries: List[str] = list(entries)
+        self.separator = separator
+
+    @classmethod
+    def from_value(cls, value: Optional[str], separator: str = os.pathsep) -> 'PathList':
+        return cls(parse_path_list(value or '', separator), separator)
+
+    @property
+    def value(self) -> str:
+        return self.separator.join(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def index(self, entry: str) -> int:
+        """Position of the first entry naming the same path, or -1"""
+        key = entry_key(entry)
+        for index, existing in enumerate(self.entries):
+            if entry_key(existing) == key:
+                return index
+        return -1
+
+    def prepend(self, entries: Iterable[str]) -> int:
+        """Put entries first, in the given order; returns how many were new"""
+        entries = list(entries)
+        added = self._count_new(entries)
+        self.remove(entries)
+        self.entries[:0] = entries
+        return added
+
+    def append(self, entries: Iterable[str]) -> int:
+        """Put entries last, in the given order; returns how many were new"""
+        entries = list(entries)
+        added = self._count_new(entries)
+        self.remove(entries)
+        self.entries.extend(entries)
+        return added
+
+    def remove(self, entries: Iterable[str]) -> int:
+        """Drop every entry naming one of the given paths; returns the count"""
+        keys = {entry_key(entry) for entry in entries}
+        kept = [entry for entry in self.entries if entry_key(entry) not in keys]
+        removed = len(self.entries) - len(kept)
+        self.entries = kept
+        return removed
+
+    def dedupe(self, drop_empty: bool = True) -> int:
+        """Keep the first of each repeated path (and drop empty entries)"""
+        seen = set()
+        kept = []
+        for entry in self.entries:
+            key = entry_key(entry)
+            if key in seen or (drop_empty and not entry):
+                continue
+            seen.add(key)
+            kept.append(entry)
+        removed = len(self.entries) - len(kept)
+        self.entries = kept
+        return removed
+
+    def move(self, entry: Union[str, int], position: int) -> None:
+        """Move an entry (given by path or index) to position; negative counts from the end"""
+        index = entry if isinstance(entry, int) else self.index(entry)
+        if not 0 <= index < len(self.entries):
+            raise ValueError(f"No entry '{entry}'")
+        item = self.entries.pop(index)
+        if position < 0:
+            position += len(self.entries) + 1
+        self.entries.insert(max(0, min(position, len(self.entries))), item)
+
+    def _count_new(self, entries: List[str]) -> int:
+        keys = {entry_key(entry) for entry in self.entries}
+        return sum(1 for key in dict.fromkeys(entry_key(entry) for entry in entries)
+                   if key not in keys)
+
+
+def _probe(entry: str, list_names: bool) -> Dict:
+    """stat one entry; runs on a worker thread"""
+    try:
+        if not os.path.exists(entry):
+            return {'kind': 'missing'}
+        if not os.path.isdir(entry):
+            return {'kind': 'file'}
+        result = {'kind': 'dir', 'real': os.path.normcase(os.path.realpath(entry))}
+        if list_names:
+            with os.scandir(entry) as scan:
+                result['names'] = {item.name for item in scan if not item.is_dir()}
+        return result
+    except OSError as e:
+        return {'kind': 'error', 'error': str(e)}
+
+
+def _probe_all(entries: List[str], list_names: bool, jobs: int,
+               timeout: float) -> Dict[str, Dict]:
+    """Probe entries concurrently, giving up on those still pending at timeout
+
+    Workers are daemon threads fed from a shared list rather than a
+    concurrent.futures pool: a stat stuck on a dead network mount must not
+    keep the process from exiting after the check has reported it.
+    """
+    results: Dict[str, Dict] = {}
+    pending = list(reversed(entries))
+    done = threading.Condition()
+
+    def work():
+        while True:
+            with done:
+                if not pending:
+                    return
+                entry = pending.pop()
+            result = _probe(entry, list_names)
+            with done:
+                results[entry] = result
+                done.notify_all()
+
+    for _ in range(max(1, min(jobs, len(entries)))):
+        threading.Thread(target=work, name='envgod-path-check', daemon=True).start()
+
+    deadline = time.monotonic() + timeout
+    with done:
+        while len(results) < len(entries):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done.wait(remaining)
+        return dict(results)
+
+
+def check_path_list(entries: List[str], jobs: int = DEFAULT_CHECK_JOBS,
+                    timeout: float = DEFAULT_CHECK_TIMEOUT,
+                    shadowing: bool = True) -> List[Dict]:
+    """Flag problem entries of a list variable
+
+    Each distinct entry is probed once, up to jobs at a time; entries still
+    unanswered after timeout seconds (hung network mounts) are reported as
+    'timeout'. Returns one dict per entry, in order, with 'index', 'entry',
+    'status' (see CHECK_STATUSES) and 'detail'. A directory is 'shadowed'
+    when every file in it is hidden by a same-named file in an earlier
+    entry; with shadowing=False directories are not listed.
+    """
+    distinct = [entry for entry in dict.fromkeys(entries) if entry]
+    probes = _probe_all(distinct, shadowing, jobs, timeout) if distinct else {}
+
+    report = []
+    first_by_key: Dict[str, int] = {}
+    first_by_real: Dict[str, int] = {}
+    seen_names: Dict[str, int] = {}
+    for index, entry in enumerate(entries):
+        status, detail = 'ok', ''
+        key = entry_key(entry)
+        probe = probes.get(entry)
+        if not entry:
+            status, detail = 'empty', 'empty entry means the current directory'
+        elif key in first_by_key:
+            status, detail = 'duplicate', f"same as entry {first_by_key[key]}"
+        elif probe is None:
+            status, detail = 'timeout', f"no answer within {timeout:g}s"
+        elif probe['kind'] == 'missing':
+            status = 'missing'
+        elif probe['kind'] == 'error':
+            status, detail = 'error', probe['error']
+        elif probe['kind'] == 'file':
+            if not entry.lower().endswith(ARCHIVE_SUFFIXES):
+                status = 'not a directory'
+        elif probe['real'] in first_by_real:
+            status, detail = 'duplicate', f"same directory as entry {first_by_real[probe['real']]}"
+        elif 'names' in probe:
+            names = probe['names']
+            hidden = [name for name in names if name in seen_names]
+            if names and len(hidden) == len(names):
+                status = 'shadowed'
+                detail = f"all {len(names)} files also in earlier entries"
+            elif hidden:
+                detail = f"{len(hidden)} of {len(names)} files shadowed by earlier entries"
+            for name in names:
+                seen_names.setdefault(name, index)
+
+        first_by_key.setdefault(key, index)
+        if probe is not None and 'real' in probe:
+            first_by_real.setdefault(probe['real'], index)
+        report.append({'index': index, 'entry': entry, 'status': status, 'detail': detail})
+    return report
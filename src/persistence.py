@@ -0,0 +1,171 @@
+import os
+import sys
+from typing import Dict, List, Optional
+
+# Registry key holding the current user's environment (Windows)
+REGISTRY_KEY = "Environment"
+
+# File the managed-file backend regenerates unless told otherwise; systemd
+# reads ~/.config/environment.d into every user session
+DEFAULT_MANAGED_FILE = os.path.join("~", ".config", "environment.d", "60-envgod.conf")
+
+BACKENDS = ('registry', 'file', 'none')
+
+
+class PersistenceBackend:
+    """Makes saved variables visible to processes started later
+
+    apply() receives every change of one commit at once, as a mapping of
+    name to new value (None for a delete), plus all saved variables after
+    the change. It raises on failure so that the caller can roll back.
+    """
+
+    name = 'none'
+
+    def apply(self, changes: Dict[str, Optional[str]], saved: Dict[str, str]) -> None:
+        raise NotImplementedError
+
+
+class NullBackend(PersistenceBackend):
+    """Keeps variables in env_config.json only"""
+
+    def apply(self, changes: Dict[str, Optional[str]], saved: Dict[str, str]) -> None:
+        pass
+
+
+class RegistryBackend(PersistenceBackend):
+    """Writes HKCU\\Environment through the registry API in one pass (Windows)
+
+    Replaces a setx or reg process per variable: the key is opened once for
+    the whole batch and running applications are notified once at the end.
+    Existing values keep their type, so a REG_EXPAND_SZ such as Path still
+    expands ``%USERPROFILE%``; new values containing ``%`` are written as
+    REG_EXPAND_SZ and the rest as REG_SZ.
+    """
+
+    name = 'registry'
+
+    def apply(self, changes: Dict[str, Optional[str]], saved: Dict[str, str]) -> None:
+        import winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, REGISTRY_KEY, 0,
+                            winreg.KEY_QUERY_VALUE | winreg.KEY_SET_VALUE) as key:
+            for name, value in changes.items():
+                if value is not None:
+                    winreg.SetValueEx(key, name, 0, self._value_type(key, name, value), value)
+                    continue
+                try:
+                    winreg.DeleteValue(key, name)
+                except FileNotFoundError:
+                    # Variable might not exist in registry, which is fine
+                    pass
+        self.broadcast()
+
+    @staticmethod
+    def _value_type(key, name: str, value: str) -> int:
+        """Registry type to write value with: the current one if it is a string"""
+        import winreg
+        try:
+            _, value_type = winreg.QueryValueEx(key, name)
+        except FileNotFoundError:
+            value_type = None
+        if value_type in (winreg.REG_SZ, winreg.REG_EXPAND_SZ):
+            return value_type
+        return winreg.REG_EXPAND_SZ if '%' in value else winreg.REG_SZ
+
+    def broadcast(self) -> None:
+        """Notify running applications that the environment changed"""
+        import ctypes
+        from ctypes import wintypes
+
+        HWND_BROADCAST = 0xFFFF
+        WM_SETTINGCHANGE = 0x001A
+        SMTO_ABORTIFHUNG = 0x0002
+        result = wintypes.DWORD()
+        ctypes.windll.user32.SendMessageTimeoutW(
+            HWND_BROADCAST, WM_SETTINGCHANGE, 0, REGISTRY_KEY,
+            SMTO_ABORTIFHUNG, 5000, ctypes.byref(result)
+        )
+
+
+class ManagedFileBackend(PersistenceBackend):
+    """Regenerates one file holding all saved variables (Linux and macOS)
+
+    The default is an environment.d fragment in dotenv syntax; a path ending
+    in .sh gets ``export NAME='value'`` lines for shells to source instead.
+    The file is written next to its final name, synced and renamed over it,
+    so readers never see it half written. Names that cannot be assigned in
+    the file's syntax are left out.
+    """
+
+    name = 'file'
+
+    def __init__(self, path: Optional[str] = None, fmt: Optional[str] = None):
+        self.path = os.path.expanduser(path or DEFAULT_MANAGED_FILE)
+        self.fmt = fmt or ('sh' if self.path.endswith('.sh') else 'dotenv')
+
+    def apply(self, changes: Dict[str, Optional[str]], saved: Dict[str, str]) -> None:
+        from .export_formats import write_export
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = self.path + f".{os.getpid()}.tmp"
+        try:
+            write_export(temp_file, ((name, saved[name]) for name in sorted(saved)), self.fmt)
+            with open(temp_file, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.path)
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+class RecordingBackend(PersistenceBackend):
+    """Remembers every batch instead of persisting it, for tests
+
+    ``calls`` holds a copy of the changes of each apply() in order; set
+    ``fail`` to an exception to make the next apply() raise it.
+    """
+
+    name = 'recording'
+
+    def __init__(self):
+        self.calls: List[Dict[str, Optional[str]]] = []
+        self.state: Dict[str, str] = {}
+        self.fail: Optional[Exception] = None
+
+    def apply(self, changes: Dict[str, Optional[str]], saved: Dict[str, str]) -> None:
+        if self.fail is not None:
+            error, self.fail = self.fail, None
+            raise error
+        self.calls.append(dict(changes))
+        for name, value in changes.items():
+            if value is None:
+                self.state.pop(name, None)
+            else:
+                self.state[name] = value
+
+    @property
+    def call_count(self) -> int:
+        return len(self.calls)
+
+
+def create_backend(name: Optional[str] = None) -> PersistenceBackend:
+    """Backend by name: 'registry', 'file' or 'none'
+
+    Defaults to $ENVGOD_PERSISTENCE, else the registry on Windows and
+    nothing beyond env_config.json elsewhere. The file backend writes
+    $ENVGOD_MANAGED_FILE if set.
+    """
+    name = name or os.environ.get("ENVGOD_PERSISTENCE")
+    if not name:
+        name = 'registry' if sys.platform == "win32" else 'none'
+    if name == 'registry':
+        if sys.platform != "win32":
+            raise ValueError("The registry persistence backend is only available on Windows")
+        return RegistryBackend()
+    if name == 'file':
+        return ManagedFileBackend(os.environ.get("ENVGOD_MANAGED_FILE"))
+    if name == 'none':
+        return NullBackend()
+    raise ValueError(f"Unknown persistence backend '{name}', expected one of {BACKENDS}")
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import marshal
+import os
+from typing import Any, Dict, List, Optional
+
+from .file_lock import atomic_write, file_lock
+from .flatten import flatten_json
+
+# Top-level keys holding one section per profile
+PROFILE_CONTAINERS = ('environments', 'profiles')
+
+# Top-level sections merged into every profile (profile values win)
+SHARED_SECTIONS = ('shared', 'common', 'defaults')
+
+# Suffixes accepted on top-level profile keys, e.g. DEVELOPMENT_CONFIG
+PROFILE_SUFFIXES = ('', '_CONFIG', '_ENV', '_ENVIRONMENT')
+
+# Bump when the resolution rules or cache layout change
+CACHE_FORMAT = 1
+
+# Default upper bound on the total size of cached profiles
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".profile"
+
+
+def _find_key(mapping: Dict[str, Any], wanted: str) -> Optional[str]:
+    """Key of mapping equal to wanted ignoring case, if any"""
+    wanted = wanted.upper()
+    for key in mapping:
+        if key.upper() == wanted:
+            return key
+    return None
+
+
+def _profile_sections(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map of profile name to section for a multi-environment document"""
+    for container in PROFILE_CONTAINERS:
+        key = _find_key(data, container)
+        if key is not None and isinstance(data[key], dict):
+            return {name: section for name, section in data[key].items()
+                    if isinstance(section, dict)}
+
+    shared = {key.upper() for key in SHARED_SECTIONS}
+    sections = {}
+    for key, section in data.items():
+        if not isinstance(section, dict) or key.upper() in shared:
+            continue
+        name = key
+        for suffix in PROFILE_SUFFIXES[1:]:
+            if key.upper().endswith(suffix):
+                name = key[:-len(suffix)]
+                break
+        sections[name] = section
+    return sections
+
+
+def list_profiles(data: Dict[str, Any]) -> List[str]:
+    """Names of the profiles defined in a multi-environment document"""
+    return sorted(_profile_sections(data))
+
+
+def resolve_profile(data: Dict[str, Any], profile: str, separator: str = '_',
+                    key_case: Optional[str] = None, index_lists: bool = False) -> Dict[str, str]:
+    """Flatten the shared sections and one profile into a single variable set
+
+    Profiles come from an ``environments``/``profiles`` mapping, or else from
+    top-level sections named after the profile with an optional suffix
+    (``DEVELOPMENT_CONFIG`` for ``development``). Matching is case-insensitive.
+    """
+    sections = _profile_sections(data)
+    name = _find_key(sections, profile)
+    if name is None:
+        available = ", ".join(sorted(sections)) or "none"
+        raise KeyError(f"Profile '{profile}' not found (available: {available})")
+
+    resolved: Dict[str, str] = {}
+    for shared in SHARED_SECTIONS:
+        key = _find_key(data, shared)
+        if key is not None and isinstance(data[key], dict):
+            resolved.update(flatten_json(data[key], separator=separator,
+                                         key_case=key_case, index_lists=index_lists))
+    resolved.update(flatten_json(sections[name], separator=separator,
+                                 key_case=key_case, index_lists=index_lists))
+    return resolved
+
+
+class ProfileCache:
+    """On-disk cache of resolved profiles keyed by file content and options
+
+    A hit costs one read and hash of the source file plus one marshal load;
+    JSON parsing and flattening are skipped entirely. Editing a file leaves
+    entries for its old content behind, so least recently used entries are
+    evicted once the total size exceeds max_bytes. A hit touches its entry
+    file, whose mtime is the recency eviction goes by.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock_file = os.path.join(cache_dir, "profiles.lock")
+
+    def _key(self, content: bytes, profile: str, options: Dict[str, Any]) -> str:
+        digest = hashlib.sha256(content)
+        digest.update(json.dumps([CACHE_FORMAT, profile.upper(), options],
+                                 sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def resolve(self, filename: str, profile: str, use_cache: bool = True,
+                **options: Any) -> Dict[str, str]:
+        """Resolve a profile from filename, reusing a cached result if valid"""
+        with open(filename, 'rb') as f:
+            content = f.read()
+
+        cache_file = os.path.join(self.cache_dir, self._key(content, profile, options) + _ENTRY_SUFFIX)
+        if use_cache and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    resolved = marshal.loads(f.read())
+                os.utime(cache_file)
+                return resolved
+            except Exception:
+                # Corrupt or just evicted entry; fall through and rebuild it
+                pass
+
+        resolved = resolve_profile(json.loads(content), profile, **options)
+
+        if use_cache:
+            try:
+                data = marshal.dumps(resolved)
+                if len(data) <= self.max_bytes:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    atomic_write(cache_file, data)
+                    with file_lock(self.lock_file):
+                        self._evict()
+            except Exception as e:
+                print(f"Warning: Could not write profile cache: {e}")
+        return resolved
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the size cap is met"""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
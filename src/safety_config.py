@@ -1,3 +1,9 @@
+import fnmatch
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
 # Critical system environment variables that should not be deleted
 PROTECTED_VARIABLES = {
     'PATH', 'PATHEXT', 'SYSTEMROOT', 'WINDIR', 'COMSPEC', 'TEMP', 'TMP',
@@ -16,3 +22,136 @@ SENSITIVE_VARIABLES = {
     'PATH', 'PYTHONPATH', 'JAVA_HOME', 'NODE_PATH', 'LD_LIBRARY_PATH',
     'CLASSPATH', 'MAVEN_HOME', 'GRADLE_HOME', 'ANDROID_HOME'
 }
+
+# Name patterns that suggest a system variable (shell-style globs)
+CAUTION_PATTERNS = ['SYSTEM*', 'PROCESSOR*', 'COMPUTER*']
+
+SAFETY_LEVELS = ('protected', 'sensitive', 'caution')
+
+RECOMMENDATIONS = {
+    'protected': "PROTECTED: This is a critical system variable. Deletion not recommended.",
+    'sensitive': "SENSITIVE: This variable affects system functionality. Use caution.",
+    'caution': "CAUTION: This appears to be a system variable.",
+    'safe': "SAFE: This appears to be a user-defined variable.",
+}
+
+# Optional JSON rules file extending (or replacing) the defaults above
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), "safety_rules.json")
+
+# Memoized classifications kept before the cache is cleared
+CLASSIFY_CACHE_SIZE = 65536
+
+
+def _rule_regex(rule: str) -> Optional[str]:
+    """Regex source for a pattern rule, or None if the rule is a literal
+
+    "re:<regex>" is a regular expression matched anywhere in the name,
+    rules containing *, ? or [ are shell-style globs matching the whole
+    name, and anything else is a literal name. Matching is case-insensitive.
+    """
+    if rule.startswith('re:'):
+        return f".*?(?:{rule[3:]})"
+    if any(char in rule for char in '*?['):
+        return fnmatch.translate(rule.upper())
+    return None
+
+
+class SafetyRules:
+    """Compiled protected/sensitive/caution rules with memoized lookups
+
+    Literal rules become per-level sets; all glob and regex rules are
+    compiled into one regex whose optional lookaheads capture every level
+    that matches, so a name is classified with one set probe per level and
+    at most one regex match. Results are cached per name until the rules
+    are reloaded.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None):
+        self.rules_file: Optional[str] = None
+        self._compile(rules if rules is not None else self.default_rules())
+
+    @staticmethod
+    def default_rules() -> Dict[str, List[str]]:
+        return {
+            'protected': sorted(PROTECTED_VARIABLES),
+            'sensitive': sorted(SENSITIVE_VARIABLES),
+            'caution': list(CAUTION_PATTERNS),
+        }
+
+    @classmethod
+    def from_file(cls, rules_file: str = DEFAULT_RULES_FILE) -> 'SafetyRules':
+        """Build rules from the defaults plus an optional JSON rules file"""
+        engine = cls.__new__(cls)
+        engine.rules_file = rules_file
+        engine.reload()
+        return engine
+
+    def reload(self) -> None:
+        """Re-read the rules file (if any) and drop memoized results"""
+        rules = self.default_rules()
+        if self.rules_file and os.path.exists(self.rules_file):
+            try:
+                with open(self.rules_file, 'r') as f:
+                    config = json.load(f)
+                if config.get('replace_defaults'):
+                    rules = {level: [] for level in SAFETY_LEVELS}
+                for level in SAFETY_LEVELS:
+                    rules[level].extend(config.get(level, []))
+            except Exception as e:
+                print(f"Error loading safety rules: {e}")
+        try:
+            self._compile(rules)
+        except (re.error, AttributeError, TypeError) as e:
+            # A bad pattern (or a non-string rule) must not take down every
+            # delete and listing; keep the built-in rules instead
+            print(f"Error compiling safety rules from {self.rules_file}: {e}; using the defaults")
+            self._compile(self.default_rules())
+
+    def _compile(self, rules: Dict[str, List[str]]) -> None:
+        self._literals: Dict[str, Set[str]] = {}
+        lookaheads = []
+        for level in SAFETY_LEVELS:
+            literals = set()
+            patterns = []
+            for rule in rules.get(level, []):
+                regex = _rule_regex(rule)
+                if regex is None:
+                    literals.add(rule.upper())
+                else:
+                    patterns.append(regex)
+            self._literals[level] = literals
+            if patterns:
+                lookaheads.append(f"(?:(?=(?P<{level}>{'|'.join(patterns)})))?")
+        self._matcher = re.compile(''.join(lookaheads), re.IGNORECASE) if lookaheads else None
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+    def classify_name(self, name: str) -> Dict[str, Any]:
+        """Return the safety information for one variable name"""
+        info = self._cache.get(name)
+        if info is not None:
+            return info
+
+        name_upper = name.upper()
+        matched = {level for level in SAFETY_LEVELS if name_upper in self._literals[level]}
+        if self._matcher is not None:
+            groups = self._matcher.match(name_upper).groupdict()
+            matched.update(level for level, text in groups.items() if text is not None)
+
+        level = next((level for level in SAFETY_LEVELS if level in matched), 'safe')
+        info = {
+            'is_protected': 'protected' in matched,
+            'is_sensitive': 'sensitive' in matched,
+            'is_system_created': 'protected' in matched,
+            'level': level,
+            'recommendation': RECOMMENDATIONS[level],
+        }
+
+        if len(self._cache) >= CLASSIFY_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[name] = info
+        return info
+
+    def classify(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Classify many names at once"""
+        classify_name = self.classify_name
+        return {name: classify_name(name) for name in names}
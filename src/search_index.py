@@ -0,0 +1,151 @@
+import fnmatch
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+SEARCH_MODES = ('substring', 'glob', 'regex')
+SEARCH_FIELDS = ('both', 'name', 'value')
+
+# Scan instead of using postings when even the rarest trigram of a term
+# occurs in more than 1/UNSELECTIVE_FRACTION of the entries
+UNSELECTIVE_FRACTION = 8
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _glob_literals(pattern: str) -> List[str]:
+    """Literal runs of a glob pattern that every match must contain"""
+    if '[' in pattern:
+        # Character classes make literal extraction unreliable; skip it
+        return []
+    return [part for part in re.split(r'[*?]', pattern) if part]
+
+
+def compile_matcher(term: str, mode: str = 'substring') -> Callable[[str], bool]:
+    """Build a predicate over case-folded text for a search term
+
+    substring: the term occurs anywhere in the text
+    glob: the whole text matches a shell-style pattern (e.g. "JAVA_*")
+    regex: the regular expression matches anywhere in the text
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{mode}', expected one of {SEARCH_MODES}")
+
+    if mode == 'regex':
+        # Not lowercased: that would turn escapes like \D or \S into their
+        # opposites (and \Z into an invalid \z); IGNORECASE does the folding
+        return re.compile(term, re.IGNORECASE).search
+    term = term.lower()
+    if mode == 'substring':
+        return lambda text: term in text
+    return re.compile(fnmatch.translate(term), re.DOTALL).match
+
+
+def scan_items(items: Iterable[Tuple[str, str]], term: str, mode: str = 'substring',
+               field: str = 'both') -> List[str]:
+    """Match names by scanning every item, without building an index"""
+    if field not in SEARCH_FIELDS:
+        raise ValueError(f"Unknown search field '{field}', expected one of {SEARCH_FIELDS}")
+    matches = compile_matcher(term, mode)
+    check_name = field != 'value'
+    check_value = field != 'name'
+    return [name for name, value in items
+            if (check_name and matches(name.lower())) or (check_value and matches(value.lower()))]
+
+
+class SearchIndex:
+    """Case-folded name/value columns plus trigram postings for fast lookups
+
+    Substring queries of three or more characters, and globs with literal
+    runs of that length, only verify the names whose trigram postings
+    contain every trigram of the term. Shorter terms, regexes and terms
+    whose rarest trigram is very common fall back to scanning the folded
+    columns, which still avoids re-lowering every entry on each query. The index is kept current with set() and remove().
+    """
+
+    def __init__(self, items: Optional[Dict[str, str]] = None):
+        self._names: Dict[str, str] = {}
+        self._values: Dict[str, str] = {}
+        self._name_grams: Dict[str, Set[str]] = {}
+        self._value_grams: Dict[str, Set[str]] = {}
+        if items:
+            for name, value in items.items():
+                self.set(name, value)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def set(self, name: str, value: str) -> None:
+        """Add or update one entry"""
+        if name in self._names:
+            self.remove(name)
+        folded_name = name.lower()
+        folded_value = value.lower()
+        self._names[name] = folded_name
+        self._values[name] = folded_value
+        for gram in _trigrams(folded_name):
+            self._name_grams.setdefault(gram, set()).add(name)
+        for gram in _trigrams(folded_value):
+            self._value_grams.setdefault(gram, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        """Drop one entry if present"""
+        folded_name = self._names.pop(name, None)
+        if folded_name is None:
+            return
+        folded_value = self._values.pop(name)
+        for postings, text in ((self._name_grams, folded_name), (self._value_grams, folded_value)):
+            for gram in _trigrams(text):
+                names = postings.get(gram)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del postings[gram]
+
+    def _candidates(self, postings: Dict[str, Set[str]], literals: List[str]) -> Optional[Set[str]]:
+        """Names containing every trigram of the literals, None to scan instead"""
+        grams = set()
+        for literal in literals:
+            grams |= _trigrams(literal)
+        if not grams:
+            return None
+        sets = sorted((postings.get(gram, set()) for gram in grams), key=len)
+        if len(sets[0]) * UNSELECTIVE_FRACTION > len(self._names):
+            # Intersecting huge postings costs more than scanning the column
+            return None
+        result = set(sets[0])
+        for names in sets[1:]:
+            if not result:
+                break
+            result &= names
+        return result
+
+    def _search_column(self, column: Dict[str, str], postings: Dict[str, Set[str]],
+                       matches: Callable[[str], bool], literals: List[str]) -> Set[str]:
+        candidates = self._candidates(postings, literals)
+        if candidates is None:
+            return {name for name, text in column.items() if matches(text)}
+        return {name for name in candidates if matches(column[name])}
+
+    def search(self, term: str, mode: str = 'substring', field: str = 'both') -> List[str]:
+        """Return the sorted names matching term"""
+        if field not in SEARCH_FIELDS:
+            raise ValueError(f"Unknown search field '{field}', expected one of {SEARCH_FIELDS}")
+        matches = compile_matcher(term, mode)
+
+        # Regexes get no literals: runs of a lowercased pattern are not
+        # reliably literal text (escapes, classes), so they scan instead
+        if mode == 'substring':
+            literals = [term.lower()]
+        elif mode == 'glob':
+            literals = _glob_literals(term.lower())
+        else:
+            literals = []
+
+        results: Set[str] = set()
+        if field != 'value':
+            results |= self._search_column(self._names, self._name_grams, matches, literals)
+        if field != 'name':
+            results |= self._search_column(self._values, self._value_grams, matches, literals)
+        return sorted(results)
@@ -0,0 +1,126 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+class EnvTransaction:
+    """Stages environment variable changes and commits them in one pass"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        # Staged changes keyed by name: (value or None for delete, persistent)
+        self._changes: Dict[str, Tuple[Optional[str], bool]] = {}
+        self._committed = False
+
+    def __enter__(self) -> 'EnvTransaction':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def set(self, name: str, value: str, persistent: bool = False) -> None:
+        """Stage setting a variable"""
+        self._changes[name] = (value, persistent)
+
+    def delete(self, name: str, persistent: bool = False) -> None:
+        """Stage deleting a variable"""
+        self._changes[name] = (None, persistent)
+
+    def discard(self) -> None:
+        """Drop all staged changes without applying them"""
+        self._changes.clear()
+
+    def commit(self) -> None:
+        """Apply staged changes with a single config write and persistence step.
+
+        Sets that match the current value are skipped: a persistent set whose
+        saved value is already equal is neither rewritten nor re-sent to the
+        system. On failure every touched variable in os.environ and saved_vars is
+        restored to its previous state and the exception is re-raised.
+        """
+        if self._committed:
+            raise RuntimeError("Transaction already committed")
+        self._committed = True
+
+        if not self._changes:
+            return
+
+        manager = self.manager
+        old_environ = {name: os.environ.get(name) for name in self._changes}
+        old_saved = {name: manager.saved_vars.get(name) for name in self._changes}
+
+        # Changes for the persistence backend; None marks a delete
+        system_changes: Dict[str, Optional[str]] = {}
+        backups: List[Tuple[str, str]] = []
+        saved_changes: Dict[str, Optional[str]] = {}
+        config_written = False
+
+        try:
+            for name, (value, persistent) in self._changes.items():
+                if value is not None:
+                    # Setting a variable to its current value writes nothing
+                    if old_environ[name] != value:
+                        os.environ[name] = value
+                    if persistent and old_saved[name] != value:
+                        manager.saved_vars[name] = value
+                        system_changes[name] = value
+                        saved_changes[name] = value
+                else:
+                    if persistent:
+                        original_value = old_environ[name] or old_saved[name]
+                        if original_value:
+                            backups.append((name, original_value))
+                    os.environ.pop(name, None)
+                    if persistent:
+                        if name in manager.saved_vars:
+                            del manager.saved_vars[name]
+                            saved_changes[name] = None
+                        system_changes[name] = None
+
+            if backups:
+                manager._create_backup_entries(backups)
+
+            if saved_changes:
+                manager._commit_saved_changes(saved_changes)
+                config_written = True
+
+            if system_changes:
+                manager._persist_system_changes(system_changes)
+
+            manager._record_changes(self._changes)
+        except Exception:
+            self._restore(old_environ, old_saved, saved_changes if config_written else {})
+            raise
+        finally:
+            manager._update_search_index(self._changes)
+            self._changes.clear()
+
+    def _restore(self, old_environ: Dict[str, Optional[str]],
+                 old_saved: Dict[str, Optional[str]],
+                 written: Dict[str, Optional[str]]) -> None:
+        """Roll back os.environ and saved_vars to their pre-commit state"""
+        manager = self.manager
+
+        for name, value in old_environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+        for name, value in old_saved.items():
+            if value is None:
+                manager.saved_vars.pop(name, None)
+            else:
+                manager.saved_vars[name] = value
+
+        if written:
+            try:
+                manager._commit_saved_changes({name: old_saved[name] for name in written})
+            except Exception as e:
+                print(f"Error restoring config during rollback: {e}")
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the package as `src`, the way main.py and the benchmarks do
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+@pytest.fixture
+def clean_environ():
+    """Restore os.environ after a test that changes it through the manager"""
+    saved = dict(os.environ)
+    yield
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+@pytest.fixture
+def backend():
+    from src.persistence import RecordingBackend
+    return RecordingBackend()
+
+
+@pytest.fixture
+def manager(tmp_path, backend, clean_environ):
+    """Manager with its config, caches and backups under tmp_path"""
+    from src.env_manager import EnvironmentManager
+    return EnvironmentManager(str(tmp_path / "env_config.json"), persistence=backend)
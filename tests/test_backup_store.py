@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from src.backup_store import BackupStore
+
+
+def names(store):
+    return [record['name'] for record in store.entries()]
+
+
+def test_entries_are_newest_first_with_increasing_ids(tmp_path):
+    store = BackupStore(str(tmp_path / "backups.ring"), capacity=8)
+    store.append_many([('A', '1'), ('B', '2')])
+    store.append('C', '3')
+
+    entries = store.entries()
+    assert [(e['name'], e['value']) for e in entries] == [('C', '3'), ('B', '2'), ('A', '1')]
+    assert [e['id'] for e in entries] == [3, 2, 1]
+
+
+def test_wrap_around_keeps_the_newest_capacity_records(tmp_path):
+    store = BackupStore(str(tmp_path / "backups.ring"), capacity=4)
+    for i in range(11):
+        store.append(f"VAR_{i}", str(i))
+
+    assert names(store) == ['VAR_10', 'VAR_9', 'VAR_8', 'VAR_7']
+    # A second instance reads the same ring from the file header
+    assert names(BackupStore(str(tmp_path / "backups.ring"))) == names(store)
+
+
+def test_multi_slot_record_partly_overwritten_is_dropped(tmp_path):
+    store = BackupStore(str(tmp_path / "backups.ring"), capacity=4, slot_size=128)
+    store.append('SMALL_1', 'x')
+    store.append('BIG', 'y' * 150)       # spans two slots
+    store.append('SMALL_2', 'x')
+    assert names(store) == ['SMALL_2', 'BIG', 'SMALL_1']
+
+    store.append('SMALL_3', 'x')         # overwrites SMALL_1's slot
+    store.append('SMALL_4', 'x')         # overwrites BIG's first slot
+    assert names(store) == ['SMALL_4', 'SMALL_3', 'SMALL_2']
+
+    with pytest.raises(ValueError):
+        store.append('HUGE', 'h' * 1000)
+
+
+def test_find_returns_the_newest_backup_of_a_name(tmp_path):
+    store = BackupStore(str(tmp_path / "backups.ring"))
+    store.append('API_URL', 'old')
+    store.append('OTHER', 'o')
+    store.append('API_URL', 'newer')
+
+    assert store.find('API_URL')['value'] == 'newer'
+    assert store.find(entry_id=1)['value'] == 'old'
+    assert store.find('MISSING') is None
+
+
+def test_legacy_backups_are_migrated_once_in_order(tmp_path):
+    legacy = tmp_path / "backup_vars.json"
+    legacy.write_text(json.dumps({'deleted_variables': [
+        {'name': 'OLD_A', 'value': 'a', 'deleted_at': '2024-01-01T00:00:00'},
+        {'name': 'OLD_B', 'value': 'b', 'deleted_at': '2024-01-02T00:00:00'},
+    ]}))
+    store = BackupStore(str(tmp_path / "backups.ring"), legacy_file=str(legacy))
+
+    store.append('NEW', 'n')
+    assert names(store) == ['NEW', 'OLD_B', 'OLD_A']
+    assert store.find('OLD_A')['deleted_at'] == '2024-01-01T00:00:00'
+
+    # The ring exists now, so a new instance does not migrate again
+    store = BackupStore(str(tmp_path / "backups.ring"), legacy_file=str(legacy))
+    assert names(store) == ['NEW', 'OLD_B', 'OLD_A']
+
+
+def test_restore_uses_the_newest_backup_or_an_id(manager, backend):
+    for value in ('first', 'second'):
+        manager.set_env_var('ENVGOD_TEST_BACKUP', value, persistent=True)
+        assert manager.delete_env_var('ENVGOD_TEST_BACKUP', persistent=True)[0]
+
+    assert [e['value'] for e in manager.list_backups()] == ['second', 'first']
+
+    ok, _ = manager.restore_backup('ENVGOD_TEST_BACKUP')
+    assert ok and manager.get_env_var('ENVGOD_TEST_BACKUP') == 'second'
+    oldest = manager.list_backups()[-1]['id']
+    ok, _ = manager.restore_backup(entry_id=oldest, persistent=True)
+    assert ok and manager.get_env_var('ENVGOD_TEST_BACKUP') == 'first'
+    assert backend.state['ENVGOD_TEST_BACKUP'] == 'first'
+
+    assert manager.restore_backup('NEVER_BACKED_UP') == (False, "No backup found for 'NEVER_BACKED_UP'")
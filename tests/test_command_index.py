@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+from src.command_index import CommandIndex
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses execute bits")
+
+
+def make_command(directory, name):
+    path = directory / name
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_saved_index_is_reused_without_rescanning(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    tool = make_command(bin_dir, "tool")
+    cache_file = str(tmp_path / "cache" / "commands.bin")
+
+    index = CommandIndex(cache_file)
+    assert index.which(['tool'], [str(bin_dir)]) == {'tool': [tool]}
+    index.save()
+    assert os.listdir(tmp_path / "cache") == ["commands.bin"]
+
+    reloaded = CommandIndex(cache_file)
+    assert reloaded.which(['tool'], [str(bin_dir)]) == {'tool': [tool]}
+    assert reloaded.scanned == 0
+
+
+def test_new_command_rescans_its_directory(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    make_command(bin_dir, "tool")
+    cache_file = str(tmp_path / "commands.bin")
+    index = CommandIndex(cache_file)
+    index.which(['tool'], [str(bin_dir)])
+    index.save()
+
+    # Directory mtimes can be coarse; force a visible change
+    other = make_command(bin_dir, "other")
+    stat = os.stat(bin_dir)
+    os.utime(bin_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    reloaded = CommandIndex(cache_file)
+    assert reloaded.which(['other'], [str(bin_dir)]) == {'other': [other]}
+    assert reloaded.scanned == 1
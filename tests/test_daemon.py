@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import pytest
+
+from src import daemon as daemon_module
+from src.cli import EnvironmentCLI
+from src.daemon import DaemonClient, DaemonError, EnvironmentDaemon
+from src.env_manager import EnvironmentManager
+
+pytestmark = pytest.mark.skipif(not daemon_module.is_supported(), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def server(tmp_path, backend, clean_environ):
+    """A daemon serving a manager under tmp_path on a short socket path"""
+    manager = EnvironmentManager(str(tmp_path / "env_config.json"), persistence=backend)
+    socket_dir = tempfile.mkdtemp(prefix="eg")
+    daemon = EnvironmentDaemon(manager, os.path.join(socket_dir, "d.sock"))
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    with DaemonClient.connect(daemon.socket_path) as client:
+        client.request('shutdown')
+    thread.join(5)
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+def write_profiles(path):
+    path.write_text(json.dumps({
+        'shared': {'EG_APP': 'app'},
+        'environments': {'staging': {'EG_URL': 'https://staging'},
+                         'production': {'EG_URL': 'https://prod'}},
+    }))
+    return str(path)
+
+
+def test_search_answers_from_the_sent_environment_without_touching_its_own(server):
+    before = dict(os.environ)
+    caller = {'EG_ONLY_CALLER': 'needle', 'OTHER': 'x'}
+
+    result = server.handle({'op': 'search', 'term': 'needle', 'environ': caller})
+
+    assert result == {'ok': True, 'result': {'EG_ONLY_CALLER': 'needle'}}
+    assert dict(os.environ) == before
+
+
+def test_search_follows_changes_between_callers(server):
+    server.handle({'op': 'search', 'term': 'x', 'environ': {'A': 'needle', 'B': 'needle'}})
+
+    result = server.handle({'op': 'search', 'term': 'needle',
+                            'environ': {'A': 'changed', 'C': 'needle'}})
+
+    assert result['result'] == {'C': 'needle'}
+    assert server.handle({'op': 'ping'})['result']['variables'] == 2
+
+
+def test_search_needs_the_callers_environment(server):
+    response = server.handle({'op': 'search', 'term': 'x'})
+    assert not response['ok'] and 'environ' in response['error']
+    response = server.handle({'op': 'search', 'term': '(', 'mode': 'regex', 'environ': {}})
+    assert not response['ok'] and 'Invalid regular expression' in response['error']
+
+
+def test_only_daemon_side_state_is_served(server):
+    server.manager.set_env_var('EG_SAVED', 'saved', persistent=True)
+    assert server.handle({'op': 'list', 'saved': True})['result'] == {'EG_SAVED': 'saved'}
+    assert not server.handle({'op': 'list'})['ok']
+    for op in ('get', 'set'):
+        assert server.handle({'op': op, 'name': 'PATH'}) == {
+            'ok': False, 'error': f"Unknown operation '{op}'"}
+
+
+def test_profile_op_resolves_and_caches(server, tmp_path):
+    filename = write_profiles(tmp_path / "envs.json")
+    request = {'op': 'profile', 'filename': filename, 'profile': 'staging', 'options': {}}
+
+    assert server.handle(request)['result'] == {'EG_APP': 'app', 'EG_URL': 'https://staging'}
+    assert server.handle(request)['result'] == {'EG_APP': 'app', 'EG_URL': 'https://staging'}
+    assert server.handle({'op': 'ping'})['result']['cached_profiles'] == 1
+
+    response = server.handle(dict(request, profile='qa'))
+    assert response['error'].startswith("Profile 'qa' not found")
+
+
+def test_use_resolves_the_profile_through_the_daemon(server, tmp_path, monkeypatch, manager,
+                                                     backend):
+    filename = write_profiles(tmp_path / "envs.json")
+    monkeypatch.setenv('ENVGOD_SOCKET', server.socket_path)
+    monkeypatch.delenv('ENVGOD_NO_DAEMON', raising=False)
+    cli = EnvironmentCLI()
+    cli.env_manager = manager
+    served = server.requests
+
+    assert cli.run(['use', filename, 'production', '--persist']) == 0
+
+    assert server.requests == served + 1
+    assert server.handle({'op': 'ping'})['result']['cached_profiles'] == 1
+    # Applied in the calling process, not in the daemon's
+    assert os.environ['EG_URL'] == 'https://prod'
+    assert backend.state == {'EG_APP': 'app', 'EG_URL': 'https://prod'}
+    assert manager.environment_view().source('EG_URL') == 'profile production'
+
+    assert cli.run(['use', filename, 'qa']) == 1
+
+
+def test_client_reports_rejected_requests(server):
+    with DaemonClient.connect(server.socket_path) as client:
+        with pytest.raises(DaemonError):
+            client.request('get', name='PATH')
+        assert client.request('ping')['pid'] == os.getpid()
@@ -0,0 +1,94 @@
+import os
+
+from src.env_diff import diff_environments
+
+
+def test_diff_sorts_names_into_added_changed_removed_and_unchanged():
+    current = {'KEEP': '1', 'CHANGE': 'old', 'DROP': 'x'}
+    target = {'KEEP': '1', 'CHANGE': 'new', 'ADD': 'a'}
+
+    diff = diff_environments(current, target)
+
+    assert diff.added == {'ADD': 'a'}
+    assert diff.changed == {'CHANGE': ('old', 'new')}
+    assert diff.removed == {'DROP': 'x'}
+    assert diff.unchanged == 1
+    assert diff.updates() == {'ADD': 'a', 'CHANGE': 'new'}
+    assert diff.summary() == "1 added, 1 changed, 1 removed, 1 unchanged"
+    assert diff.summary(include_removed=False) == "1 added, 1 changed, 1 unchanged"
+
+
+def test_identical_sets_have_no_changes():
+    diff = diff_environments({'A': '1'}, {'A': '1'})
+    assert not diff.has_changes()
+    assert diff.removed == {}
+
+
+def test_removed_only_counts_without_include_removed():
+    diff = diff_environments({'A': '1', 'B': '2'}, {'A': '1'})
+    assert diff.has_changes()
+    assert not diff.has_changes(include_removed=False)
+
+
+def test_empty_string_value_is_not_treated_as_missing():
+    diff = diff_environments({'EMPTY': ''}, {'EMPTY': '', 'NEW': ''})
+    assert diff.added == {'NEW': ''}
+    assert diff.unchanged == 1
+
+
+def test_persistent_apply_writes_only_changed_keys(manager, backend):
+    manager.apply_environment({'EG_A': '1', 'EG_B': '2', 'EG_C': '3'}, persistent=True)
+    assert backend.calls == [{'EG_A': '1', 'EG_B': '2', 'EG_C': '3'}]
+    backend.calls.clear()
+
+    diff = manager.apply_environment({'EG_A': '1', 'EG_B': 'two', 'EG_C': '3', 'EG_D': '4'},
+                                     persistent=True)
+
+    assert backend.calls == [{'EG_B': 'two', 'EG_D': '4'}]
+    assert diff.unchanged == 2
+    assert manager.get_saved_vars() == {'EG_A': '1', 'EG_B': 'two', 'EG_C': '3', 'EG_D': '4'}
+
+
+def test_unchanged_apply_makes_no_backend_call(manager, backend):
+    target = {'EG_A': '1', 'EG_B': '2'}
+    manager.apply_environment(target, persistent=True)
+    backend.calls.clear()
+
+    diff = manager.apply_environment(target, persistent=True)
+
+    assert backend.calls == []
+    assert not diff.has_changes()
+
+
+def test_prune_applies_deletions(manager, backend):
+    manager.apply_environment({'EG_A': '1', 'EG_B': '2', 'EG_C': '3'}, persistent=True)
+    backend.calls.clear()
+
+    diff = manager.apply_environment({'EG_A': '1', 'EG_C': 'three'}, persistent=True, prune=True)
+
+    assert diff.removed == {'EG_B': '2'}
+    assert backend.calls == [{'EG_C': 'three', 'EG_B': None}]
+    assert backend.state == {'EG_A': '1', 'EG_C': 'three'}
+    assert 'EG_B' not in os.environ
+    assert manager.get_saved_vars() == {'EG_A': '1', 'EG_C': 'three'}
+
+
+def test_apply_without_prune_keeps_names_missing_from_the_target(manager, backend):
+    manager.apply_environment({'EG_A': '1', 'EG_B': '2'}, persistent=True)
+    backend.calls.clear()
+
+    diff = manager.apply_environment({'EG_A': '1'}, persistent=True)
+
+    assert backend.calls == []
+    assert diff.removed == {'EG_B': '2'}
+    assert manager.get_saved_vars() == {'EG_A': '1', 'EG_B': '2'}
+    assert os.environ['EG_B'] == '2'
+
+
+def test_temporary_apply_compares_with_the_process_environment(manager, backend):
+    os.environ['EG_SAME'] = 'x'
+    diff = manager.apply_environment({'EG_SAME': 'x', 'EG_NEW': 'y'})
+
+    assert diff.added == {'EG_NEW': 'y'}
+    assert os.environ['EG_NEW'] == 'y'
+    assert backend.calls == []
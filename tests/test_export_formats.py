@@ -0,0 +1,155 @@
+import gzip
+import json
+import lzma
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from src.export_formats import detect_format, write_export
+
+# Values that need quoting or escaping in at least one format
+TRICKY = {
+    'PLAIN': 'simple-value_1.2:/x@y%z+w,v',
+    'EMPTY': '',
+    'SPACES': 'two words  and tabs\t',
+    'DOLLAR': 'cost $HOME ${USER} $(id) `id`',
+    'EQUALS': 'a=b==c',
+    'SINGLE': "it's",
+    'DOUBLE': 'say "hi"',
+    'BOTH_QUOTES': """it's "quoted" $HOME""",
+    'BACKSLASH': r'C:\path\n\t not a newline',
+    'NEWLINE': 'line one\nline two\r\nline three',
+    'NEWLINE_SINGLE': "don't\nstop",
+    'HASH': 'value # not a comment',
+    'UNICODE': 'naïve — ☃',
+}
+
+
+def parse_dotenv(text):
+    """Reference reader for the dotenv dialect the exporter writes
+
+    Bare values are taken as is, single-quoted values literally, and
+    double-quoted values decode \\\\, \\", \\n and \\r.
+    """
+    result = {}
+    for line in text.splitlines(keepends=False):
+        name, _, raw = line.partition('=')
+        if raw.startswith("'"):
+            assert raw.endswith("'") and len(raw) >= 2
+            value = raw[1:-1]
+        elif raw.startswith('"'):
+            assert raw.endswith('"') and len(raw) >= 2
+            body, value, i = raw[1:-1], [], 0
+            while i < len(body):
+                char = body[i]
+                if char == '\\':
+                    value.append({'n': '\n', 'r': '\r', '\\': '\\', '"': '"'}[body[i + 1]])
+                    i += 2
+                else:
+                    assert char != '"', "unescaped double quote"
+                    value.append(char)
+                    i += 1
+            value = ''.join(value)
+        else:
+            assert not any(char in raw for char in ' \t\'"$`\\#'), raw
+            value = raw
+        result[name] = value
+    return result
+
+
+def export(tmp_path, name, items, fmt=None, compression=None):
+    path = str(tmp_path / name)
+    skipped = write_export(path, items.items(), fmt, compression)
+    return path, skipped
+
+
+def read_text(path):
+    opener = gzip.open if path.endswith('.gz') else lzma.open if path.endswith('.xz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('fmt', ['json', 'json-compact'])
+def test_json_round_trips(tmp_path, fmt):
+    path, skipped = export(tmp_path, 'vars.json', TRICKY, fmt)
+    assert skipped == []
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == TRICKY
+    if fmt == 'json':
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == json.dumps(TRICKY, indent=4)
+
+
+def test_json_of_nothing_is_an_empty_object(tmp_path):
+    path, _ = export(tmp_path, 'vars.json', {})
+    assert read_text(path) == '{}'
+
+
+def test_ndjson_round_trips(tmp_path):
+    path, _ = export(tmp_path, 'vars.ndjson', TRICKY)
+    lines = read_text(path).split('\n')
+    assert lines[-1] == ''
+    assert {entry['name']: entry['value'] for entry in map(json.loads, lines[:-1])} == TRICKY
+
+
+def test_dotenv_round_trips(tmp_path):
+    path, skipped = export(tmp_path, 'vars.env', TRICKY)
+    assert skipped == []
+    text = read_text(path)
+    assert len(text.splitlines()) == len(TRICKY)
+    assert parse_dotenv(text) == TRICKY
+    assert "PLAIN=simple-value_1.2:/x@y%z+w,v\n" in text
+    # $ is only safe unexpanded inside single quotes
+    assert "DOLLAR='cost $HOME ${USER} $(id) `id`'\n" in text
+
+
+@pytest.mark.skipif(shutil.which('sh') is None, reason="needs a POSIX shell")
+def test_sh_round_trips_through_a_shell(tmp_path):
+    path, skipped = export(tmp_path, 'vars.sh', TRICKY)
+    assert skipped == []
+    dump = ("import json, os, sys; "
+            "json.dump({k: os.environ[k] for k in sys.argv[1:]}, sys.stdout)")
+    env = {'PATH': os.environ.get('PATH', ''), 'HOME': '/nonexistent', 'USER': 'nobody'}
+    output = subprocess.run(
+        ['sh', '-c', '. "$1"; shift; exec "$@"', 'sh', path, sys.executable, '-c', dump, *TRICKY],
+        capture_output=True, text=True, env=env, check=True).stdout
+    assert json.loads(output) == TRICKY
+
+
+@pytest.mark.parametrize('fmt', ['dotenv', 'sh'])
+def test_names_a_shell_cannot_assign_are_skipped(tmp_path, fmt):
+    items = {'GOOD': '1', 'BAD-NAME': '2', '1LEADING_DIGIT': '3', 'ProgramFiles(x86)': '4'}
+    path, skipped = export(tmp_path, 'vars.out', items, fmt)
+    assert skipped == ['BAD-NAME', '1LEADING_DIGIT', 'ProgramFiles(x86)']
+    assert 'GOOD' in read_text(path)
+    assert 'BAD' not in read_text(path)
+
+
+@pytest.mark.parametrize('name, fmt', [('vars.json.gz', 'json'), ('vars.env.xz', 'dotenv'),
+                                       ('vars.ndjson.gz', 'ndjson')])
+def test_compressed_exports_round_trip(tmp_path, name, fmt):
+    path, _ = export(tmp_path, name, TRICKY)
+    text = read_text(path)
+    if fmt == 'json':
+        assert json.loads(text) == TRICKY
+    elif fmt == 'dotenv':
+        assert parse_dotenv(text) == TRICKY
+    else:
+        assert {e['name']: e['value'] for e in map(json.loads, text.splitlines())} == TRICKY
+
+
+def test_detect_format():
+    assert detect_format('vars.env.gz') == ('dotenv', 'gzip')
+    assert detect_format('/tmp/.env') == ('dotenv', None)
+    assert detect_format('dump.JSONL.xz') == ('ndjson', 'xz')
+    assert detect_format('vars.txt') == (None, None)
+
+
+def test_unknown_format_or_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export(tmp_path, 'vars.out', TRICKY, 'yaml')
+    with pytest.raises(ValueError):
+        export(tmp_path, 'vars.out', TRICKY, 'json', 'zip')
@@ -0,0 +1,65 @@
+import pytest
+
+from src.flatten import flatten_json, iter_flatten, parse_import
+
+
+def recursive_flatten(data, parent_key='', separator='_'):
+    """The recursive EnvironmentManager._flatten_json the engine replaced"""
+    items = []
+    for key, value in data.items():
+        new_key = f"{parent_key}{separator}{key}" if parent_key else key
+        if isinstance(value, dict):
+            items.extend(recursive_flatten(value, new_key, separator).items())
+        else:
+            items.append((new_key, str(value)))
+    return dict(items)
+
+
+DOCUMENTS = [
+    {},
+    {'A': 1, 'B': 'two', 'C': None, 'D': True, 'E': 1.5},
+    {'db': {'host': 'localhost', 'port': 5432, 'opts': {}}, 'empty': {}, 'name': 'app'},
+    {'list': [1, 2, {'x': 1}], 'empty_list': [], 'nested': {'list': ['a', 'b']}},
+    {'a': {'b': {'c': {'d': 'deep'}}, 'e': 'shallow'}, 'a_b': 'collides later'},
+    {'unicode': {'ключ': 'значение'}, 'spaces in key': {'x y': 'z'}},
+]
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('separator', ['_', '__', '.'])
+def test_matches_the_recursive_flatten(document, separator):
+    expected = recursive_flatten(document, separator=separator)
+    result = flatten_json(document, separator=separator)
+    # Same names in the same order, not just the same mapping
+    assert list(result.items()) == list(expected.items())
+
+
+def test_parent_key_prefixes_every_name():
+    document = {'db': {'host': 'h'}, 'port': 1}
+    assert flatten_json(document, 'APP', '__') == recursive_flatten(document, 'APP', '__')
+
+
+def test_deep_nesting_is_not_limited_by_recursion():
+    depth = 5000
+    document = leaf = {}
+    for _ in range(depth - 1):
+        leaf['k'] = {}
+        leaf = leaf['k']
+    leaf['k'] = 'bottom'
+
+    assert flatten_json(document) == {'_'.join(['k'] * depth): 'bottom'}
+
+
+def test_index_lists_and_key_case():
+    document = {'servers': [{'host': 'a'}, {'host': 'b'}], 'Mode': 'x'}
+    assert flatten_json(document, key_case='upper', index_lists=True) == {
+        'SERVERS_0_HOST': 'a', 'SERVERS_1_HOST': 'b', 'MODE': 'x'}
+    assert dict(iter_flatten(document, key_case='lower')) == {
+        'servers': "[{'host': 'a'}, {'host': 'b'}]", 'mode': 'x'}
+    with pytest.raises(ValueError):
+        flatten_json(document, key_case='title')
+
+
+def test_parse_import_without_flattening_only_stringifies():
+    document = {'A': 1, 'B': {'c': 2}}
+    assert parse_import(document, flatten=False) == {'A': '1', 'B': "{'c': 2}"}
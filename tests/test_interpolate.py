@@ -0,0 +1,76 @@
+import pytest
+
+from src.interpolate import InterpolationError, interpolate, parse_template
+
+
+def test_references_resolve_across_keys_and_environment():
+    variables = {
+        'DB_URL': 'postgres://${DB_HOST}:${DB_PORT}/${DB_NAME:-app}',
+        'DB_HOST': '${REGION}.db.internal',
+        'DB_PORT': '5432',
+        'LOG_DIR': '${HOME}/logs',
+    }
+    result = interpolate(variables, {'REGION': 'eu', 'HOME': '/home/me'})
+    assert result == {
+        'DB_URL': 'postgres://eu.db.internal:5432/app',
+        'DB_HOST': 'eu.db.internal',
+        'DB_PORT': '5432',
+        'LOG_DIR': '/home/me/logs',
+    }
+    # Keys keep their input order
+    assert list(result) == list(variables)
+
+
+def test_self_reference_reads_the_environment():
+    assert interpolate({'PATH': '/opt/bin:${PATH}'}, {'PATH': '/usr/bin'}) == \
+        {'PATH': '/opt/bin:/usr/bin'}
+
+
+def test_defaults_apply_to_unset_and_empty_names_and_may_nest():
+    result = interpolate({'A': '${EMPTY:-e}', 'B': '${UNSET:-${C}-x}', 'C': 'c'}, {'EMPTY': ''})
+    assert result == {'A': 'e', 'B': 'c-x', 'C': 'c'}
+
+
+def test_escape_and_malformed_references_stay_literal():
+    result = interpolate({'A': '$${NOT_A_REF}', 'B': '${unclosed', 'C': '$5 ${1BAD}'}, {})
+    assert result == {'A': '${NOT_A_REF}', 'B': '${unclosed', 'C': '$5 ${1BAD}'}
+
+
+def test_parse_template_splits_text_and_references():
+    assert parse_template('http://${HOST:-localhost}/x') == \
+        ['http://', ('HOST', ['localhost'], '${HOST:-localhost}'), '/x']
+
+
+def test_cycle_is_reported_with_its_path():
+    with pytest.raises(InterpolationError, match=r"Circular reference: A -> B -> C -> A"):
+        interpolate({'A': '${B}', 'B': '${C}', 'C': '${A}', 'D': 'd'}, {})
+
+
+def test_cycle_through_a_default_is_reported():
+    with pytest.raises(InterpolationError, match="Circular reference"):
+        interpolate({'A': '${UNSET:-${B}}', 'B': '${A}'}, {})
+
+
+def test_undefined_name_is_an_error_when_strict():
+    with pytest.raises(InterpolationError, match="Undefined variable 'MISSING' referenced by 'A'"):
+        interpolate({'A': 'x${MISSING}'}, {})
+    assert interpolate({'A': 'x${MISSING}'}, {}, strict=False) == {'A': 'x${MISSING}'}
+
+
+def test_long_chains_do_not_recurse():
+    count = 20000
+    variables = {f"K{i}": f"${{K{i - 1}}}" if i else 'root' for i in range(count)}
+    result = interpolate(dict(reversed(list(variables.items()))), {})
+    assert result[f"K{count - 1}"] == 'root'
+
+
+def test_manager_import_with_interpolation(manager, tmp_path):
+    source = tmp_path / "config.json"
+    source.write_text('{"EG_TEST": {"HOST": "db"}, "EG_TEST_URL": "pg://${EG_TEST_HOST}"}')
+    assert manager.import_env_vars(str(source), interpolate=True)
+    assert manager.get_env_var('EG_TEST_URL') == 'pg://db'
+
+    cycle = tmp_path / "cycle.json"
+    cycle.write_text('{"EG_TEST_A": "${EG_TEST_B}", "EG_TEST_B": "${EG_TEST_A}"}')
+    assert not manager.import_env_vars(str(cycle), interpolate=True)
+    assert manager.get_env_var('EG_TEST_A') is None
@@ -0,0 +1,119 @@
+import json
+import os
+
+from src.env_manager import EnvironmentManager
+from src.journal import ConfigJournal
+
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def test_replay_applies_records_over_the_snapshot(tmp_path):
+    config = str(tmp_path / "env_config.json")
+    write_json(config, {'KEEP': 'k', 'CHANGE': 'old', 'DROP': 'd'})
+    journal = ConfigJournal(config)
+
+    journal.append([('CHANGE', 'new'), ('DROP', None), ('ADD', 'a')])
+    journal.append([('ADD', 'a2')])
+
+    assert journal.load() == {'KEEP': 'k', 'CHANGE': 'new', 'ADD': 'a2'}
+    # The snapshot is untouched until compaction
+    with open(config) as f:
+        assert json.load(f) == {'KEEP': 'k', 'CHANGE': 'old', 'DROP': 'd'}
+
+
+def test_replay_stops_at_a_torn_record(tmp_path):
+    config = str(tmp_path / "env_config.json")
+    journal = ConfigJournal(config)
+    journal.append([('A', '1'), ('B', '2')])
+    with open(journal.journal_file, 'a') as f:
+        f.write('{"op":"set","name":"C","val')
+
+    assert journal.load() == {'A': '1', 'B': '2'}
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    config = str(tmp_path / "env_config.json")
+    write_json(config, {'A': '1'})
+    journal = ConfigJournal(config)
+    journal.append([('A', None), ('B', '2')])
+
+    journal.compact()
+
+    assert not os.path.exists(journal.journal_file)
+    with open(config) as f:
+        assert json.load(f) == {'B': '2'}
+    assert journal.load() == {'B': '2'}
+
+
+def test_background_compaction_past_the_threshold(tmp_path):
+    config = str(tmp_path / "env_config.json")
+    journal = ConfigJournal(config, compact_threshold=200)
+    for i in range(20):
+        journal.append([(f"VAR_{i}", 'x' * 20)])
+    journal.wait_for_compaction()
+
+    expected = {f"VAR_{i}": 'x' * 20 for i in range(20)}
+    assert journal.load() == expected
+    # Whatever is still journaled is below the threshold
+    size = os.path.getsize(journal.journal_file) if os.path.exists(journal.journal_file) else 0
+    assert size <= 200
+    with open(config) as f:
+        assert set(json.load(f)) <= set(expected)
+
+
+def test_manager_in_journal_mode_round_trips(tmp_path, backend, clean_environ):
+    config = str(tmp_path / "env_config.json")
+    manager = EnvironmentManager(config, storage="journal", persistence=backend)
+    assert manager.set_env_var('EG_TEST_J1', 'one', persistent=True)
+    assert manager.set_env_var('EG_TEST_J2', 'two', persistent=True)
+    assert manager.delete_env_var('EG_TEST_J1', persistent=True)[0]
+
+    assert os.path.exists(config + ".journal")
+    reloaded = EnvironmentManager(config, storage="journal", persistence=backend)
+    assert reloaded.saved_vars == {'EG_TEST_J2': 'two'}
+
+    reloaded.compact_config()
+    assert EnvironmentManager(config, storage="json").saved_vars == {'EG_TEST_J2': 'two'}
+
+
+def test_save_config_keeps_records_appended_by_other_processes(tmp_path, backend, clean_environ):
+    config = str(tmp_path / "env_config.json")
+    ours = EnvironmentManager(config, storage="journal", persistence=backend)
+    ours.set_env_var('EG_TEST_SHARED', 'ours', persistent=True)
+    ours.set_env_var('EG_TEST_GONE', 'x', persistent=True)
+
+    # Another process appends after this one loaded
+    other = EnvironmentManager(config, storage="journal", persistence=backend)
+    other.set_env_var('EG_TEST_OTHER', 'theirs', persistent=True)
+    other.set_env_var('EG_TEST_SHARED', 'theirs', persistent=True)
+    other.delete_env_var('EG_TEST_GONE', persistent=True)
+
+    # Direct edits to saved_vars are what save_config writes out
+    ours.saved_vars['EG_TEST_EDITED'] = 'edited'
+    ours.save_config()
+
+    expected = {'EG_TEST_SHARED': 'theirs', 'EG_TEST_OTHER': 'theirs',
+                'EG_TEST_EDITED': 'edited'}
+    assert ours.saved_vars == expected
+    assert not os.path.exists(config + ".journal")
+    with open(config) as f:
+        assert json.load(f) == expected
+
+
+def test_save_config_applies_this_process_edits_over_the_journal(tmp_path, backend, clean_environ):
+    config = str(tmp_path / "env_config.json")
+    ours = EnvironmentManager(config, storage="journal", persistence=backend)
+    ours.set_env_var('EG_TEST_A', 'a', persistent=True)
+    ours.set_env_var('EG_TEST_B', 'b', persistent=True)
+    other = EnvironmentManager(config, storage="journal", persistence=backend)
+    other.set_env_var('EG_TEST_C', 'c', persistent=True)
+
+    ours.saved_vars['EG_TEST_A'] = 'changed'
+    del ours.saved_vars['EG_TEST_B']
+    ours.save_config()
+
+    reloaded = EnvironmentManager(config, storage="journal", persistence=backend)
+    assert reloaded.saved_vars == {'EG_TEST_A': 'changed', 'EG_TEST_C': 'c'}
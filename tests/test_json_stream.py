@@ -0,0 +1,66 @@
+import io
+import json
+
+import pytest
+
+from src.json_stream import JSONStreamReader
+
+# Numbers in every form, strings with escapes and nesting, so that some
+# chunk size cuts each token at every position
+DOCUMENT = json.dumps({
+    "int": 12345,
+    "negative": -678,
+    "float": 1.5,
+    "exponent": -2.5e-10,
+    "big_exponent": 6E+22,
+    "zero": 0,
+    "flags": {"on": True, "off": False, "none": None},
+    "text": "tab\tquote\" unicode é \\ end",
+    "list": [1, 2.25, "three", {"four": 4}],
+    "nested": {"level1": {"level2": {"port": 5432, "ratio": 0.125}}},
+    "last": 99.75,
+})
+
+
+def flatten(data: dict, prefix: str = '') -> dict:
+    """Reference flattening: nested objects joined with _, leaves untouched"""
+    items = {}
+    for key, value in data.items():
+        key = f"{prefix}_{key}" if prefix else key
+        if isinstance(value, dict):
+            items.update(flatten(value, key))
+        else:
+            items[key] = value
+    return items
+
+
+def read_items(document: str, chunk_size: int, flatten: bool = True) -> dict:
+    reader = JSONStreamReader(io.StringIO(document), chunk_size=chunk_size)
+    return dict(reader.iter_items(flatten))
+
+
+@pytest.mark.parametrize("chunk_size", range(1, len(DOCUMENT) + 2))
+def test_every_chunk_size_matches_json_loads(chunk_size):
+    expected = flatten(json.loads(DOCUMENT))
+    assert read_items(DOCUMENT, chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_unflattened_values_match(chunk_size):
+    assert read_items(DOCUMENT, chunk_size, flatten=False) == json.loads(DOCUMENT)
+
+
+def test_number_cut_after_integer_part_at_default_chunk_size():
+    prefix = '{"pad":"'
+    suffix = '","n":1.5}'
+    # Place the '.' of 1.5 exactly at the first chunk boundary
+    pad = 'x' * (64 * 1024 - len(prefix) - len('","n":1'))
+    document = prefix + pad + suffix
+    assert document[64 * 1024] == '.'
+    assert read_items(document, 64 * 1024)['n'] == 1.5
+
+
+@pytest.mark.parametrize("document", ['[1, 2]', '{"a": 1', '{"a": 1} extra', '{"a" 1}'])
+def test_malformed_documents_raise(document):
+    with pytest.raises(ValueError):
+        read_items(document, 4)
@@ -0,0 +1,114 @@
+import os
+
+import pytest
+
+from src.layers import DELETED, LayeredEnvironment, LiveView, Overlay
+
+
+def make_view():
+    base = {'A': 'base', 'B': 'base', 'C': 'base'}
+    middle = {'B': 'middle', 'D': 'middle'}
+    top = Overlay({'C': 'top'})
+    return LayeredEnvironment([('base', base), ('middle', middle), ('top', top)]), top
+
+
+def test_later_layers_win():
+    view, _ = make_view()
+    assert view.to_dict() == {'A': 'base', 'B': 'middle', 'C': 'top', 'D': 'middle'}
+    assert dict(view) == view.to_dict()
+    assert len(view) == 4
+    assert view.layer_names == ['base', 'middle', 'top']
+
+
+def test_source_and_sources():
+    view, _ = make_view()
+    assert view.source('A') == 'base'
+    assert view.source('B') == 'middle'
+    assert view.source('C') == 'top'
+    assert view.source('MISSING') is None
+    assert view.sources('B') == ['middle', 'base']
+    assert view.sources('C') == ['top', 'base']
+
+
+def test_hide_masks_lower_layers():
+    view, top = make_view()
+    top.hide('B')
+
+    assert 'B' not in view
+    assert view.get('B') is None
+    with pytest.raises(KeyError):
+        view['B']
+    assert view.source('B') is None
+    assert view.sources('B') == []
+    assert sorted(view) == ['A', 'C', 'D']
+    assert 'B' not in view.to_dict()
+    assert top['B'] is DELETED
+
+
+def test_view_reflects_later_changes_to_its_layers():
+    view, top = make_view()
+    top['NEW'] = 'later'
+    del top['C']
+    assert view['NEW'] == 'later'
+    assert view['C'] == 'base'
+
+
+def test_push_leaves_the_original_view_alone():
+    view, _ = make_view()
+    pushed = view.push('edit')
+    pushed.layer('edit')['A'] = 'edited'
+    pushed.layer('edit').hide('D')
+
+    assert pushed['A'] == 'edited' and 'D' not in pushed
+    assert view['A'] == 'base' and view['D'] == 'middle'
+    assert pushed.layer_names == ['base', 'middle', 'top', 'edit']
+    with pytest.raises(KeyError):
+        view.layer('edit')
+
+
+def test_live_view_shows_live_values_and_names_only():
+    live = {'PATH': '/bin', 'EDITOR': 'vim'}
+    saved = {'EDITOR': 'emacs', 'SAVED_ONLY': 'x'}
+    session = Overlay({'PATH': '/bin'})
+    view = LiveView(('process', live), [('saved', saved), ('session', session)])
+
+    # Saved values not applied to the process are neither shown nor listed
+    assert view.to_dict() == live
+    assert sorted(view) == ['EDITOR', 'PATH']
+    assert view['EDITOR'] == 'vim'
+    assert 'SAVED_ONLY' not in view and view.get('SAVED_ONLY') is None
+
+    assert view.source('PATH') == 'session'
+    assert view.sources('PATH') == ['session', 'process']
+    assert view.source('EDITOR') == 'process'
+    assert view.pending('EDITOR') == ['saved']
+    assert view.pending('SAVED_ONLY') == ['saved']
+    assert view.pending('PATH') == []
+    assert view.source('SAVED_ONLY') is None
+
+
+def test_live_view_push_keeps_the_live_layer_at_the_bottom():
+    view = LiveView(('process', {'A': '1'}), [('saved', {'A': '1'})])
+    pushed = view.push('edit', {'A': '2'})
+    assert isinstance(pushed, LiveView)
+    assert pushed['A'] == '1'
+    assert pushed.pending('A') == ['edit']
+    assert pushed.source('A') == 'saved'
+
+
+def test_manager_view_keeps_the_process_authoritative(manager):
+    manager.set_env_var('EG_TEST_SAVED', 'saved', persistent=True)
+    manager.set_env_var('EG_TEST_TEMP', 'temp')
+    manager.saved_vars['EG_TEST_NOT_LIVE'] = 'persisted only'
+    os.environ['EG_TEST_SAVED'] = 'changed outside'
+
+    view = manager.environment_view()
+    assert view['EG_TEST_SAVED'] == 'changed outside'
+    assert view.source('EG_TEST_SAVED') == 'process'
+    assert view.pending('EG_TEST_SAVED') == ['saved']
+    assert view.source('EG_TEST_TEMP') == 'session'
+    assert 'EG_TEST_NOT_LIVE' not in view
+
+    saved = manager.environment_view(saved_only=True)
+    assert saved['EG_TEST_NOT_LIVE'] == 'persisted only'
+    assert saved.source('EG_TEST_SAVED') == 'saved'
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections.abc import Mapping
+
+from src.live_search import LiveSearch
+
+ITEMS = {
+    'JAVA_HOME': '/usr/lib/jvm',
+    'JAVA_OPTS': '-Xmx1g',
+    'PATH': '/usr/bin',
+    'EDITOR': 'vim',
+}
+
+
+def wait(search, timeout=5.0):
+    """Poll like the GUI's timer until the latest query's matches arrive"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        matches = search.poll()
+        if matches is not None:
+            return matches
+        time.sleep(0.001)
+    raise AssertionError("search did not finish")
+
+
+def join_workers():
+    for thread in threading.enumerate():
+        if thread.name == "envgod-search":
+            thread.join(5)
+
+
+def recording(search):
+    """Record the candidate list each worker is given"""
+    seen = []
+    run = search._run
+
+    def record(generation, query, candidates, items, folded):
+        seen.append(list(candidates))
+        run(generation, query, candidates, items, folded)
+
+    search._run = record
+    return seen
+
+
+def test_empty_query_returns_every_name():
+    search = LiveSearch()
+    search.reset(ITEMS)
+    search.submit('')
+    assert wait(search) == sorted(ITEMS)
+
+
+def test_narrowed_query_filters_the_previous_matches():
+    search = LiveSearch()
+    search.reset(ITEMS)
+    seen = recording(search)
+
+    search.submit('java')
+    assert wait(search) == ['JAVA_HOME', 'JAVA_OPTS']
+    search.submit('JAVA_H')
+    assert wait(search) == ['JAVA_HOME']
+
+    assert seen == [sorted(ITEMS), ['JAVA_HOME', 'JAVA_OPTS']]
+
+
+def test_widened_or_different_query_rescans_the_snapshot():
+    search = LiveSearch()
+    search.reset(ITEMS)
+    seen = recording(search)
+
+    search.submit('java_h')
+    assert wait(search) == ['JAVA_HOME']
+    search.submit('java')
+    assert wait(search) == ['JAVA_HOME', 'JAVA_OPTS']
+    search.submit('usr')
+    assert wait(search) == ['JAVA_HOME', 'PATH']
+
+    assert seen == [sorted(ITEMS)] * 3
+
+
+def test_stale_generation_results_are_discarded():
+    gate = threading.Event()
+
+    class SlowItems(Mapping):
+        def __getitem__(self, name):
+            gate.wait(5)
+            return ITEMS[name]
+
+        def __iter__(self):
+            return iter(ITEMS)
+
+        def __len__(self):
+            return len(ITEMS)
+
+    search = LiveSearch()
+    search.reset(SlowItems())
+    search.submit('java')
+    search.submit('vim')
+    assert search.poll() is None
+    gate.set()
+    join_workers()
+
+    # Both workers finished, but only the newest query's matches count
+    assert search.poll() == ['EDITOR']
+    assert search.poll() is None
+    assert not search.pending
+
+
+def test_reset_discards_results_of_the_old_snapshot():
+    gate = threading.Event()
+
+    class SlowItems(dict):
+        def get(self, name, default=None):
+            gate.wait(5)
+            return super().get(name, default)
+
+    search = LiveSearch()
+    search.reset(SlowItems(ITEMS))
+    search.submit('java')
+    search.reset({'JAVA_VERSION': '21'})
+    gate.set()
+    join_workers()
+
+    assert search.poll() is None
+    search.submit('java')
+    assert wait(search) == ['JAVA_VERSION']
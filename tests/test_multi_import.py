@@ -0,0 +1,120 @@
+import concurrent.futures
+import json
+import os
+
+import pytest
+
+from src import multi_import
+from src.multi_import import PARALLEL_MIN_BYTES, expand_import_paths, load_import_files
+from src.parse_cache import ParseCache, read_file
+
+OPTIONS = {'flatten': True, 'separator': '_', 'key_case': None, 'index_lists': False}
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+@pytest.fixture
+def pool_starts(monkeypatch):
+    """Count how many process pools load_import_files starts"""
+    started = []
+    real_pool = concurrent.futures.ProcessPoolExecutor
+
+    class CountingPool(real_pool):
+        def __init__(self, *args, **kwargs):
+            started.append(kwargs.get('max_workers'))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', CountingPool)
+    return started
+
+
+def test_later_files_win_on_collisions(tmp_path):
+    base = write_json(tmp_path / "base.json", {'db': {'host': 'base', 'port': 1}, 'ONLY_BASE': 'b'})
+    override = write_json(tmp_path / "override.json", {'db': {'host': 'override'}, 'ONLY_OVR': 'o'})
+
+    assert load_import_files([base, override], OPTIONS, jobs=1) == {
+        'db_host': 'override', 'db_port': '1', 'ONLY_BASE': 'b', 'ONLY_OVR': 'o'}
+    assert load_import_files([override, base], OPTIONS, jobs=1)['db_host'] == 'base'
+
+
+def test_directories_and_globs_are_sorted_by_path(tmp_path):
+    (tmp_path / "conf").mkdir()
+    for name in ('b', 'a', 'c'):
+        write_json(tmp_path / "conf" / f"{name}.json", {'WHO': name})
+    (tmp_path / "conf" / "notes.txt").write_text("ignored")
+
+    files = expand_import_paths([str(tmp_path / "conf")])
+    assert [os.path.basename(path) for path in files] == ['a.json', 'b.json', 'c.json']
+    assert load_import_files(files, OPTIONS, jobs=1) == {'WHO': 'c'}
+    with pytest.raises(FileNotFoundError):
+        expand_import_paths([str(tmp_path / "nothing-*.json")])
+
+
+def test_pool_and_serial_paths_give_identical_results(tmp_path, pool_starts):
+    filenames = []
+    for part in range(6):
+        # Every file redefines SHARED_* so the merge order is visible
+        data = {f"SVC_{part}": {f"KEY_{i:05d}": f"{part}-{i}" * 4 for i in range(2500)},
+                'SHARED': {f"K{i}": f"from-{part}" for i in range(part * 10)}}
+        filenames.append(write_json(tmp_path / f"part{part}.json", data))
+    assert sum(os.path.getsize(name) for name in filenames) >= PARALLEL_MIN_BYTES
+
+    serial = load_import_files(filenames, OPTIONS, jobs=1)
+    assert pool_starts == []
+    pooled = load_import_files(filenames, OPTIONS, jobs=3)
+    assert pool_starts == [3]
+
+    assert list(pooled.items()) == list(serial.items())
+    assert serial['SHARED_K0'] == 'from-5'
+    assert serial['SHARED_K45'] == 'from-5'
+
+
+def test_small_inputs_stay_in_process(tmp_path, pool_starts):
+    filenames = [write_json(tmp_path / f"{i}.json", {f"K{i}": i}) for i in range(4)]
+    assert load_import_files(filenames, OPTIONS, jobs=4) == {'K0': '0', 'K1': '1', 'K2': '2', 'K3': '3'}
+    assert pool_starts == []
+
+
+def test_cached_results_are_merged_in_order(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path / "cache"))
+    first = write_json(tmp_path / "first.json", {'A': 'first', 'B': 'first'})
+    second = write_json(tmp_path / "second.json", {'A': 'second'})
+    load_import_files([first], OPTIONS, cache, jobs=1)
+
+    def fail(filename, options):
+        raise AssertionError(f"{filename} parsed again")
+
+    result = load_import_files([first, second], OPTIONS, cache, jobs=1)
+    assert result == {'A': 'second', 'B': 'first'}
+    # Both are cached now
+    monkeypatch.setattr(multi_import, 'parse_import_file', fail)
+    assert load_import_files([first, second], OPTIONS, cache, jobs=1) == result
+
+
+def test_store_keys_the_result_by_the_bytes_that_were_parsed(tmp_path):
+    path = write_json(tmp_path / "config.json", {'VERSION': 'one'})
+    cache = ParseCache(str(tmp_path / "cache"))
+    assert cache.get(path, OPTIONS) is None
+    content, record = read_file(path)
+    stale = {'VERSION': json.loads(content)['VERSION']}
+
+    # The file changes after the worker parsed it but before store()
+    write_json(tmp_path / "config.json", {'VERSION': 'two!'})
+    cache.store(path, OPTIONS, stale, record)
+
+    assert cache.load(path, OPTIONS, lambda data: dict(json.loads(data))) == {'VERSION': 'two!'}
+
+
+def test_manager_imports_several_files_in_one_transaction(manager, backend, tmp_path):
+    base = write_json(tmp_path / "base.json", {'EG_DB': {'HOST': 'base', 'PORT': 1}})
+    (tmp_path / "teams").mkdir()
+    write_json(tmp_path / "teams" / "a.json", {'EG_DB': {'HOST': 'team-a'}})
+    write_json(tmp_path / "teams" / "b.json", {'EG_DB': {'HOST': 'team-b'}, 'EG_TEAM': 'b'})
+
+    assert manager.import_env_files([base, str(tmp_path / "teams")], persistent=True, jobs=1)
+
+    assert backend.calls == [{'EG_DB_HOST': 'team-b', 'EG_DB_PORT': '1', 'EG_TEAM': 'b'}]
+    assert os.environ['EG_DB_HOST'] == 'team-b'
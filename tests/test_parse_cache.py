@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+
+from src.parse_cache import ParseCache
+
+OPTIONS = {'flatten': True}
+
+
+def write_config(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def build(content):
+    return {key: str(value) for key, value in json.loads(content).items()}
+
+
+def test_hit_returns_the_stored_result_without_building(tmp_path):
+    path = write_config(tmp_path / "a.json", {'A': 1})
+    cache = ParseCache(str(tmp_path / "cache"))
+    assert cache.load(path, OPTIONS, build) == {'A': '1'}
+
+    def fail(content):
+        raise AssertionError("built on a hit")
+
+    assert ParseCache(str(tmp_path / "cache")).load(path, OPTIONS, fail) == {'A': '1'}
+
+
+def test_hits_do_not_rewrite_the_index(tmp_path):
+    path = write_config(tmp_path / "a.json", {'A': 1})
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.load(path, OPTIONS, build)
+    before = os.stat(cache.index_file)
+
+    for _ in range(5):
+        cache.load(path, OPTIONS, build)
+
+    after = os.stat(cache.index_file)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+    stats = ParseCache(str(tmp_path / "cache")).stats()
+    assert (stats['hits'], stats['misses']) == (5, 1)
+
+
+def test_pending_hits_are_folded_into_the_index_on_the_next_write(tmp_path):
+    first = write_config(tmp_path / "a.json", {'A': 1})
+    second = write_config(tmp_path / "b.json", {'B': 2})
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.load(first, OPTIONS, build)
+    cache.load(first, OPTIONS, build)
+    cache.load(first, OPTIONS, build)
+
+    cache.load(second, OPTIONS, build)
+
+    assert os.path.getsize(cache.hits_file) == 0
+    assert cache._load_index()['hits'] == 2
+    assert cache.stats()['hits'] == 2
+
+
+def test_eviction_keeps_the_recently_hit_entry(tmp_path):
+    paths = [write_config(tmp_path / f"{name}.json", {name: 'x' * 200}) for name in 'ABC']
+    cache = ParseCache(str(tmp_path / "cache"), max_bytes=600)
+    cache.load(paths[0], OPTIONS, build)
+    cache.load(paths[1], OPTIONS, build)
+    # A was stored first but is now the most recently used
+    cache.load(paths[0], OPTIONS, build)
+
+    cache.load(paths[2], OPTIONS, build)
+
+    built = []
+
+    def record(content):
+        built.append(content)
+        return build(content)
+
+    cache.load(paths[0], OPTIONS, record)
+    assert built == []
+    cache.load(paths[1], OPTIONS, record)
+    assert len(built) == 1
+
+
+def test_touched_file_with_same_content_is_a_hit(tmp_path):
+    path = write_config(tmp_path / "a.json", {'A': 1})
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.load(path, OPTIONS, build)
+    os.utime(path, (1, 1))
+
+    assert cache.load(path, OPTIONS, build) == {'A': '1'}
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    # The new mtime is remembered, so the next hit is recognized from stat
+    assert cache._load_index()['files'][os.path.abspath(path)][1] == os.stat(path).st_mtime_ns
+
+
+def test_concurrent_stores_keep_every_entry(tmp_path):
+    paths = [write_config(tmp_path / f"c{i}.json", {f'K{i}': i}) for i in range(16)]
+    cache_dir = str(tmp_path / "cache")
+
+    def worker(chunk):
+        cache = ParseCache(cache_dir)
+        for path in chunk:
+            cache.load(path, OPTIONS, build)
+            cache.load(path, OPTIONS, build)
+
+    threads = [threading.Thread(target=worker, args=(paths[i::4],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = ParseCache(cache_dir).stats()
+    assert stats['entries'] == 16
+    assert stats['tracked_files'] == 16
+    assert (stats['hits'], stats['misses']) == (16, 16)
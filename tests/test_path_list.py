@@ -0,0 +1,139 @@
+import os
+import threading
+
+import pytest
+
+from src import path_list
+from src.path_list import PathList, check_path_list, is_list_variable, parse_path_list
+
+
+def statuses(report):
+    return [(entry['entry'], entry['status']) for entry in report]
+
+
+def test_parse_keeps_empty_entries_inside_a_value():
+    assert parse_path_list('') == ()
+    assert parse_path_list('/a::/b:', ':') == ('/a', '', '/b', '')
+    assert PathList.from_value(None).entries == []
+
+
+def test_is_list_variable():
+    assert is_list_variable('PATH') and is_list_variable('gopath')
+    assert is_list_variable('XDG_DATA_DIRS') and is_list_variable('CLASSPATH')
+    assert not is_list_variable('HOME')
+
+
+def test_prepend_and_append_move_existing_entries_instead_of_duplicating():
+    paths = PathList(['/usr/bin', '/bin', '/opt/tool/bin'], ':')
+
+    assert paths.prepend(['/opt/tool/bin/', '/new']) == 1
+    assert paths.entries == ['/opt/tool/bin/', '/new', '/usr/bin', '/bin']
+
+    assert paths.append(['/usr/bin', '/usr/bin', '/last']) == 1
+    assert paths.entries == ['/opt/tool/bin/', '/new', '/bin', '/usr/bin', '/usr/bin', '/last']
+    assert paths.value == '/opt/tool/bin/:/new:/bin:/usr/bin:/usr/bin:/last'
+
+
+def test_remove_drops_every_spelling_of_a_path():
+    paths = PathList(['/a', '/b/', '/c', '/b', '/b/./'], ':')
+    assert paths.remove(['/b']) == 3
+    assert paths.entries == ['/a', '/c']
+    assert paths.remove(['/missing']) == 0
+
+
+def test_dedupe_keeps_first_occurrences_in_order():
+    paths = PathList(['/b', '', '/a', '/b/', '/c', '', '/a'], ':')
+    assert paths.dedupe(drop_empty=False) == 3
+    assert paths.entries == ['/b', '', '/a', '/c']
+    assert paths.dedupe() == 1
+    assert paths.entries == ['/b', '/a', '/c']
+
+
+def test_move_by_path_or_index():
+    paths = PathList(['/a', '/b', '/c', '/d'], ':')
+    paths.move('/d', 0)
+    assert paths.entries == ['/d', '/a', '/b', '/c']
+    paths.move(0, -1)
+    assert paths.entries == ['/a', '/b', '/c', '/d']
+    paths.move('/b/', 99)
+    assert paths.entries == ['/a', '/c', '/d', '/b']
+    assert paths.index('/c/') == 1 and paths.index('/x') == -1
+    with pytest.raises(ValueError):
+        paths.move('/x', 0)
+
+
+def test_check_reports_each_entry_in_order(tmp_path):
+    bin_a = tmp_path / "a"
+    bin_b = tmp_path / "b"
+    bin_a.mkdir()
+    bin_b.mkdir()
+    (bin_a / "tool").write_text("")
+    (bin_b / "other").write_text("")
+    archive = tmp_path / "lib.jar"
+    archive.write_text("")
+    plain_file = tmp_path / "notes.txt"
+    plain_file.write_text("")
+    link = tmp_path / "link"
+    os.symlink(bin_a, link)
+
+    entries = [str(bin_a), '', str(tmp_path / "missing"), str(bin_a) + '/', str(archive),
+               str(plain_file), str(link), str(bin_b)]
+    report = check_path_list(entries, jobs=4)
+
+    assert [entry['index'] for entry in report] == list(range(len(entries)))
+    assert statuses(report) == [
+        (str(bin_a), 'ok'),
+        ('', 'empty'),
+        (str(tmp_path / "missing"), 'missing'),
+        (str(bin_a) + '/', 'duplicate'),
+        (str(archive), 'ok'),
+        (str(plain_file), 'not a directory'),
+        (str(link), 'duplicate'),
+        (str(bin_b), 'ok'),
+    ]
+    assert report[3]['detail'] == "same as entry 0"
+    assert report[6]['detail'] == "same directory as entry 0"
+
+
+def test_directory_whose_files_are_all_hidden_is_shadowed(tmp_path):
+    first, second, third = (tmp_path / name for name in ('first', 'second', 'third'))
+    for directory in (first, second, third):
+        directory.mkdir()
+    for name in ('python', 'pip'):
+        (first / name).write_text("")
+        (second / name).write_text("")
+    (third / "python").write_text("")
+    (third / "unique").write_text("")
+
+    report = check_path_list([str(first), str(second), str(third)])
+    assert [entry['status'] for entry in report] == ['ok', 'shadowed', 'ok']
+    assert report[2]['detail'] == "1 of 2 files shadowed by earlier entries"
+    assert check_path_list([str(first), str(second)], shadowing=False)[1]['status'] == 'ok'
+
+
+def test_entries_that_do_not_answer_in_time_are_reported(tmp_path, monkeypatch):
+    release = threading.Event()
+    real_probe = path_list._probe
+
+    def probe(entry, list_names):
+        if entry.endswith('hung'):
+            release.wait(5)
+        return real_probe(entry, list_names)
+
+    monkeypatch.setattr(path_list, '_probe', probe)
+    try:
+        report = check_path_list([str(tmp_path), str(tmp_path / "hung")], jobs=2, timeout=0.2)
+    finally:
+        release.set()
+    assert statuses(report) == [(str(tmp_path), 'ok'), (str(tmp_path / "hung"), 'timeout')]
+
+
+def test_manager_edits_write_only_changed_values(manager):
+    os.environ['EG_TEST_PATH'] = os.pathsep.join(['/a', '/b'])
+
+    assert manager.edit_path_list('EG_TEST_PATH', 'prepend', ['/b']) == (
+        True, "Added 0 new entries to the front of EG_TEST_PATH")
+    assert os.environ['EG_TEST_PATH'] == os.pathsep.join(['/b', '/a'])
+    assert manager.edit_path_list('EG_TEST_PATH', 'dedupe') == (True, "EG_TEST_PATH is unchanged")
+    ok, message = manager.edit_path_list('EG_TEST_PATH', 'move', ['/a', '/b'], 0)
+    assert not ok and message == "Moving needs exactly one entry and a position"
@@ -0,0 +1,139 @@
+import contextlib
+import json
+import os
+import sys
+import types
+
+from src.env_manager import EnvironmentManager
+from src.persistence import RegistryBackend
+
+
+def read_config(manager) -> dict:
+    with open(manager.config_file) as f:
+        return json.load(f)
+
+
+def test_transaction_persists_in_one_backend_call(manager, backend):
+    manager.set_env_var('EG_TEST_OLD', 'old', persistent=True)
+    backend.calls.clear()
+
+    with manager.transaction() as txn:
+        txn.set('EG_TEST_A', '1', persistent=True)
+        txn.set('EG_TEST_B', '2', persistent=True)
+        txn.set('EG_TEST_TEMP', '3')
+        txn.delete('EG_TEST_OLD', persistent=True)
+
+    assert backend.calls == [{'EG_TEST_A': '1', 'EG_TEST_B': '2', 'EG_TEST_OLD': None}]
+    assert backend.state == {'EG_TEST_A': '1', 'EG_TEST_B': '2'}
+    assert read_config(manager) == {'EG_TEST_A': '1', 'EG_TEST_B': '2'}
+
+
+def test_import_persists_in_one_backend_call(manager, backend, tmp_path):
+    source = tmp_path / "import.json"
+    source.write_text(json.dumps({'EG_TEST': {'HOST': 'db', 'PORT': 5432}, 'EG_TEST_X': 'x'}))
+
+    assert manager.import_env_vars(str(source), persistent=True)
+    assert backend.call_count == 1
+    assert backend.state == {'EG_TEST_HOST': 'db', 'EG_TEST_PORT': '5432', 'EG_TEST_X': 'x'}
+
+
+def test_temporary_changes_skip_the_backend(manager, backend):
+    assert manager.set_env_var('EG_TEST_TEMP', 'value')
+    assert manager.delete_env_var('EG_TEST_TEMP')[0]
+    assert backend.call_count == 0
+
+
+def test_unchanged_values_are_not_persisted_again(manager, backend):
+    assert manager.set_env_var('EG_TEST_SAME', 'value', persistent=True)
+    assert manager.set_env_var('EG_TEST_SAME', 'value', persistent=True)
+    with manager.transaction() as txn:
+        txn.set('EG_TEST_SAME', 'value', persistent=True)
+        txn.set('EG_TEST_NEW', 'new', persistent=True)
+
+    assert backend.calls == [{'EG_TEST_SAME': 'value'}, {'EG_TEST_NEW': 'new'}]
+
+
+def test_failed_persistent_set_rolls_back(manager, backend):
+    assert manager.set_env_var('EG_TEST_KEPT', 'before', persistent=True)
+    backend.fail = OSError("backend unavailable")
+
+    assert not manager.set_env_var('EG_TEST_KEPT', 'after', persistent=True)
+    backend.fail = OSError("backend unavailable")
+    assert not manager.set_env_var('EG_TEST_NEW', 'value', persistent=True)
+
+    assert os.environ['EG_TEST_KEPT'] == 'before'
+    assert 'EG_TEST_NEW' not in os.environ
+    assert manager.saved_vars == {'EG_TEST_KEPT': 'before'}
+    assert read_config(manager) == {'EG_TEST_KEPT': 'before'}
+    # A fresh process sees the same
+    assert EnvironmentManager(manager.config_file).saved_vars == {'EG_TEST_KEPT': 'before'}
+
+
+def test_failed_persistent_delete_rolls_back(manager, backend):
+    assert manager.set_env_var('EG_TEST_KEPT', 'value', persistent=True)
+    backend.fail = OSError("backend unavailable")
+
+    success, _ = manager.delete_env_var('EG_TEST_KEPT', persistent=True)
+
+    assert not success
+    assert os.environ['EG_TEST_KEPT'] == 'value'
+    assert read_config(manager) == {'EG_TEST_KEPT': 'value'}
+    assert backend.state == {'EG_TEST_KEPT': 'value'}
+
+
+def test_persistent_delete_backs_up_the_value(manager, backend):
+    assert manager.set_env_var('EG_TEST_GONE', 'value', persistent=True)
+    assert manager.delete_env_var('EG_TEST_GONE', persistent=True)[0]
+
+    assert [(entry['name'], entry['value']) for entry in manager.list_backups()] == \
+        [('EG_TEST_GONE', 'value')]
+    assert backend.calls[-1] == {'EG_TEST_GONE': None}
+
+
+def fake_winreg(values):
+    """Just enough of winreg for RegistryBackend, over a {name: (value, type)} dict"""
+    module = types.SimpleNamespace(HKEY_CURRENT_USER=object(), KEY_QUERY_VALUE=1,
+                                   KEY_SET_VALUE=2, REG_SZ=1, REG_EXPAND_SZ=2, REG_DWORD=4)
+
+    def query(key, name):
+        if name not in values:
+            raise FileNotFoundError(name)
+        return values[name]
+
+    def delete(key, name):
+        if name not in values:
+            raise FileNotFoundError(name)
+        del values[name]
+
+    module.OpenKey = lambda root, sub_key, reserved, access: contextlib.nullcontext()
+    module.QueryValueEx = query
+    module.SetValueEx = lambda key, name, reserved, kind, value: values.update({name: (value, kind)})
+    module.DeleteValue = delete
+    return module
+
+
+def test_registry_keeps_value_types(monkeypatch):
+    values = {'Path': ('%USERPROFILE%\\bin', 2), 'HOME_DIR': ('C:\\old', 1),
+              'LEGACY': (1, 4), 'GONE': ('x', 1)}
+    winreg = fake_winreg(values)
+    monkeypatch.setitem(sys.modules, 'winreg', winreg)
+    monkeypatch.setattr(RegistryBackend, 'broadcast', lambda self: None)
+
+    RegistryBackend().apply({
+        'Path': 'C:\\tools;%USERPROFILE%\\bin',
+        'HOME_DIR': '%SystemDrive%\\home',
+        'NEW_PLAIN': 'plain',
+        'NEW_EXPAND': '%TEMP%\\cache',
+        'LEGACY': 'text',
+        'GONE': None,
+        'NEVER_SET': None,
+    }, {})
+
+    assert values == {
+        'Path': ('C:\\tools;%USERPROFILE%\\bin', winreg.REG_EXPAND_SZ),
+        # An existing REG_SZ stays literal even if the new value has a %
+        'HOME_DIR': ('%SystemDrive%\\home', winreg.REG_SZ),
+        'NEW_PLAIN': ('plain', winreg.REG_SZ),
+        'NEW_EXPAND': ('%TEMP%\\cache', winreg.REG_EXPAND_SZ),
+        'LEGACY': ('text', winreg.REG_SZ),
+    }
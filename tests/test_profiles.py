@@ -0,0 +1,68 @@
+import json
+import os
+
+from src.profiles import ProfileCache
+
+
+def write_profiles(path, value):
+    with open(path, 'w') as f:
+        json.dump({'shared': {'APP': 'app'}, 'environments': {'dev': {'URL': value}}}, f)
+    return str(path)
+
+
+def entries(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(".profile"))
+
+
+def test_hit_returns_the_cached_profile(tmp_path):
+    path = write_profiles(tmp_path / "envs.json", 'x')
+    cache = ProfileCache(str(tmp_path / "cache"))
+    assert cache.resolve(path, 'dev') == {'APP': 'app', 'URL': 'x'}
+    entry = os.path.join(cache.cache_dir, entries(cache)[0])
+    with open(entry, 'wb') as f:
+        f.write(b'')
+    os.utime(entry, (1, 1))
+
+    # The stale marshal data is ignored and rebuilt; a good entry is touched
+    assert cache.resolve(path, 'DEV') == {'APP': 'app', 'URL': 'x'}
+    assert cache.resolve(path, 'dev') == {'APP': 'app', 'URL': 'x'}
+    assert os.stat(entry).st_mtime > 1
+
+
+def test_edits_do_not_grow_the_cache_past_its_cap(tmp_path):
+    path = tmp_path / "envs.json"
+    cache = ProfileCache(str(tmp_path / "cache"), max_bytes=1000)
+    for i in range(20):
+        write_profiles(path, 'v' * 100 + str(i))
+        assert cache.resolve(str(path), 'dev')['URL'].endswith(str(i))
+
+    sizes = [os.path.getsize(os.path.join(cache.cache_dir, name)) for name in entries(cache)]
+    assert 1 < len(sizes) < 20
+    assert sum(sizes) <= 1000
+
+
+def test_eviction_keeps_the_recently_hit_profile(tmp_path):
+    paths = [write_profiles(tmp_path / f"{name}.json", name * 300) for name in 'ABC']
+    cache = ProfileCache(str(tmp_path / "cache"), max_bytes=800)
+    cache.resolve(paths[0], 'dev')
+    cache.resolve(paths[1], 'dev')
+    for name in entries(cache):
+        os.utime(os.path.join(cache.cache_dir, name), (1, 1))
+    # A hit makes A the most recently used, so B goes when C is stored
+    cache.resolve(paths[0], 'dev')
+    kept = set(entries(cache))
+
+    cache.resolve(paths[2], 'dev')
+
+    assert len(entries(cache)) == 2
+    assert len(kept & set(entries(cache))) == 1
+    before = set(entries(cache))
+    cache.resolve(paths[0], 'dev')
+    assert set(entries(cache)) == before
+
+
+def test_no_cache_leaves_nothing_behind(tmp_path):
+    path = write_profiles(tmp_path / "envs.json", 'x')
+    cache = ProfileCache(str(tmp_path / "cache"))
+    assert cache.resolve(path, 'dev', use_cache=False)['URL'] == 'x'
+    assert not os.path.exists(cache.cache_dir)
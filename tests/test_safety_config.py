@@ -0,0 +1,69 @@
+import json
+
+from src.safety_config import SafetyRules
+
+
+def write_rules(path, config):
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    return str(path)
+
+
+def test_rules_file_extends_the_defaults(tmp_path):
+    rules = SafetyRules.from_file(write_rules(tmp_path / "rules.json", {
+        'protected': ['MY_APP_HOME'], 'caution': ['re:^TMP_', 'CI_*']}))
+
+    assert rules.classify_name('my_app_home')['level'] == 'protected'
+    assert rules.classify_name('PATH')['level'] == 'protected'
+    assert rules.classify_name('TMP_BUILD')['level'] == 'caution'
+    assert rules.classify_name('CI_JOB')['level'] == 'caution'
+    assert rules.classify_name('MY_VAR')['level'] == 'safe'
+
+
+def test_every_level_ignores_case():
+    rules = SafetyRules()
+
+    # Built-in caution globs used to be case-sensitive prefixes
+    for name in ('SYSTEM_CACHE', 'system_cache', 'Processor_Level', 'computerName_x'):
+        assert rules.classify_name(name)['level'] == 'caution', name
+    assert rules.classify_name('java_home')['level'] == 'protected'
+    assert rules.classify_name('Classpath')['level'] == 'sensitive'
+    assert rules.classify_name('my_system')['level'] == 'safe'
+
+
+def test_invalid_regex_falls_back_to_the_defaults(tmp_path, capsys):
+    rules = SafetyRules.from_file(write_rules(tmp_path / "rules.json", {
+        'replace_defaults': True, 'protected': ['re:(unclosed']}))
+
+    assert 'using the defaults' in capsys.readouterr().out
+    assert rules.classify_name('PATH')['level'] == 'protected'
+    assert rules.classify_name('SYSTEMDRIVE')['level'] == 'protected'
+    assert rules.classify_name('MY_VAR')['level'] == 'safe'
+
+
+def test_non_string_rule_falls_back_to_the_defaults(tmp_path, capsys):
+    rules = SafetyRules.from_file(write_rules(tmp_path / "rules.json", {'sensitive': [42]}))
+
+    assert 'using the defaults' in capsys.readouterr().out
+    assert rules.classify_name('JAVA_HOME')['is_sensitive']
+
+
+def test_reload_recovers_once_the_file_is_fixed(tmp_path):
+    path = write_rules(tmp_path / "rules.json", {'protected': ['re:[']})
+    rules = SafetyRules.from_file(path)
+    assert rules.classify_name('MY_APP_HOME')['level'] == 'safe'
+
+    write_rules(path, {'protected': ['MY_APP_HOME']})
+    rules.reload()
+    assert rules.classify_name('MY_APP_HOME')['level'] == 'protected'
+
+
+def test_manager_delete_survives_a_bad_rules_file(manager, tmp_path, monkeypatch):
+    monkeypatch.setenv('ENVGOD_SAFETY_RULES', write_rules(tmp_path / "rules.json",
+                                                         {'caution': ['re:*bad']}))
+    manager.set_env_var('ENVGOD_TEST_DELETE', 'x')
+
+    assert manager.get_variable_safety_info('PATH')['is_protected']
+    deleted, _ = manager.delete_env_var('ENVGOD_TEST_DELETE')
+    assert deleted
+    assert manager.get_env_var('ENVGOD_TEST_DELETE') is None
@@ -0,0 +1,56 @@
+import pytest
+
+from src.search_index import SearchIndex, compile_matcher, scan_items
+
+ITEMS = {
+    'FOO1': 'one two',
+    'FOO_BAR': 'x',
+    'JAVA_HOME': '/usr/lib/jvm',
+    'JAVA_OPTS': '-Xmx1g',
+    'PATH': '/usr/bin:/bin',
+}
+
+
+def search_both(term, mode='substring', field='both'):
+    """Results from the scan and from the index, which must agree"""
+    scanned = sorted(scan_items(ITEMS.items(), term, mode, field))
+    assert SearchIndex(ITEMS).search(term, mode, field) == scanned
+    return scanned
+
+
+@pytest.mark.parametrize('term, expected', [
+    (r'^FO\D1$', ['FOO1']),        # \D must not become \d
+    (r'^FOO\d\Z', ['FOO1']),       # \Z must not become the invalid \z
+    (r'^FOO\S+$', ['FOO1', 'FOO_BAR']),
+    (r'\W', ['FOO1', 'JAVA_HOME', 'JAVA_OPTS', 'PATH']),
+    (r'java_\w+', ['JAVA_HOME', 'JAVA_OPTS']),
+])
+def test_regex_escapes_keep_their_case_sensitive_meaning(term, expected):
+    assert search_both(term, 'regex') == expected
+
+
+def test_regex_ignores_case():
+    assert search_both('^path$', 'regex', 'name') == ['PATH']
+    assert search_both('XMX', 'regex', 'value') == ['JAVA_OPTS']
+
+
+def test_substring_and_glob_ignore_case():
+    assert search_both('java') == ['JAVA_HOME', 'JAVA_OPTS']
+    assert search_both('Java_*', 'glob', 'name') == ['JAVA_HOME', 'JAVA_OPTS']
+    assert search_both('/USR/*', 'glob', 'value') == ['JAVA_HOME', 'PATH']
+
+
+def test_index_follows_updates():
+    index = SearchIndex(ITEMS)
+    index.set('JAVA_HOME', '/opt/java')
+    index.remove('JAVA_OPTS')
+    assert index.search('jvm') == []
+    assert index.search('/opt/', field='value') == ['JAVA_HOME']
+    assert index.search('java_', field='name') == ['JAVA_HOME']
+
+
+def test_unknown_mode_or_field_is_rejected():
+    with pytest.raises(ValueError):
+        compile_matcher('x', 'fuzzy')
+    with pytest.raises(ValueError):
+        SearchIndex(ITEMS).search('x', field='both_ways')